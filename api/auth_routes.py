@@ -1,15 +1,19 @@
-from fastapi import APIRouter, HTTPException, Depends
+from fastapi import APIRouter, HTTPException, Depends, Request, Security
 from fastapi.security import OAuth2PasswordBearer
-from auth.auth_service import AuthService, SignupRequest
+from auth.auth_service import SignupRequest, User, get_auth_service, get_current_user
+from auth.auth_service import oauth2_scheme as bearer_token
+from auth.password_hasher import HasherBusyError
+from auth.rate_limit import RateLimitExceeded
+import asyncio
 import logging
-from config.roles import Role, Permission
+from config.roles import Role, Permission, ROLE_PERMISSIONS
 
 router = APIRouter()
 oauth2_scheme = OAuth2PasswordBearer(tokenUrl="token")
 logger = logging.getLogger(__name__)
 
 # Initialize auth service
-auth_service = AuthService(secret_key='your-secret-key')
+auth_service = get_auth_service()
 
 @router.post("/signup")
 async def signup(request: SignupRequest):
@@ -20,14 +24,17 @@ async def signup(request: SignupRequest):
     except ValueError as e:
         logger.error(f"Signup failed: {str(e)}")
         raise HTTPException(status_code=400, detail=str(e))
+    except HasherBusyError as e:
+        raise HTTPException(status_code=503, detail=str(e), headers={"Retry-After": "1"})
     except Exception as e:
         logger.error(f"Unexpected error during signup: {str(e)}")
         raise HTTPException(status_code=500, detail="Internal server error")
 
 @router.post("/login")
-async def login(username: str, password: str):
+async def login(username: str, password: str, request: Request):
+    client_ip = request.client.host if request.client else None
     try:
-        result = await auth_service.authenticate(username, password)
+        result = await auth_service.authenticate(username, password, client_ip)
         if not result:
             raise HTTPException(
                 status_code=401,
@@ -35,10 +42,28 @@ async def login(username: str, password: str):
             )
         logger.info(f"User logged in: {username}")
         return result
+    except HTTPException:
+        raise
+    except RateLimitExceeded as e:
+        logger.warning(f"Login rate limit hit for {username} from {client_ip}")
+        raise HTTPException(status_code=429, detail=str(e), headers={"Retry-After": str(int(e.retry_after) + 1)})
+    except HasherBusyError as e:
+        raise HTTPException(status_code=503, detail=str(e), headers={"Retry-After": "1"})
     except Exception as e:
         logger.error(f"Login failed: {str(e)}")
         raise HTTPException(status_code=401, detail="Authentication failed")
 
+@router.post("/logout")
+async def logout(
+    token: str = Security(bearer_token),
+    current_user: User = Depends(get_current_user)
+):
+    # Revocation is stored in the user database, so every worker rejects the token
+    if not await asyncio.to_thread(auth_service.revoke_token, token):
+        raise HTTPException(status_code=401, detail="Invalid or expired token")
+    logger.info(f"User logged out: {current_user.username}")
+    return {"message": "Token revoked"}
+
 @router.put("/users/{user_id}/role")
 async def update_role(
     user_id: int,
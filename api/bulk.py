@@ -0,0 +1,196 @@
+import json
+import logging
+from itertools import islice
+from django.db import DatabaseError, transaction
+from django.http import StreamingHttpResponse
+from django.utils import timezone
+from rest_framework.decorators import action
+from rest_framework.exceptions import ParseError
+from .caching import deferred_invalidation
+
+NDJSON_CONTENT_TYPES = ("application/x-ndjson", "application/jsonl", "application/ndjson")
+
+logger = logging.getLogger(__name__)
+
+
+def _chunks(iterable, size):
+    iterator = iter(iterable)
+    while True:
+        chunk = list(islice(iterator, size))
+        if not chunk:
+            return
+        yield chunk
+
+
+def _is_id(value):
+    # bool is an int subclass; {"id": true} must not address project 1
+    return isinstance(value, int) and not isinstance(value, bool)
+
+
+def _chunk_failed(error, results):
+    """Per-item error lines for a chunk whose write raised; the response is already streaming"""
+    logger.error(f"Bulk write failed for {len(results)} items: {str(error)}", exc_info=True)
+    return [{**result, "status": "error", "errors": "Database error"} for result in results]
+
+
+def _line(payload):
+    return json.dumps(payload, default=str) + "\n"
+
+
+class BulkModelMixin:
+    """
+    Bulk create, partial update and delete under ``<prefix>/bulk/``.
+
+    Input is either a JSON array or NDJSON (one object per line, sent with
+    an ``application/x-ndjson`` content type). NDJSON bodies are read line by
+    line, so a large import never has to be held in memory.
+    Items are processed in chunks of ``bulk_chunk_size``. Each item is
+    validated with the viewset's serializer, and each chunk is written with
+    one bulk_create/bulk_update/delete in its own transaction. Per-item results
+    are streamed back as NDJSON and end with a summary line. A database
+    error in one chunk marks that chunk's items as errors and processing
+    moves on; it does not roll back chunks already committed.
+    """
+
+    bulk_chunk_size = 500
+
+    def _iter_input(self, request):
+        """Yield (index, item, error) for each submitted item"""
+        content_type = request.content_type.split(";")[0].strip().lower()
+        if content_type in NDJSON_CONTENT_TYPES:
+            index = 0
+            # request.stream is None for an empty body and a buffered copy if
+            # the body was already read, so it is safe to iterate either way
+            for raw in request.stream or ():
+                if not raw.strip():
+                    continue
+                try:
+                    yield index, json.loads(raw), None
+                except ValueError as e:
+                    yield index, None, f"Invalid JSON: {e}"
+                index += 1
+            return
+
+        data = request.data
+        if isinstance(data, dict) and "ids" in data:
+            data = data["ids"]
+        if not isinstance(data, list):
+            raise ParseError("Expected a JSON array or an NDJSON body")
+        for index, item in enumerate(data):
+            yield index, item, None
+
+    def _stream(self, results):
+        response = StreamingHttpResponse(results, content_type="application/x-ndjson")
+        response["Cache-Control"] = "no-store"
+        return response
+
+    def _summarize(self, results):
+        counts = {}
+        for result in results:
+            counts[result["status"]] = counts.get(result["status"], 0) + 1
+            yield _line(result)
+        yield _line({"summary": counts})
+
+    @action(detail=False, methods=["post"], url_path="bulk")
+    def bulk(self, request, *args, **kwargs):
+        return self._stream(self._summarize(self._bulk_create(self._iter_input(request))))
+
+    @bulk.mapping.patch
+    def bulk_partial_update(self, request, *args, **kwargs):
+        return self._stream(self._summarize(self._bulk_update(self._iter_input(request))))
+
+    @bulk.mapping.delete
+    def bulk_destroy(self, request, *args, **kwargs):
+        return self._stream(self._summarize(self._bulk_delete(self._iter_input(request))))
+
+    def _bulk_create(self, items):
+        model = self.get_queryset().model
+        for chunk in _chunks(items, self.bulk_chunk_size):
+            valid = []
+            for index, item, error in chunk:
+                if error:
+                    yield {"index": index, "status": "error", "errors": error}
+                    continue
+                serializer = self.get_serializer(data=item)
+                if serializer.is_valid():
+                    valid.append((index, model(**serializer.validated_data)))
+                else:
+                    yield {"index": index, "status": "error", "errors": serializer.errors}
+
+            if not valid:
+                continue
+            try:
+                with deferred_invalidation(self.cache_prefix), transaction.atomic():
+                    created = model.objects.bulk_create([obj for _, obj in valid])
+            except DatabaseError as e:
+                yield from _chunk_failed(e, [{"index": index} for index, _ in valid])
+                continue
+            for (index, _), obj in zip(valid, created):
+                yield {"index": index, "status": "created", "id": obj.pk}
+
+    def _bulk_update(self, items):
+        queryset = self.get_queryset()
+        for chunk in _chunks(items, self.bulk_chunk_size):
+            requested = []
+            for index, item, error in chunk:
+                pk = item.get("id") if isinstance(item, dict) else None
+                if error or not _is_id(pk):
+                    yield {"index": index, "status": "error", "errors": error or "Each item needs an integer id"}
+                else:
+                    requested.append((index, item))
+
+            existing = queryset.in_bulk([item["id"] for _, item in requested])
+            changed, fields = [], set()
+            for index, item in requested:
+                instance = existing.get(item["id"])
+                if instance is None:
+                    yield {"index": index, "id": item["id"], "status": "not_found"}
+                    continue
+                serializer = self.get_serializer(instance, data=item, partial=True)
+                if not serializer.is_valid():
+                    yield {"index": index, "id": instance.pk, "status": "error", "errors": serializer.errors}
+                    continue
+                for field, value in serializer.validated_data.items():
+                    setattr(instance, field, value)
+                    fields.add(field)
+                changed.append((index, instance))
+
+            if not changed:
+                continue
+            now = timezone.now()
+            for _, instance in changed:
+                # bulk_update bypasses auto_now, and updated_at drives the ETags
+                instance.updated_at = now
+            try:
+                with deferred_invalidation(self.cache_prefix) as pending, transaction.atomic():
+                    queryset.model.objects.bulk_update([i for _, i in changed], sorted(fields | {"updated_at"}))
+                    pending.update(i.pk for _, i in changed)
+            except DatabaseError as e:
+                yield from _chunk_failed(e, [{"index": index, "id": i.pk} for index, i in changed])
+                continue
+            for index, instance in changed:
+                yield {"index": index, "id": instance.pk, "status": "updated"}
+
+    def _bulk_delete(self, items):
+        queryset = self.get_queryset()
+        for chunk in _chunks(items, self.bulk_chunk_size):
+            requested = []
+            for index, item, error in chunk:
+                pk = item.get("id") if isinstance(item, dict) else item
+                if error or not _is_id(pk):
+                    yield {"index": index, "status": "error", "errors": error or "Expected an integer id"}
+                else:
+                    requested.append((index, pk))
+
+            if not requested:
+                continue
+            try:
+                with deferred_invalidation(self.cache_prefix) as pending, transaction.atomic():
+                    found = set(queryset.filter(pk__in=[pk for _, pk in requested]).values_list("pk", flat=True))
+                    queryset.filter(pk__in=found).delete()
+                    pending.update(found)
+            except DatabaseError as e:
+                yield from _chunk_failed(e, [{"index": index, "id": pk} for index, pk in requested])
+                continue
+            for index, pk in requested:
+                yield {"index": index, "id": pk, "status": "deleted" if pk in found else "not_found"}
@@ -0,0 +1,144 @@
+import hashlib
+import threading
+from contextlib import contextmanager
+from django.core.cache import cache
+from django.core.exceptions import ValidationError
+from django.db.models import Count, Max
+from django.http import Http404
+from django.utils.cache import get_conditional_response, quote_etag
+from django.utils.http import http_date
+from rest_framework.response import Response
+
+
+def list_version_key(prefix):
+    return f"{prefix}:list-version"
+
+
+def detail_cache_key(prefix, pk):
+    return f"{prefix}:detail:{pk}"
+
+
+def list_cache_key(prefix, request):
+    """Cache key for one list URL, scoped to the current list version"""
+    version = cache.get_or_set(list_version_key(prefix), 1, timeout=None)
+    params = sorted(request.query_params.lists())
+    digest = hashlib.md5(f"{request.get_host()}?{params}".encode()).hexdigest()
+    return f"{prefix}:list:{version}:{digest}"
+
+
+_deferred = threading.local()
+
+
+def invalidate(prefix, pk=None):
+    """Drop a cached object and retire every cached list page"""
+    pending = getattr(_deferred, "pending", None)
+    if pending is not None:
+        if pk is not None:
+            pending.add(pk)
+        return
+    invalidate_many(prefix, [pk] if pk is not None else [])
+
+
+def invalidate_many(prefix, pks):
+    """Drop several cached objects and bump the list version once"""
+    if pks:
+        cache.delete_many([detail_cache_key(prefix, pk) for pk in pks])
+    try:
+        cache.incr(list_version_key(prefix))
+    except ValueError:
+        cache.set(list_version_key(prefix), 1, timeout=None)
+
+
+@contextmanager
+def deferred_invalidation(prefix):
+    """
+    Collect invalidations (from signals or added to the yielded set) inside
+    the block and apply them in one pass when it exits.
+    """
+    pending = set()
+    _deferred.pending = pending
+    try:
+        yield pending
+    finally:
+        _deferred.pending = None
+        invalidate_many(prefix, pending)
+
+
+def make_etag(*parts):
+    return quote_etag(hashlib.md5(":".join(str(p) for p in parts).encode()).hexdigest())
+
+
+class ConditionalCacheMixin:
+    """
+    ETag/Last-Modified validation and response caching for a viewset
+    whose model has an ``updated_at`` column.
+
+    A detail's ETag and Last-Modified come from its ``updated_at``. A list
+    only gets an ETag, built from the max ``updated_at`` and row count of the
+    filtered queryset, since deletes do not move ``updated_at``. Matching
+    If-None-Match / If-Modified-Since requests get a 304 before anything is
+    serialized. Serialized data is cached per object and per list URL;
+    model signals call :func:`invalidate` on save/delete. Bulk
+    ``QuerySet.update()`` calls send no signals and must invalidate
+    explicitly.
+    """
+
+    cache_prefix = None
+    cache_timeout = 300
+
+    def list(self, request, *args, **kwargs):
+        key = list_cache_key(self.cache_prefix, request)
+        cached = cache.get(key)
+        if cached is None:
+            summary = self.filter_queryset(self.get_queryset()).aggregate(
+                last_modified=Max("updated_at"), count=Count("pk")
+            )
+            # No Last-Modified: a delete leaves max(updated_at) unchanged, so only the ETag notices it
+            etag = make_etag(summary["last_modified"], summary["count"], key)
+            not_modified = get_conditional_response(request, etag=etag)
+            if not_modified is not None:
+                return not_modified
+            response = super().list(request, *args, **kwargs)
+            cached = {"etag": etag, "last_modified": None, "data": response.data}
+            cache.set(key, cached, self.cache_timeout)
+        return self._cached_response(request, cached)
+
+    def _lookup_pk(self, kwargs):
+        """The URL's lookup value as a real pk, so ``/01/`` and ``/1/`` share a cache key"""
+        try:
+            return self.get_queryset().model._meta.pk.to_python(kwargs[self.lookup_url_kwarg or self.lookup_field])
+        except ValidationError:
+            raise Http404
+
+    def retrieve(self, request, *args, **kwargs):
+        pk = self._lookup_pk(kwargs)
+        # Sparse-fieldset variants are validated but only the full representation is cached
+        cacheable = not request.query_params
+        key = detail_cache_key(self.cache_prefix, pk)
+        cached = cache.get(key) if cacheable else None
+        if cached is None:
+            updated_at = self.get_queryset().filter(pk=pk).values_list("updated_at", flat=True).first()
+            if updated_at is None:
+                return super().retrieve(request, *args, **kwargs)
+            etag = make_etag(pk, updated_at, sorted(request.query_params.lists()))
+            last_modified = updated_at.timestamp()
+            not_modified = get_conditional_response(request, etag=etag, last_modified=last_modified)
+            if not_modified is not None:
+                return not_modified
+            response = super().retrieve(request, *args, **kwargs)
+            cached = {"etag": etag, "last_modified": last_modified, "data": response.data}
+            if cacheable:
+                cache.set(key, cached, self.cache_timeout)
+        return self._cached_response(request, cached)
+
+    def _cached_response(self, request, cached):
+        not_modified = get_conditional_response(
+            request, etag=cached["etag"], last_modified=cached["last_modified"]
+        )
+        if not_modified is not None:
+            return not_modified
+        response = Response(cached["data"])
+        response["ETag"] = cached["etag"]
+        if cached["last_modified"] is not None:
+            response["Last-Modified"] = http_date(cached["last_modified"])
+        return response
@@ -1,4 +1,4 @@
-from fastapi import APIRouter, HTTPException, Depends
+from fastapi import APIRouter, HTTPException, Depends, Request
 from typing import List, Optional
 from datetime import datetime, timedelta
 from models.dashboard import (
@@ -10,6 +10,7 @@ from models.dashboard import (
 )
 from services.cleanup import CleanupService
 from auth.auth_service import get_current_user
+from api.responses import FastJSONResponse, json_response
 from config.roles import Permission
 import logging
 
@@ -47,13 +48,14 @@ async def get_dashboard_overview(current_user = Depends(get_current_user)):
         logger.error(f"Failed to get dashboard overview: {str(e)}")
         raise HTTPException(status_code=500, detail="Failed to get dashboard data")
 
-@router.get("/performance", response_model=PerformanceMetrics)
+@router.get("/performance", response_model=PerformanceMetrics, response_class=FastJSONResponse)
 async def get_performance_metrics(
+    request: Request,
     time_range: str = "24h",
     current_user = Depends(get_current_user)
 ):
     try:
-        return await cleanup_service.get_performance_metrics(time_range)
+        return json_response(request, await cleanup_service.get_performance_metrics(time_range), PerformanceMetrics)
     except Exception as e:
         logger.error(f"Failed to get performance metrics: {str(e)}")
         raise HTTPException(status_code=500, detail="Failed to get performance data")
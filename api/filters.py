@@ -0,0 +1,56 @@
+from django.utils.dateparse import parse_date, parse_datetime
+from rest_framework.exceptions import ValidationError
+from rest_framework.filters import BaseFilterBackend
+
+
+class ProjectFilterBackend(BaseFilterBackend):
+    """
+    Filters projects on indexed columns only.
+
+    ``name`` matches exactly and ``name__startswith`` by prefix; both can use
+    the name index. ``created_after``/``created_before`` and
+    ``updated_after``/``updated_before`` take ISO dates or datetimes and
+    become range conditions on the timestamp indexes.
+    """
+
+    lookups = {
+        "name": "name",
+        "name__startswith": "name__startswith",
+        "created_after": "created_at__gte",
+        "created_before": "created_at__lt",
+        "updated_after": "updated_at__gte",
+        "updated_before": "updated_at__lt",
+    }
+
+    def filter_queryset(self, request, queryset, view):
+        conditions = {}
+        for param, lookup in self.lookups.items():
+            value = request.query_params.get(param)
+            if value in (None, ""):
+                continue
+            if param.startswith(("created_", "updated_")):
+                value = self._parse_timestamp(param, value)
+            conditions[lookup] = value
+        return queryset.filter(**conditions) if conditions else queryset
+
+    @staticmethod
+    def _parse_timestamp(param, value):
+        parsed = parse_datetime(value) or parse_date(value)
+        if parsed is None:
+            raise ValidationError({param: f"Invalid date or datetime: {value}"})
+        return parsed
+
+    def get_schema_operation_parameters(self, view):
+        parameters = []
+        for param, lookup in self.lookups.items():
+            schema = {"type": "string"}
+            if lookup.startswith(("created_at", "updated_at")):
+                schema["format"] = "date-time"
+            parameters.append({
+                "name": param,
+                "required": False,
+                "in": "query",
+                "description": f"Filter on {lookup.replace('__', ' ')}",
+                "schema": schema,
+            })
+        return parameters
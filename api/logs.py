@@ -1,4 +1,4 @@
-from fastapi import APIRouter, HTTPException, Depends, Query, Response
+from fastapi import APIRouter, HTTPException, Depends, Query, Request, Response
 from typing import List, Optional, Dict
 from datetime import datetime, timedelta
 from models.logs import (
@@ -9,6 +9,7 @@ from models.logs import (
 )
 from services.log_service import LogService
 from auth.auth_service import get_current_user
+from api.responses import FastJSONResponse, json_response
 from config.roles import Permission
 import logging
 from pathlib import Path
@@ -17,8 +18,9 @@ router = APIRouter()
 logger = logging.getLogger(__name__)
 log_service = LogService()
 
-@router.get("/", response_model=PaginatedLogs)
+@router.get("/", response_model=PaginatedLogs, response_class=FastJSONResponse)
 async def get_logs(
+    request: Request,
     level: Optional[str] = Query(None),
     start_date: Optional[datetime] = Query(None),
     end_date: Optional[datetime] = Query(None),
@@ -34,7 +36,7 @@ async def get_logs(
             end_date=end_date,
             search=search
         )
-        return await log_service.get_logs(log_filter, page, limit)
+        return json_response(request, await log_service.get_logs(log_filter, page, limit), PaginatedLogs)
     except Exception as e:
         logger.error(f"Failed to get logs: {str(e)}")
         raise HTTPException(status_code=500, detail="Failed to retrieve logs")
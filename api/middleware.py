@@ -0,0 +1,49 @@
+import time
+from django.http import HttpResponse
+from services.metrics import observe_request, render_latest
+from services.tracing import SamplingConfig, report_failed_request, report_slow_request
+
+
+class SlowRequestMiddleware:
+    """
+    Report requests slower than TRACES_SLOW_REQUEST_MS, and requests failing
+    with a 5xx as a separate kind of event, even when the trace sampler
+    skipped them.
+    """
+
+    def __init__(self, get_response):
+        self.get_response = get_response
+        self.threshold_ms = SamplingConfig.from_env().slow_request_ms
+
+    def __call__(self, request):
+        started = time.perf_counter()
+        response = self.get_response(request)
+        duration_ms = (time.perf_counter() - started) * 1000
+        if duration_ms >= self.threshold_ms or response.status_code >= 500:
+            # Group by URL pattern rather than concrete path so ids don't split reports
+            match = request.resolver_match
+            route = f"/{match.route}" if match is not None and match.route else request.path
+            # Errors get their own event so they don't pollute slow-endpoint grouping
+            report = report_failed_request if response.status_code >= 500 else report_slow_request
+            report(request.method, route, duration_ms, response.status_code)
+        return response
+
+
+class RequestMetricsMiddleware:
+    """Record Django request latency per URL pattern for the /metrics scrape"""
+
+    def __init__(self, get_response):
+        self.get_response = get_response
+
+    def __call__(self, request):
+        started = time.perf_counter()
+        response = self.get_response(request)
+        match = request.resolver_match
+        route = f"/{match.route}" if match is not None and match.route else "<unmatched>"
+        observe_request(request.method, route, response.status_code, time.perf_counter() - started)
+        return response
+
+
+def metrics_view(request):
+    body, content_type = render_latest()
+    return HttpResponse(body, content_type=content_type)
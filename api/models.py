@@ -7,5 +7,12 @@ class Project(models.Model):
     created_at = models.DateTimeField(auto_now_add=True)
     updated_at = models.DateTimeField(auto_now=True)
 
+    class Meta:
+        indexes = [
+            models.Index(fields=["name"], name="project_name_idx"),
+            models.Index(fields=["created_at"], name="project_created_at_idx"),
+            models.Index(fields=["updated_at"], name="project_updated_at_idx"),
+        ]
+
     def __str__(self):
         return self.name
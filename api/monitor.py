@@ -1,9 +1,15 @@
-from fastapi import APIRouter, HTTPException
+from fastapi import APIRouter, Depends, HTTPException, Request
+from fastapi.responses import FileResponse
 from datetime import datetime, timedelta
+import json
 import logging
 from typing import List, Dict
 from services.cleanup import CleanupService
-from models.stats import SchedulerStats, CleanupHistory
+from models.stats import SchedulerStats, CleanupHistory, CleanupProfile, CleanupProfileSummary
+from auth.auth_service import get_current_user
+from services.profiling import ARTIFACTS
+from api.responses import FastJSONResponse, json_response
+from services.db_pool import pool_metrics
 
 router = APIRouter()
 logger = logging.getLogger(__name__)
@@ -22,16 +28,39 @@ async def get_scheduler_stats():
             "next_scheduled_run": cleanup_service.get_next_scheduled_run(),
             "metrics": metrics,
             "disk_usage": disk_usage,
-            "active_jobs": len(cleanup_service.scheduler.get_jobs())
+            "active_jobs": len(cleanup_service.scheduler.get_jobs()),
+            "db_pools": pool_metrics()
         }
     except Exception as e:
         logger.error(f"Failed to get scheduler stats: {str(e)}")
         raise HTTPException(status_code=500, detail="Failed to get scheduler statistics")
 
-@router.get("/history", response_model=List[CleanupHistory])
-async def get_cleanup_history():
+@router.get("/history", response_model=List[CleanupHistory], response_class=FastJSONResponse)
+async def get_cleanup_history(request: Request):
     try:
-        return await cleanup_service.get_cleanup_history()
+        return json_response(request, await cleanup_service.get_cleanup_history(), CleanupHistory)
     except Exception as e:
         logger.error(f"Failed to get cleanup history: {str(e)}")
-        raise HTTPException(status_code=500, detail="Failed to get cleanup history") 
\ No newline at end of file
+        raise HTTPException(status_code=500, detail="Failed to get cleanup history")
+
+@router.get("/profiles", response_model=List[CleanupProfileSummary])
+async def list_cleanup_profiles(current_user = Depends(get_current_user)):
+    try:
+        return cleanup_service.profile_store.list_profiles()
+    except Exception as e:
+        logger.error(f"Failed to list cleanup profiles: {str(e)}")
+        raise HTTPException(status_code=500, detail="Failed to list cleanup profiles")
+
+@router.get("/profiles/{run_id}", response_model=CleanupProfile)
+async def get_cleanup_profile(run_id: str, current_user = Depends(get_current_user)):
+    path = cleanup_service.profile_store.artifact_path(run_id, "timeline.json")
+    if path is None:
+        raise HTTPException(status_code=404, detail="Profile not found")
+    return json.loads(path.read_text())
+
+@router.get("/profiles/{run_id}/{artifact}")
+async def download_cleanup_profile(run_id: str, artifact: str, current_user = Depends(get_current_user)):
+    path = cleanup_service.profile_store.artifact_path(run_id, artifact)
+    if path is None:
+        raise HTTPException(status_code=404, detail="Profile artifact not found")
+    return FileResponse(path, media_type=ARTIFACTS[artifact], filename=f"cleanup_{run_id}_{artifact}")
@@ -0,0 +1,15 @@
+from rest_framework.pagination import CursorPagination
+
+
+class CreatedAtCursorPagination(CursorPagination):
+    """
+    Cursor pagination over the indexed ``created_at`` column.
+
+    Pages are fetched with a ``WHERE created_at < cursor`` range scan instead
+    of an OFFSET, so deep pages cost the same as the first one and rows
+    inserted while paging never shift results between pages.
+    """
+    ordering = "-created_at"
+    page_size = 50
+    page_size_query_param = "page_size"
+    max_page_size = 500
@@ -1,26 +1,45 @@
-from fastapi import APIRouter, HTTPException, Depends, Query, Response, BackgroundTasks
-from typing import List, Optional
-from datetime import datetime, timedelta
+from fastapi import APIRouter, HTTPException, Depends, Query
+from fastapi.responses import FileResponse, JSONResponse, StreamingResponse
+from contextlib import asynccontextmanager
+from datetime import datetime
 from models.reports import (
     PerformanceReport,
     CleanupStats,
     ReportSchedule,
     ReportFormat,
-    ReportType
+    ReportType,
+    ExportFormat,
+    ReportJobRequest,
+    ReportJobStatus
 )
 from services.report_service import ReportService
-from services.email_service import EmailService
+from services.report_jobs import ReportJob, ReportJobManager
+from services.report_export import EXPORT_MEDIA_TYPES, export_runs
+from services.report_scheduler import ScheduledReportExecutor
+from services.notifications import EmailService
 from auth.auth_service import get_current_user
 import logging
-import pandas as pd
-import io
 
 router = APIRouter()
 logger = logging.getLogger(__name__)
 report_service = ReportService()
 email_service = EmailService()
+report_jobs = ReportJobManager(report_service)
+report_scheduler = ScheduledReportExecutor(report_jobs, email_service)
 
-@router.get("/performance", response_model=PerformanceReport)
+def _job_status(job: ReportJob) -> ReportJobStatus:
+    return ReportJobStatus(
+        job_id=job.id,
+        status=job.status,
+        report_type=job.report_type,
+        format=job.format,
+        created_at=job.created_at,
+        completed_at=job.completed_at,
+        error=job.error,
+        download_url=f"/reports/jobs/{job.id}/download" if job.status == "completed" else None
+    )
+
+@router.get("/performance", response_model=PerformanceReport, responses={202: {"model": ReportJobStatus}})
 async def get_performance_report(
     start_date: datetime = Query(...),
     end_date: datetime = Query(...),
@@ -28,31 +47,40 @@ async def get_performance_report(
     current_user = Depends(get_current_user)
 ):
     try:
+        if format in (ReportFormat.EXCEL, ReportFormat.PDF):
+            # Excel/PDF are rendered as a background job; poll /jobs/{id}?wait=... and download it when done
+            job = await report_jobs.submit(ReportType.PERFORMANCE, start_date, end_date, format)
+            return JSONResponse(
+                status_code=202,
+                content=_job_status(job).model_dump(mode="json"),
+                headers={"Location": f"/reports/jobs/{job.id}"}
+            )
+
         report_data = await report_service.generate_performance_report(
             start_date,
             end_date
         )
-
-        if format == ReportFormat.EXCEL:
-            excel_data = await report_service.generate_excel_report(report_data)
-            return Response(
-                content=excel_data,
-                media_type="application/vnd.openxmlformats-officedocument.spreadsheetml.sheet",
-                headers={"Content-Disposition": "attachment; filename=performance-report.xlsx"}
-            )
-        elif format == ReportFormat.PDF:
-            pdf_data = await report_service.generate_pdf_report(report_data)
-            return Response(
-                content=pdf_data,
-                media_type="application/pdf",
-                headers={"Content-Disposition": "attachment; filename=performance-report.pdf"}
-            )
-
         return report_data
     except Exception as e:
         logger.error(f"Failed to generate performance report: {str(e)}")
         raise HTTPException(status_code=500, detail="Failed to generate report")
 
+@router.get("/export")
+async def export_cleanup_runs(
+    start_date: datetime = Query(...),
+    end_date: datetime = Query(...),
+    format: ExportFormat = ExportFormat.CSV,
+    current_user = Depends(get_current_user)
+):
+    if end_date < start_date:
+        raise HTTPException(status_code=400, detail="End date must be after start date")
+    # Rows are streamed from the run store as they are read; nothing is buffered whole
+    return StreamingResponse(
+        export_runs(report_service.rollups, start_date, end_date, format),
+        media_type=EXPORT_MEDIA_TYPES[format],
+        headers={"Content-Disposition": f"attachment; filename=cleanup-runs.{format.value}"}
+    )
+
 @router.get("/cleanup-stats", response_model=CleanupStats)
 async def get_cleanup_statistics(
     period: str = "30d",
@@ -64,20 +92,71 @@ async def get_cleanup_statistics(
         logger.error(f"Failed to get cleanup stats: {str(e)}")
         raise HTTPException(status_code=500, detail="Failed to get cleanup statistics")
 
+@asynccontextmanager
+async def lifespan(app):
+    """Start the report scheduler and stop it and the render pool; pass to FastAPI(lifespan=...)"""
+    report_scheduler.start()
+    try:
+        yield
+    finally:
+        await report_scheduler.stop()
+        report_jobs.shutdown()
+
 @router.post("/schedule")
 async def schedule_report(
     report_schedule: ReportSchedule,
-    background_tasks: BackgroundTasks,
     current_user = Depends(get_current_user)
 ):
     try:
-        job_id = await report_service.schedule_report(
-            report_schedule,
-            background_tasks
-        )
+        job_id = report_scheduler.add(report_schedule)
         return {"message": "Report scheduled successfully", "job_id": job_id}
     except ValueError as e:
         raise HTTPException(status_code=400, detail=str(e))
     except Exception as e:
         logger.error(f"Failed to schedule report: {str(e)}")
-        raise HTTPException(status_code=500, detail="Failed to schedule report") 
\ No newline at end of file
+        raise HTTPException(status_code=500, detail="Failed to schedule report")
+
+@router.post("/jobs", response_model=ReportJobStatus, status_code=202)
+async def submit_report_job(
+    job_request: ReportJobRequest,
+    current_user = Depends(get_current_user)
+):
+    try:
+        job = await report_jobs.submit(
+            job_request.report_type,
+            job_request.start_date,
+            job_request.end_date,
+            job_request.format
+        )
+        return _job_status(job)
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+    except Exception as e:
+        logger.error(f"Failed to submit report job: {str(e)}")
+        raise HTTPException(status_code=500, detail="Failed to submit report job")
+
+@router.get("/jobs/{job_id}", response_model=ReportJobStatus)
+async def get_report_job(
+    job_id: str,
+    wait: float = Query(0, ge=0, le=60),
+    current_user = Depends(get_current_user)
+):
+    # wait > 0 long-polls until the job completes or the timeout elapses
+    job = await report_jobs.wait(job_id, wait)
+    if job is None:
+        raise HTTPException(status_code=404, detail="Report job not found")
+    return _job_status(job)
+
+@router.get("/jobs/{job_id}/download")
+async def download_report_artifact(
+    job_id: str,
+    current_user = Depends(get_current_user)
+):
+    job = report_jobs.get(job_id)
+    if job is None:
+        raise HTTPException(status_code=404, detail="Report job not found")
+    if job.status != "completed":
+        raise HTTPException(status_code=409, detail=f"Report job is {job.status}")
+    if not job.artifact_path.exists():
+        raise HTTPException(status_code=410, detail="Report artifact has expired")
+    return FileResponse(job.artifact_path, media_type=job.media_type, filename=job.filename)
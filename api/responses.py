@@ -0,0 +1,90 @@
+from typing import Any, Dict, Optional, Type
+import gzip
+from fastapi import Request, Response
+from pydantic import BaseModel
+import pydantic_core
+
+try:
+    import brotli
+except ImportError:
+    brotli = None
+
+# Bodies smaller than this are sent uncompressed; compressing them costs more than it saves
+COMPRESSION_MIN_SIZE = 1024
+GZIP_LEVEL = 5
+BROTLI_QUALITY = 4
+
+
+def _accepted_encodings(header: str) -> Dict[str, float]:
+    encodings = {}
+    for part in header.split(','):
+        name, _, params = part.strip().partition(';')
+        quality = 1.0
+        params = params.strip()
+        if params.startswith('q='):
+            try:
+                quality = float(params[2:])
+            except ValueError:
+                quality = 0.0
+        if name:
+            encodings[name.strip().lower()] = quality
+    return encodings
+
+
+class FastJSONResponse(Response):
+    """
+    JSON response serialized by pydantic-core straight from models.
+
+    Models (or lists/dicts of them) are written to JSON bytes in one pass,
+    skipping FastAPI's jsonable_encoder dict conversion. Bodies above
+    ``minimum_size`` are compressed with brotli or gzip when the client
+    accepts it.
+    """
+    media_type = "application/json"
+
+    def __init__(self, content: Any, status_code: int = 200, headers: Optional[Dict[str, str]] = None,
+                 accept_encoding: str = "", minimum_size: int = COMPRESSION_MIN_SIZE):
+        self.accept_encoding = accept_encoding
+        self.minimum_size = minimum_size
+        self.content_encoding: Optional[str] = None
+        super().__init__(content, status_code=status_code, headers=headers)
+        if self.content_encoding:
+            self.headers['content-encoding'] = self.content_encoding
+        self.headers['vary'] = 'Accept-Encoding'
+
+    def render(self, content: Any) -> bytes:
+        body = pydantic_core.to_json(content)
+        if len(body) < self.minimum_size or not self.accept_encoding:
+            return body
+
+        accepted = _accepted_encodings(self.accept_encoding)
+        if brotli is not None and accepted.get('br', 0) > 0:
+            self.content_encoding = 'br'
+            return brotli.compress(body, quality=BROTLI_QUALITY)
+        if accepted.get('gzip', 0) > 0:
+            self.content_encoding = 'gzip'
+            return gzip.compress(body, compresslevel=GZIP_LEVEL, mtime=0)
+        return body
+
+
+def json_response(request: Request, content: Any, model: Optional[Type[BaseModel]] = None,
+                  status_code: int = 200) -> FastJSONResponse:
+    """
+    Build a FastJSONResponse for an endpoint.
+
+    Args:
+        request: Incoming request, used for content negotiation
+        content: Model instance(s) or plain data to serialize
+        model: If given, validate dict content (or dict items of a list) into this model first
+            (FastAPI skips response_model handling for returned Response objects)
+    """
+    if model is not None:
+        if isinstance(content, dict):
+            content = model.model_validate(content)
+        elif isinstance(content, list):
+            content = [model.model_validate(item) if isinstance(item, dict) else item for item in content]
+    return FastJSONResponse(
+        content,
+        status_code=status_code,
+        accept_encoding=request.headers.get('accept-encoding', '')
+    )
@@ -3,6 +3,18 @@ from .models import Project
 
 
 class ProjectSerializer(serializers.ModelSerializer):
+    """
+    Accepts an optional ``fields`` argument limiting which fields are
+    serialized, for sparse fieldsets (``?fields=id,name``).
+    """
+
+    def __init__(self, *args, **kwargs):
+        fields = kwargs.pop("fields", None)
+        super().__init__(*args, **kwargs)
+        if fields is not None:
+            for name in set(self.fields) - set(fields):
+                self.fields.pop(name)
+
     class Meta:
         model = Project
         fields = ["id", "name", "description", "created_at", "updated_at"]
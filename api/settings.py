@@ -9,6 +9,7 @@ from models.settings import (
     NotificationSettings
 )
 from services.settings import SettingsService
+from services.profiling import ProfileStore
 from auth.auth_service import get_current_user
 from config.roles import Permission
 import logging
@@ -19,6 +20,7 @@ from pathlib import Path
 router = APIRouter()
 logger = logging.getLogger(__name__)
 settings_service = SettingsService()
+profile_store = ProfileStore()
 
 @router.get("/current", response_model=SchedulerSettings)
 async def get_current_settings(current_user = Depends(get_current_user)):
@@ -71,4 +73,14 @@ async def restore_settings(
         return {"message": "Settings restored successfully"}
     except Exception as e:
         logger.error(f"Failed to restore settings: {str(e)}")
-        raise HTTPException(status_code=500, detail="Failed to restore settings") 
\ No newline at end of file
+        raise HTTPException(status_code=500, detail="Failed to restore settings")
+
+@router.post("/profile-next-run", status_code=202)
+async def profile_next_cleanup_run(current_user = Depends(get_current_user)):
+    try:
+        profile_store.request_next_run(current_user.username)
+        logger.info(f"Cleanup profiling requested by user: {current_user.username}")
+        return {"message": "The next cleanup run will be profiled"}
+    except Exception as e:
+        logger.error(f"Failed to request cleanup profiling: {str(e)}")
+        raise HTTPException(status_code=500, detail="Failed to request cleanup profiling")
@@ -0,0 +1,11 @@
+from django.db.models.signals import post_delete, post_save
+from django.dispatch import receiver
+from .caching import invalidate
+from .models import Project
+from .views import ProjectViewSet
+
+
+@receiver(post_save, sender=Project)
+@receiver(post_delete, sender=Project)
+def invalidate_project_cache(sender, instance, **kwargs):
+    invalidate(ProjectViewSet.cache_prefix, instance.pk)
@@ -0,0 +1,168 @@
+import asyncio
+import os
+import tempfile
+import time
+from datetime import datetime
+from unittest import IsolatedAsyncioTestCase, TestCase, mock
+from fastapi import HTTPException
+from auth.auth_service import AuthService, User
+from auth.password_hasher import PasswordHasher
+from auth.rate_limit import LoginRateLimiter, RateLimitExceeded
+from auth.user_repository import UserRepository
+from config.roles import Role, Permission, ROLE_PERMISSIONS
+
+# api.auth_routes builds its AuthService at import; keep its database out of the working directory
+os.environ.setdefault("AUTH_DATABASE_URL", "sqlite://")
+from api import auth_routes
+
+
+def make_user(role):
+    return User(id=1, username="alice", email="alice@example.com", role=role,
+                password_hash="", created_at=datetime.utcnow())
+
+
+def make_repository(test):
+    tmp = tempfile.TemporaryDirectory()
+    test.addCleanup(tmp.cleanup)
+    return UserRepository(f"sqlite:///{tmp.name}/users.db")
+
+
+class AuthServiceTokenTests(TestCase):
+    def setUp(self):
+        self.service = AuthService(secret_key="test-secret", token_cache_size=2,
+                                   user_repository=make_repository(self))
+
+    def test_verified_tokens_are_cached(self):
+        """
+        Ensure a token is decoded once and then served from the cache.
+        """
+        token = self.service.create_token(make_user(Role.MANAGER))
+        for _ in range(3):
+            self.assertEqual(self.service.verify_token(token)["username"], "alice")
+        self.assertEqual(self.service.token_cache.misses, 1)
+        self.assertEqual(self.service.token_cache.hits, 2)
+        self.assertTrue(self.service.token_has_permission(token, Permission.TRIGGER_CLEANUP))
+        self.assertFalse(self.service.token_has_permission(token, Permission.MANAGE_USERS))
+        self.assertIsNone(self.service.verify_token(token + "x"))
+
+    def test_revoked_token_is_rejected(self):
+        """
+        Ensure revoking a cached token takes effect immediately.
+        """
+        token = self.service.create_token(make_user(Role.USER))
+        other = self.service.create_token(make_user(Role.USER))
+        self.service.verify_token(token)
+        self.assertTrue(self.service.revoke_token(token))
+        self.assertIsNone(self.service.verify_token(token))
+        self.assertIsNotNone(self.service.verify_token(other))
+
+    def test_revocation_reaches_other_workers(self):
+        """
+        Ensure a token revoked by one service is rejected by another sharing the user database.
+        """
+        other = AuthService(secret_key="test-secret", revocation_refresh=0,
+                            user_repository=UserRepository(str(self.service.users.engine.url)))
+        token = self.service.create_token(make_user(Role.USER))
+        self.assertIsNotNone(other.verify_token(token))
+        self.assertTrue(self.service.revoke_token(token))
+        self.assertIsNone(other.verify_token(token))
+
+    def test_permission_bitmask_matches_role_sets(self):
+        """
+        Ensure the bit test agrees with ROLE_PERMISSIONS for every role.
+        """
+        for role in Role:
+            user = make_user(role)
+            for permission in Permission:
+                self.assertEqual(self.service.has_permission(user, permission),
+                                 permission in ROLE_PERMISSIONS[role])
+
+
+class AuthServicePasswordTests(IsolatedAsyncioTestCase):
+    def setUp(self):
+        self.service = AuthService(
+            secret_key="test-secret",
+            password_hasher=PasswordHasher(max_workers=2, rounds=10),
+            login_limiter=LoginRateLimiter(per_user=3, per_user_window=60),
+            user_repository=make_repository(self)
+        )
+
+    def tearDown(self):
+        self.service.password_hasher.shutdown()
+
+    async def test_hashing_does_not_block_event_loop(self):
+        """
+        Ensure the loop keeps running while logins are being verified.
+        """
+        await self.service.create_user("alice", "s3cret!pass")
+        ticks = 0
+
+        async def ticker():
+            nonlocal ticks
+            while True:
+                ticks += 1
+                await asyncio.sleep(0.005)
+
+        task = asyncio.create_task(ticker())
+        started = time.perf_counter()
+        results = await asyncio.gather(
+            self.service.authenticate("alice", "s3cret!pass", "10.0.0.1"),
+            self.service.authenticate("alice", "wrong", "10.0.0.2"),
+        )
+        elapsed = time.perf_counter() - started
+        task.cancel()
+
+        self.assertIsNotNone(results[0])
+        self.assertIsNone(results[1])
+        self.assertGreater(ticks, elapsed / 0.005 / 2)
+        self.assertEqual(self.service.password_hasher.metrics()["completed"], 3)
+
+    async def test_repeated_attempts_are_rate_limited(self):
+        """
+        Ensure a username is locked out after too many attempts.
+        """
+        await self.service.create_user("bob", "s3cret!pass")
+        for _ in range(3):
+            self.assertIsNone(await self.service.authenticate("bob", "wrong"))
+        with self.assertRaises(RateLimitExceeded) as ctx:
+            await self.service.authenticate("bob", "s3cret!pass")
+        self.assertGreater(ctx.exception.retry_after, 0)
+
+    async def test_users_persist_across_service_instances(self):
+        """
+        Ensure users and role changes are visible to another worker's service.
+        """
+        admin = await self.service.create_user("root", "s3cret!pass", role=Role.ADMIN, email="root@example.com")
+        bob = await self.service.create_user("bob", "s3cret!pass", email="bob@example.com")
+        self.assertNotEqual(admin.id, bob.id)
+        with self.assertRaises(ValueError):
+            await self.service.create_user("bob2", "s3cret!pass", email="bob@example.com")
+
+        other = AuthService(secret_key="test-secret", password_hasher=self.service.password_hasher,
+                            user_repository=UserRepository(str(self.service.users.engine.url)))
+        await self.service.update_user_role(bob.id, Role.MANAGER, admin)
+        self.assertEqual((await other.get_user(bob.id)).role, Role.MANAGER)
+        self.assertIsNotNone(await other.authenticate("bob", "s3cret!pass"))
+
+
+class LogoutEndpointTests(IsolatedAsyncioTestCase):
+    def setUp(self):
+        self.service = AuthService(secret_key="test-secret", user_repository=make_repository(self))
+        patcher = mock.patch.object(auth_routes, "auth_service", self.service)
+        patcher.start()
+        self.addCleanup(patcher.stop)
+
+    async def test_logout_revokes_token(self):
+        """
+        Ensure /logout revokes the bearer token and a second logout with it fails.
+        """
+        user = make_user(Role.USER)
+        token = self.service.create_token(user)
+        response = await auth_routes.logout(token=token, current_user=user)
+        self.assertEqual(response, {"message": "Token revoked"})
+        self.assertIsNone(self.service.verify_token(token))
+        self.assertIsNotNone(self.service.verify_token(self.service.create_token(user)))
+
+        with self.assertRaises(HTTPException) as raised:
+            await auth_routes.logout(token=token, current_user=user)
+        self.assertEqual(raised.exception.status_code, 401)
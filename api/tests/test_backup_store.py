@@ -0,0 +1,171 @@
+import os
+import tempfile
+import threading
+from datetime import datetime, timedelta
+from pathlib import Path
+from unittest import TestCase
+from services.backup_store import BackupStore, RetentionPolicy
+
+
+class BackupStoreTests(TestCase):
+    def setUp(self):
+        self.tmp = tempfile.TemporaryDirectory()
+        self.root = Path(self.tmp.name)
+        self.store = BackupStore(self.root / "backups", min_chunk=4096, avg_chunk=16384, max_chunk=65536)
+        self.rows = [f"INSERT INTO records VALUES ({i}, 'payload {i}');\n" for i in range(20000)]
+
+    def tearDown(self):
+        self.tmp.cleanup()
+
+    def _dump(self, name, rows, created_at=None):
+        path = self.store.staging_path(f"{name}.sql")
+        path.write_text("".join(rows))
+        if created_at:
+            os.utime(path, (created_at.timestamp(), created_at.timestamp()))
+        return self.store.ingest(path)
+
+    def test_unchanged_data_is_deduplicated(self):
+        """
+        Ensure a second backup only stores the chunks around a change.
+        """
+        first = self._dump("first", self.rows)
+        changed = list(self.rows)
+        changed[10000] = "INSERT INTO records VALUES (10000, 'updated');\n"
+        second = self._dump("second", changed)
+
+        self.assertEqual(first.reused_bytes, 0)
+        self.assertLess(second.new_bytes, second.size // 5)
+        self.assertFalse(self.store.staging_path("second.sql").exists())
+
+        restored = self.store.restore("second", self.root / "restored.sql")
+        self.assertEqual(restored.read_text(), "".join(changed))
+
+    def test_prune_applies_gfs_policy_and_collects_chunks(self):
+        """
+        Ensure pruning keeps one backup per retained period and frees unreferenced chunks.
+        """
+        now = datetime(2024, 3, 31, 12, 0)
+        for day in range(60):
+            rows = self.rows[:1000] + [f"-- day {day}\n" * 200]
+            self._dump(f"day{day}", rows, created_at=now - timedelta(days=day))
+
+        result = self.store.prune(RetentionPolicy(daily=7, weekly=4, monthly=3, keep_last=1))
+        kept = {m.name for m in self.store.list_backups()}
+
+        self.assertTrue({f"day{d}" for d in range(7)} <= kept)
+        self.assertLess(len(kept), 15)
+        self.assertEqual(len(kept) + len(result.manifests_removed), 60)
+        self.assertGreater(result.bytes_reclaimed, 0)
+        for name in kept:
+            self.store.restore(name, self.root / "check.sql")
+
+    def test_average_chunk_size_is_independent_of_line_length(self):
+        """
+        Ensure chunks average close to avg_chunk for both short and long lines.
+        """
+        for width in (40, 2000):
+            rows = [f"{i:08d} {'x' * (width - 10)}\n" for i in range(4 * 1024 * 1024 // width)]
+            manifest = self._dump(f"width{width}", rows)
+            average = manifest.size / len(manifest.chunks)
+            self.assertGreater(average, 16384 * 0.6, width)
+            self.assertLess(average, 16384 * 1.5, width)
+
+    def test_long_lines_are_split_at_max_chunk(self):
+        """
+        Ensure lines longer than max_chunk are cut so no chunk exceeds it.
+        """
+        rows = [f"INSERT INTO records VALUES {', '.join(f'({i}, {j})' for j in range(20000))};\n" for i in range(5)]
+        manifest = self._dump("bulk", rows)
+        for digest in manifest.chunks:
+            self.assertLessEqual(len(self.store._read_chunk(digest, manifest.compressed)), 65536)
+        restored = self.store.restore("bulk", self.root / "restored.sql")
+        self.assertEqual(restored.read_text(), "".join(rows))
+
+    def test_prune_removes_stale_staged_dumps(self):
+        """
+        Ensure dumps left in staging past staging_max_age are deleted and fresh ones kept.
+        """
+        stale = self.store.staging_path("stale.sql")
+        fresh = self.store.staging_path("fresh.sql")
+        for path in (stale, fresh):
+            path.write_text("".join(self.rows[:100]))
+        old = (datetime.now() - timedelta(days=2)).timestamp()
+        os.utime(stale, (old, old))
+
+        result = self.store.prune()
+        self.assertEqual(result.staging_removed, 1)
+        self.assertFalse(stale.exists())
+        self.assertTrue(fresh.exists())
+
+    def test_concurrent_ingests_of_the_same_chunks(self):
+        """
+        Ensure two ingests writing the same new chunks at once both succeed and leave no temp files.
+        """
+        barrier = threading.Barrier(2, timeout=5)
+        split = self.store._split
+
+        def lockstep_split(path):
+            for chunk in split(path):
+                barrier.wait()
+                yield chunk
+
+        self.store._split = lockstep_split
+        errors = []
+
+        def dump(name):
+            try:
+                self._dump(name, self.rows)
+            except Exception as e:
+                errors.append(e)
+
+        threads = [threading.Thread(target=dump, args=(name,)) for name in ("left", "right")]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join(10)
+
+        self.assertEqual(errors, [])
+        manifests = {m.name: m for m in self.store.list_backups()}
+        self.assertEqual(manifests["left"].chunks, manifests["right"].chunks)
+        for manifest in manifests.values():
+            self.assertEqual(manifest.new_bytes + manifest.reused_bytes, manifest.size)
+        self.assertEqual(list(self.store.chunk_dir.rglob("*.tmp")), [])
+        restored = self.store.restore("right", self.root / "restored.sql")
+        self.assertEqual(restored.read_text(), "".join(self.rows))
+
+    def test_prune_waits_for_an_ingest_in_progress(self):
+        """
+        Ensure chunks written by an unfinished ingest are not collected by a concurrent prune.
+        """
+        now = datetime(2024, 3, 31, 12, 0)
+        self._dump("older", self.rows[:5000], created_at=now - timedelta(days=2))
+        self._dump("old", self.rows[5000:10000], created_at=now - timedelta(days=1))
+
+        paused, resume = threading.Event(), threading.Event()
+        split = self.store._split
+
+        def slow_split(path):
+            for i, chunk in enumerate(split(path)):
+                if i == 1:
+                    paused.set()
+                    resume.wait(5)
+                yield chunk
+
+        self.store._split = slow_split
+        ingest = threading.Thread(target=self._dump, args=("new", self.rows[10000:]))
+        prune = threading.Thread(
+            target=self.store.prune,
+            args=(RetentionPolicy(daily=0, weekly=0, monthly=0, keep_last=1),)
+        )
+        ingest.start()
+        self.assertTrue(paused.wait(5))
+        prune.start()
+        prune.join(0.3)
+        self.assertTrue(prune.is_alive())
+
+        resume.set()
+        ingest.join(5)
+        prune.join(5)
+        self.assertEqual([m.name for m in self.store.list_backups()], ["new"])
+        restored = self.store.restore("new", self.root / "restored.sql")
+        self.assertEqual(restored.read_text(), "".join(self.rows[10000:]))
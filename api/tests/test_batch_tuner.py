@@ -0,0 +1,145 @@
+import math
+import random
+import tempfile
+from pathlib import Path
+from unittest import TestCase
+from services.batch_optimizer import BatchOptimizer
+from services.batch_tuner import BatchTuner, log_spaced_buckets
+
+
+def simulated_run(batch_size, rng):
+    """Rows/sec peaks around 2000 rows per batch and falls off on either side"""
+    throughput = 5000 * math.exp(-(math.log(batch_size / 2000) ** 2)) * rng.uniform(0.95, 1.05)
+    return {'duration_seconds': 60.0, 'records_processed': int(throughput * 60)}
+
+
+class BatchTunerTests(TestCase):
+    def setUp(self):
+        tmp = tempfile.TemporaryDirectory()
+        self.addCleanup(tmp.cleanup)
+        self.state_file = Path(tmp.name) / "tuner.json"
+
+    def _drive(self, tuner, runs, table="archive_records", memory=lambda size: 40.0):
+        rng = random.Random(0)
+        for _ in range(runs):
+            size = tuner.suggest(table, memory_usage=40.0)
+            tuner.record(table, batch_size=size, memory_usage=memory(size), cpu_usage=30.0, success=True,
+                         **simulated_run(size, rng))
+
+    def test_buckets_are_log_spaced(self):
+        """
+        Ensure buckets cover the range with a roughly constant ratio.
+        """
+        buckets = log_spaced_buckets(100, 10000, 5)
+        self.assertEqual(buckets, [100, 320, 1000, 3200, 10000])
+
+    def test_converges_on_throughput_optimum(self):
+        """
+        Ensure the tuner settles on the bucket nearest the simulated optimum.
+        """
+        tuner = BatchTuner(state_file=None)
+        self._drive(tuner, 60)
+        self.assertEqual(tuner.best("archive_records"), tuner.bucket_for(2000))
+
+    def test_memory_violations_exclude_larger_buckets(self):
+        """
+        Ensure buckets that keep breaching the memory limit, and larger ones, are only rarely re-probed.
+        """
+        tuner = BatchTuner(state_file=None)
+        self._drive(tuner, 120, memory=lambda size: 95.0 if size >= 1500 else 40.0)
+
+        summary = tuner.summary("archive_records")
+        self.assertLess(tuner.best("archive_records"), 1500)
+        unsafe_pulls = sum(stats['pulls'] for size, stats in summary['buckets'].items() if size >= 1500)
+        self.assertLess(unsafe_pulls, 0.2 * sum(stats['pulls'] for stats in summary['buckets'].values()))
+
+    def test_recovers_from_stale_failures(self):
+        """
+        Ensure failures at one bucket expire instead of capping the batch size for good.
+        """
+        tuner = BatchTuner(state_file=None)
+        rng = random.Random(0)
+        for _ in range(3):
+            tuner.record("archive_records", batch_size=1200, duration_seconds=60.0, records_processed=0,
+                         memory_usage=40.0, cpu_usage=30.0, success=False)
+        self.assertLess(tuner.suggest("archive_records", memory_usage=40.0), 1200)
+
+        # Throughput keeps rising with batch size, so the largest bucket is the optimum
+        for _ in range(300):
+            size = tuner.suggest("archive_records", memory_usage=40.0)
+            tuner.record("archive_records", batch_size=size, duration_seconds=60.0,
+                         records_processed=int(size * 10 * rng.uniform(0.95, 1.05)),
+                         memory_usage=40.0, cpu_usage=30.0, success=True)
+        self.assertEqual(tuner.best("archive_records"), 10000)
+
+    def test_single_violation_does_not_exclude(self):
+        """
+        Ensure one bad run is not enough to exclude a bucket.
+        """
+        tuner = BatchTuner(state_file=None)
+        tuner.record("archive_records", batch_size=1200, duration_seconds=60.0, records_processed=0,
+                     memory_usage=40.0, cpu_usage=30.0, success=False)
+        self.assertTrue(tuner.summary("archive_records")['buckets'][tuner.bucket_for(1200)]['safe'])
+
+    def test_backs_off_under_pressure(self):
+        """
+        Ensure high memory usage picks a bucket below the best known size.
+        """
+        tuner = BatchTuner(state_file=None)
+        self._drive(tuner, 30)
+        best = tuner.best("archive_records")
+        self.assertLess(tuner.suggest("archive_records", memory_usage=90.0), best)
+
+    def test_state_survives_restart(self):
+        """
+        Ensure per-table models are reloaded from the state file.
+        """
+        tuner = BatchTuner(state_file=str(self.state_file))
+        self._drive(tuner, 30)
+        restored = BatchTuner(state_file=str(self.state_file))
+        self.assertEqual(restored.best("archive_records"), tuner.best("archive_records"))
+        self.assertEqual(restored.summary("archive_records"), tuner.summary("archive_records"))
+        self.assertIsNone(restored.best("other_table"))
+
+
+class BatchOptimizerTuningTests(TestCase):
+    def _metrics(self, batch_size, records_processed, memory_usage=40.0):
+        return {
+            'batch_size': batch_size,
+            'duration_seconds': 60.0,
+            'success': True,
+            'cpu_usage': 30.0,
+            'memory_usage': memory_usage,
+            'records_processed': records_processed,
+        }
+
+    def test_efficiency_scores_are_normalized(self):
+        """
+        Ensure large records/sec values no longer dominate the efficiency score.
+        """
+        optimizer = BatchOptimizer()
+        optimizer.record_batch_performance(self._metrics(1000, 600000, memory_usage=20.0))
+        optimizer.record_batch_performance(self._metrics(5000, 630000, memory_usage=75.0))
+
+        analysis = optimizer.analyze_batch_performance()
+        for efficiency in analysis['batch_efficiency'].values():
+            self.assertGreaterEqual(efficiency['efficiency_score'], 0.0)
+            self.assertLessEqual(efficiency['efficiency_score'], 1.0)
+        self.assertEqual(analysis['optimal_batch_size'], 1000)
+        self.assertNotIn('tuning', analysis)
+
+    def test_delegates_to_tuner(self):
+        """
+        Ensure a tuned optimizer feeds the tuner and follows its suggestions.
+        """
+        tuner = BatchTuner(state_file=None)
+        optimizer = BatchOptimizer(tuner=tuner)
+        for _ in range(2):
+            optimizer.record_batch_performance({**self._metrics(1000, 60000), 'peak_memory_usage': 95.0}, "logs")
+
+        self.assertEqual(tuner.summary("logs")['observations'], 2)
+        self.assertFalse(tuner.summary("logs")['buckets'][tuner.bucket_for(1000)]['safe'])
+        size = optimizer.get_optimal_batch_size(40.0, 10.0, table="logs")
+        self.assertLess(size, 1000)
+        self.assertEqual(optimizer.current_batch_size, size)
+        self.assertIn('tuning', optimizer.analyze_batch_performance("logs"))
@@ -0,0 +1,112 @@
+import json
+from unittest import mock
+from django.db import DatabaseError
+from django.urls import reverse
+from rest_framework import status
+from rest_framework.test import APITestCase
+from api.models import Project
+from api.views import ProjectViewSet
+
+
+def read_results(response):
+    lines = [json.loads(line) for line in b"".join(response.streaming_content).splitlines()]
+    return lines[:-1], lines[-1]["summary"]
+
+
+class ProjectBulkTests(APITestCase):
+    url = reverse("project-bulk")
+
+    def setUp(self):
+        self.chunk_size = ProjectViewSet.bulk_chunk_size
+        ProjectViewSet.bulk_chunk_size = 3
+
+    def tearDown(self):
+        ProjectViewSet.bulk_chunk_size = self.chunk_size
+
+    def test_bulk_create_from_ndjson(self):
+        """
+        Ensure NDJSON items are created in chunks with per-item results.
+        """
+        lines = [json.dumps({"name": f"Imported {i}"}) for i in range(7)]
+        lines.insert(3, json.dumps({"description": "missing name"}))
+        lines.append("{not json")
+        response = self.client.post(self.url, "\n".join(lines), content_type="application/x-ndjson")
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+
+        results, summary = read_results(response)
+        self.assertEqual(summary, {"created": 7, "error": 2})
+        self.assertEqual(results[3]["status"], "error")
+        self.assertEqual(Project.objects.count(), 7)
+        created = [r["id"] for r in results if r["status"] == "created"]
+        self.assertEqual(set(created), set(Project.objects.values_list("id", flat=True)))
+
+    def test_bulk_create_from_empty_ndjson(self):
+        """
+        Ensure an empty NDJSON body only returns an empty summary.
+        """
+        response = self.client.post(self.url, "", content_type="application/x-ndjson")
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(read_results(response), ([], {}))
+
+    def test_bulk_update_and_delete(self):
+        """
+        Ensure partial updates and deletes by id report missing ids and refresh the cache.
+        """
+        projects = Project.objects.bulk_create(Project(name=f"Project {i}") for i in range(5))
+        list_url = reverse("project-list")
+        self.client.get(list_url)
+
+        updates = [{"id": p.id, "description": "bulk edited"} for p in projects[:4]] + [{"id": 999999}]
+        results, summary = read_results(self.client.patch(self.url, updates, format="json"))
+        self.assertEqual(summary, {"updated": 4, "not_found": 1})
+        self.assertEqual(Project.objects.filter(description="bulk edited").count(), 4)
+
+        response = self.client.get(list_url)
+        self.assertEqual(sum(p["description"] == "bulk edited" for p in response.data["results"]), 4)
+
+        ids = [p.id for p in projects[:2]] + [999999]
+        results, summary = read_results(self.client.delete(self.url, {"ids": ids}, format="json"))
+        self.assertEqual(summary, {"deleted": 2, "not_found": 1})
+        self.assertEqual(len(self.client.get(list_url).data["results"]), 3)
+
+    def test_bulk_update_rejects_non_integer_ids(self):
+        """
+        Ensure string, list and dict ids are reported per item instead of aborting the stream.
+        """
+        project = Project.objects.create(name="Project")
+        updates = [{"id": "abc"}, {"id": [1]}, {"id": {"pk": 1}}, {"id": project.id, "description": "edited"}]
+        results, summary = read_results(self.client.patch(self.url, updates, format="json"))
+        self.assertEqual(summary, {"error": 3, "updated": 1})
+        self.assertEqual([r["status"] for r in results], ["error", "error", "error", "updated"])
+
+    def test_boolean_ids_are_rejected(self):
+        """
+        Ensure true/false are not taken as ids 1/0 for updates or deletes.
+        """
+        project = Project.objects.create(name="Project")
+        results, summary = read_results(self.client.patch(self.url, [{"id": True, "name": "x"}], format="json"))
+        self.assertEqual(summary, {"error": 1})
+        results, summary = read_results(self.client.delete(self.url, {"ids": [True]}, format="json"))
+        self.assertEqual(summary, {"error": 1})
+        project.refresh_from_db()
+        self.assertEqual(project.name, "Project")
+
+    def test_database_error_fails_only_its_chunk(self):
+        """
+        Ensure a failing chunk write is reported per item and later chunks still run.
+        """
+        bulk_create = Project.objects.bulk_create
+        calls = []
+
+        def flaky(objs, *args, **kwargs):
+            calls.append(len(objs))
+            if len(calls) == 1:
+                raise DatabaseError("connection lost")
+            return bulk_create(objs, *args, **kwargs)
+
+        items = [{"name": f"Project {i}"} for i in range(5)]
+        with mock.patch.object(Project.objects, "bulk_create", side_effect=flaky):
+            results, summary = read_results(self.client.post(self.url, items, format="json"))
+        self.assertEqual(summary, {"error": 3, "created": 2})
+        self.assertEqual([r["index"] for r in results if r["status"] == "error"], [0, 1, 2])
+        self.assertEqual(Project.objects.count(), 2)
@@ -0,0 +1,76 @@
+from django.core.cache import cache
+from django.urls import reverse
+from rest_framework import status
+from rest_framework.test import APITestCase
+from api.models import Project
+
+
+class ProjectCachingTests(APITestCase):
+    def setUp(self):
+        cache.clear()
+        self.project = Project.objects.create(name="Cached Project")
+
+    def test_detail_not_modified(self):
+        """
+        Ensure a matching If-None-Match gets a 304 and an edit changes the ETag.
+        """
+        url = reverse("project-detail", args=[self.project.id])
+        response = self.client.get(url)
+        etag = response["ETag"]
+        self.assertIn("Last-Modified", response)
+
+        with self.assertNumQueries(0):
+            response = self.client.get(url, HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(response.status_code, status.HTTP_304_NOT_MODIFIED)
+
+        self.client.patch(url, {"name": "Renamed"}, format="json")
+        response = self.client.get(url, HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(response.data["name"], "Renamed")
+        self.assertNotEqual(response["ETag"], etag)
+
+    def test_list_cached_until_invalidated(self):
+        """
+        Ensure list pages are served from cache and refreshed after a save or delete.
+        """
+        url = reverse("project-list")
+        first = self.client.get(url)
+        with self.assertNumQueries(0):
+            cached = self.client.get(url)
+        self.assertEqual(cached.data, first.data)
+        self.assertEqual(self.client.get(url, HTTP_IF_NONE_MATCH=first["ETag"]).status_code,
+                         status.HTTP_304_NOT_MODIFIED)
+
+        Project.objects.create(name="Another")
+        response = self.client.get(url, HTTP_IF_NONE_MATCH=first["ETag"])
+        self.assertEqual(len(response.data["results"]), 2)
+
+        self.project.delete()
+        response = self.client.get(url)
+        self.assertEqual([p["name"] for p in response.data["results"]], ["Another"])
+
+    def test_list_has_no_last_modified(self):
+        """
+        Ensure If-Modified-Since alone cannot serve a stale list after a delete.
+        """
+        Project.objects.create(name="Another")
+        url = reverse("project-list")
+        response = self.client.get(url)
+        self.assertNotIn("Last-Modified", response)
+
+        self.project.delete()
+        response = self.client.get(url, HTTP_IF_MODIFIED_SINCE="Fri, 01 Jan 2100 00:00:00 GMT")
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual([p["name"] for p in response.data["results"]], ["Another"])
+
+    def test_detail_lookup_is_normalised(self):
+        """
+        Ensure a non-integer id is a 404 and a zero-padded id shares the invalidated cache entry.
+        """
+        self.assertEqual(self.client.get("/api/projects/abc/").status_code, status.HTTP_404_NOT_FOUND)
+
+        padded = f"/api/projects/0{self.project.id}/"
+        self.assertEqual(self.client.get(padded).data["name"], "Cached Project")
+        self.project.name = "Renamed"
+        self.project.save()
+        self.assertEqual(self.client.get(padded).data["name"], "Renamed")
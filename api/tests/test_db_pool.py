@@ -0,0 +1,72 @@
+import tempfile
+import threading
+from unittest import TestCase
+from sqlalchemy import text
+from sqlalchemy.exc import TimeoutError as PoolTimeoutError
+from services import db_pool
+from services.db_pool import dispose_engine, get_engine, pool_metrics
+
+
+class PooledEngineTests(TestCase):
+    def setUp(self):
+        tmp = tempfile.TemporaryDirectory()
+        self.addCleanup(tmp.cleanup)
+        self.url = f"sqlite:///{tmp.name}/pool.db"
+        self.engine = get_engine("test", self.url, pool_size=1, max_overflow=0, pool_timeout=0.2)
+        self.addCleanup(dispose_engine, self.url)
+
+    def test_engines_are_shared_per_url(self):
+        """
+        Ensure components asking for the same database share one pool.
+        """
+        self.assertIs(get_engine("other", self.url), self.engine)
+        with self.assertLogs("services.db_pool", "WARNING") as logs:
+            self.assertIs(get_engine("other", self.url, pool_size=10), self.engine)
+        self.assertIn("pool_size", logs.output[0])
+        self.assertIsNot(get_engine("a", "sqlite://"), get_engine("b", "sqlite://"))
+
+    def test_pool_reports_usage_and_waits(self):
+        """
+        Ensure checkouts, reuse and pool timeouts show up in the metrics.
+        """
+        for _ in range(3):
+            with self.engine.connect() as connection:
+                connection.execute(text("select 1"))
+
+        held = self.engine.connect()
+        released = threading.Timer(0.05, held.close)
+        released.start()
+        with self.engine.connect():
+            pass
+        with self.engine.connect():
+            with self.assertRaises(PoolTimeoutError):
+                self.engine.connect()
+
+        stats = pool_metrics()[repr(self.engine.url)]
+        self.assertEqual(stats["connects"], 1)
+        self.assertEqual(stats["checkouts"], 6)
+        self.assertEqual(stats["timeouts"], 1)
+        self.assertGreaterEqual(stats["max_wait_ms"], 150)
+        self.assertEqual(stats["size"], 1)
+
+    def test_forked_child_does_not_reuse_parent_connections(self):
+        """
+        Ensure the after-fork hook drops inherited connections and the pool reconnects.
+        """
+        with self.engine.connect() as connection:
+            connection.execute(text("select 1"))
+        self.assertEqual(self.engine.pool.checkedin(), 1)
+
+        db_pool._after_fork_in_child()
+        self.assertEqual(self.engine.pool.checkedin(), 0)
+        with self.engine.connect() as connection:
+            self.assertEqual(connection.execute(text("select 1")).scalar(), 1)
+        self.assertIs(get_engine("test", self.url), self.engine)
+
+    def test_cleanup_forgets_the_engine(self):
+        """
+        Ensure a disposed engine is removed from the process-wide registry.
+        """
+        dispose_engine(self.url)
+        self.assertNotIn(self.url, db_pool._engines)
+        self.assertNotIn(repr(self.engine.url), pool_metrics())
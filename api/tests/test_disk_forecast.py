@@ -0,0 +1,72 @@
+from datetime import datetime, timedelta
+from unittest import TestCase
+from services.disk_forecast import DiskUsageForecaster, fit_growth_rate, preemptive_cleanup_due
+
+
+class DiskUsageForecasterTests(TestCase):
+    def setUp(self):
+        self.start = datetime(2026, 1, 1, 12, 0)
+        self.forecaster = DiskUsageForecaster(window=timedelta(hours=24), min_samples=4)
+
+    def _samples(self, values, step=timedelta(hours=1)):
+        for i, value in enumerate(values):
+            self.forecaster.add_sample(value, at=self.start + i * step)
+
+    def test_fit_growth_rate(self):
+        """
+        Ensure the least-squares slope is exact for linear points and zero when undetermined.
+        """
+        self.assertAlmostEqual(fit_growth_rate([(0, 50), (1, 52), (2, 54), (3, 56)]), 2.0)
+        self.assertEqual(fit_growth_rate([(0, 50)]), 0.0)
+        self.assertEqual(fit_growth_rate([(1, 50), (1, 60)]), 0.0)
+
+    def test_time_to_threshold(self):
+        """
+        Ensure usage growing 2 points an hour reaches the threshold on schedule.
+        """
+        self._samples([60, 62, 64, 66])
+        self.assertAlmostEqual(self.forecaster.growth_rate(), 2.0)
+        self.assertEqual(self.forecaster.time_to_threshold(85), timedelta(hours=9.5))
+        self.assertEqual(self.forecaster.time_to_threshold(60), timedelta(0))
+
+    def test_too_few_samples(self):
+        """
+        Ensure no projection is made before min_samples are collected.
+        """
+        self._samples([60, 70, 80])
+        self.assertEqual(self.forecaster.growth_rate(), 0.0)
+        self.assertIsNone(self.forecaster.time_to_threshold(85))
+
+    def test_shrinking_usage_and_window(self):
+        """
+        Ensure flat or falling usage gives no projection and old samples age out.
+        """
+        self._samples([70, 68, 66, 64])
+        self.assertIsNone(self.forecaster.time_to_threshold(85))
+
+        self.forecaster.add_sample(64, at=self.start + timedelta(hours=30))
+        self.assertEqual(len(self.forecaster.samples), 1)
+
+
+class PreemptiveCleanupTests(TestCase):
+    def setUp(self):
+        self.now = datetime(2026, 1, 1, 12, 0)
+        self.horizon = timedelta(hours=6)
+        self.cooldown = timedelta(hours=3)
+
+    def test_due_within_horizon(self):
+        """
+        Ensure a cleanup is scheduled only when the threshold is inside the horizon.
+        """
+        self.assertTrue(preemptive_cleanup_due(timedelta(hours=2), self.horizon, None, self.cooldown, self.now))
+        self.assertFalse(preemptive_cleanup_due(timedelta(hours=8), self.horizon, None, self.cooldown, self.now))
+        self.assertFalse(preemptive_cleanup_due(None, self.horizon, None, self.cooldown, self.now))
+
+    def test_cooldown(self):
+        """
+        Ensure a recent pre-emptive cleanup suppresses another until the cooldown passes.
+        """
+        recent = self.now - timedelta(hours=1)
+        earlier = self.now - timedelta(hours=3)
+        self.assertFalse(preemptive_cleanup_due(timedelta(hours=2), self.horizon, recent, self.cooldown, self.now))
+        self.assertTrue(preemptive_cleanup_due(timedelta(hours=2), self.horizon, earlier, self.cooldown, self.now))
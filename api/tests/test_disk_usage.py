@@ -0,0 +1,101 @@
+import os
+import tempfile
+import time
+from pathlib import Path
+from unittest import TestCase, mock
+from services.disk_usage import compress_files, remove_files, scan_directory
+
+
+class DiskUsageTests(TestCase):
+    def setUp(self):
+        self.tmp = tempfile.TemporaryDirectory()
+        self.root = Path(self.tmp.name)
+        self.logs = self.root / "logs"
+        self.temp = self.root / "temp"
+        (self.logs / "archive").mkdir(parents=True)
+        self.temp.mkdir()
+        self.old = time.time() - 10 * 86400
+
+    def tearDown(self):
+        self.tmp.cleanup()
+
+    def _file(self, path, size, mtime=None):
+        path.write_bytes(b"x" * size)
+        if mtime:
+            os.utime(path, (mtime, mtime))
+        return path
+
+    def test_scan_measures_each_path(self):
+        """
+        Ensure each managed path is measured on its own, including nested files.
+        """
+        self._file(self.logs / "app.log", 100)
+        self._file(self.logs / "archive" / "app.log.1", 250)
+        self._file(self.temp / "upload.tmp", 40)
+        progress = []
+
+        logs = scan_directory(self.logs, batch_size=1, progress=lambda n, b: progress.append((n, b)))
+        temp = scan_directory(self.temp)
+
+        self.assertEqual((logs.total_bytes, logs.file_count), (350, 2))
+        self.assertEqual((temp.total_bytes, temp.file_count), (40, 1))
+        self.assertEqual(progress[-1], (2, 350))
+        self.assertEqual(scan_directory(self.root / "missing").file_count, 0)
+
+    def test_remove_files_filters_by_age(self):
+        """
+        Ensure only files older than the cutoff are removed and accounted for.
+        """
+        self._file(self.logs / "old.log", 300, self.old)
+        self._file(self.logs / "new.log", 500)
+        self._file(self.logs / "archive" / "old.log", 700, self.old)
+        cutoff = time.time() - 86400
+
+        result = remove_files(self.logs, lambda entry, stat: stat.st_mtime < cutoff)
+
+        self.assertEqual(result.files_removed, 1)
+        self.assertEqual(result.bytes_reclaimed, 300)
+        self.assertEqual(result.removed, ["old.log"])
+        self.assertTrue((self.logs / "new.log").exists())
+        self.assertTrue((self.logs / "archive" / "old.log").exists())
+
+        nested = remove_files(self.logs, lambda entry, stat: stat.st_mtime < cutoff, recursive=True)
+        self.assertEqual((nested.files_removed, nested.bytes_reclaimed), (1, 700))
+        self.assertEqual(scan_directory(self.logs).total_bytes, 500)
+
+    def test_remove_files_accounting(self):
+        """
+        Ensure failed removals are counted as errors and not as reclaimed space.
+        """
+        for i in range(5):
+            self._file(self.temp / f"{i}.tmp", 10 * (i + 1))
+        real_unlink = os.unlink
+
+        def unlink(path):
+            if path.endswith("2.tmp"):
+                raise PermissionError("read-only")
+            real_unlink(path)
+
+        with mock.patch("services.disk_usage.os.unlink", side_effect=unlink):
+            result = remove_files(self.temp, lambda entry, stat: True, max_names=2)
+
+        self.assertEqual(result.files_removed, 4)
+        self.assertEqual(result.bytes_reclaimed, 10 + 20 + 40 + 50)
+        self.assertEqual(result.errors, 1)
+        self.assertEqual(len(result.removed), 2)
+        self.assertEqual(scan_directory(self.temp).total_bytes, 30)
+
+    def test_compress_reports_bytes_saved(self):
+        """
+        Ensure compression reclaims the size difference and keeps modification times.
+        """
+        self._file(self.logs / "old.log", 64 * 1024, self.old)
+        self._file(self.logs / "done.log.gz", 10, self.old)
+
+        result = compress_files(self.logs, lambda entry, stat: True)
+
+        compressed = self.logs / "old.log.gz"
+        self.assertEqual(result.removed, ["old.log"])
+        self.assertEqual(result.bytes_reclaimed, 64 * 1024 - compressed.stat().st_size)
+        self.assertAlmostEqual(compressed.stat().st_mtime, self.old, places=2)
+        self.assertFalse((self.logs / "old.log").exists())
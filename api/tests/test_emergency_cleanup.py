@@ -0,0 +1,86 @@
+from unittest import IsolatedAsyncioTestCase
+from services.emergency_cleanup import escalate
+
+
+class _Disk:
+    """Fake filesystem where each stage frees a fixed number of bytes"""
+
+    def __init__(self, needed):
+        self.needed = needed
+        self.calls = []
+
+    def bytes_to_free(self):
+        return max(0, self.needed)
+
+    def usage(self):
+        return 80.0 + self.needed / 1000
+
+    def stage(self, name, reclaimed, error=None):
+        async def action():
+            self.calls.append(name)
+            if error:
+                raise error
+            self.needed -= reclaimed
+            return reclaimed
+        return name, action
+
+
+class EscalationTests(IsolatedAsyncioTestCase):
+    async def asyncSetUp(self):
+        self.reports = []
+
+    async def _send(self, report):
+        self.reports.append(report)
+
+    async def test_stops_once_budget_is_met(self):
+        """
+        Ensure later stages are skipped as soon as the byte budget is met.
+        """
+        disk = _Disk(needed=1500)
+        stages = [disk.stage("temp_files", 1000), disk.stage("compress_logs", 1000),
+                  disk.stage("database_archival", 1000)]
+
+        report = await escalate(stages, disk.bytes_to_free, disk.usage, self._send)
+
+        self.assertEqual(disk.calls, ["temp_files", "compress_logs"])
+        self.assertTrue(report["budget_met"])
+        self.assertEqual(report["bytes_to_free"], 1500)
+        self.assertEqual(report["bytes_reclaimed"], 2000)
+
+    async def test_failing_stage_is_skipped(self):
+        """
+        Ensure an exception in one stage is recorded and escalation continues.
+        """
+        disk = _Disk(needed=500)
+        stages = [disk.stage("temp_files", 0, error=OSError("permission denied")),
+                  disk.stage("compress_logs", 600)]
+
+        report = await escalate(stages, disk.bytes_to_free, disk.usage, self._send)
+
+        self.assertEqual(disk.calls, ["temp_files", "compress_logs"])
+        self.assertIn("permission denied", report["actions_taken"]["temp_files"])
+        self.assertTrue(report["actions_taken"]["compress_logs"].startswith("600 bytes"))
+        self.assertTrue(report["budget_met"])
+
+    async def test_final_report_is_sent(self):
+        """
+        Ensure the admin report goes out even when every stage falls short.
+        """
+        disk = _Disk(needed=5000)
+        stages = [disk.stage("temp_files", 100), disk.stage("delete_old_logs", 0, error=RuntimeError("boom"))]
+
+        report = await escalate(stages, disk.bytes_to_free, disk.usage, self._send)
+
+        self.assertEqual(self.reports, [report])
+        self.assertFalse(report["budget_met"])
+        self.assertEqual(report["bytes_reclaimed"], 100)
+        self.assertEqual(report["type"], "Emergency Cleanup Report")
+
+    async def test_nothing_to_free(self):
+        """
+        Ensure no stage runs when usage is already under the target.
+        """
+        disk = _Disk(needed=0)
+        report = await escalate([disk.stage("temp_files", 100)], disk.bytes_to_free, disk.usage, self._send)
+        self.assertEqual(disk.calls, [])
+        self.assertEqual(report["actions_taken"], {})
@@ -0,0 +1,32 @@
+from datetime import datetime, timedelta
+from types import SimpleNamespace
+from unittest import TestCase
+from prometheus_client import REGISTRY
+from services.metrics import render_latest, scheduler_lag_listener
+
+
+def _sample(name, labels):
+    return REGISTRY.get_sample_value(name, labels) or 0.0
+
+
+class MetricsTests(TestCase):
+    def test_exposition_includes_collectors(self):
+        """
+        Ensure the scrape body is in the exposition format with the app's metrics.
+        """
+        body, content_type = render_latest()
+        self.assertIn(b"cleanup_phase_duration_seconds", body)
+        self.assertIn(b"auth_hash_queue_depth", body)
+        self.assertEqual(content_type.split(";")[0], "text/plain")
+
+    def test_scheduler_lag_is_observed(self):
+        """
+        Ensure submitted jobs record how late they started.
+        """
+        labels = {"job": "disk_space_monitor"}
+        before = _sample("scheduler_job_lag_seconds_sum", labels)
+        event = SimpleNamespace(
+            job_id="disk_space_monitor", scheduled_run_times=[datetime.now() - timedelta(seconds=2)]
+        )
+        scheduler_lag_listener(event)
+        self.assertGreaterEqual(_sample("scheduler_job_lag_seconds_sum", labels) - before, 2)
@@ -0,0 +1,53 @@
+from types import SimpleNamespace
+from django.http import HttpResponse
+from django.test import RequestFactory, SimpleTestCase
+from prometheus_client import REGISTRY
+from api.middleware import RequestMetricsMiddleware, SlowRequestMiddleware
+
+
+class SlowRequestMiddlewareTests(SimpleTestCase):
+    def test_only_slow_or_failing_requests_are_reported(self):
+        """
+        Ensure fast requests pass silently while 5xx responses are reported.
+        """
+        request = RequestFactory().get("/api/projects/")
+        middleware = SlowRequestMiddleware(lambda r: HttpResponse(status=200))
+        with self.assertNoLogs("services.tracing", level="WARNING"):
+            middleware(request)
+
+        middleware = SlowRequestMiddleware(lambda r: HttpResponse(status=503))
+        with self.assertLogs("services.tracing", level="WARNING") as logs:
+            middleware(request)
+        self.assertIn("Failed request: GET /api/projects/", logs.output[0])
+
+        middleware = SlowRequestMiddleware(lambda r: HttpResponse(status=200))
+        middleware.threshold_ms = 0
+        with self.assertLogs("services.tracing", level="WARNING") as logs:
+            middleware(request)
+        self.assertIn("Slow request: GET /api/projects/", logs.output[0])
+
+
+class RequestMetricsMiddlewareTests(SimpleTestCase):
+    def test_latency_is_labelled_by_url_pattern(self):
+        """
+        Ensure requests are counted under the URL pattern, not the concrete path.
+        """
+        labels = {"method": "GET", "route": "/api/projects/<int:pk>/", "status": "200"}
+        before = REGISTRY.get_sample_value("http_request_duration_seconds_count", labels) or 0.0
+
+        def view(request):
+            request.resolver_match = SimpleNamespace(route="api/projects/<int:pk>/")
+            return HttpResponse(status=200)
+
+        middleware = RequestMetricsMiddleware(view)
+        for pk in (1, 2, 3):
+            middleware(RequestFactory().get(f"/api/projects/{pk}/"))
+        self.assertEqual(REGISTRY.get_sample_value("http_request_duration_seconds_count", labels), before + 3)
+
+    def test_metrics_endpoint_is_routed(self):
+        """
+        Ensure /metrics serves the exposition format through the Django URLconf.
+        """
+        response = self.client.get("/metrics")
+        self.assertEqual(response.status_code, 200)
+        self.assertIn(b"cleanup_phase_duration_seconds", response.content)
@@ -0,0 +1,157 @@
+import asyncio
+import json
+import socket
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, HTTPServer
+from unittest import IsolatedAsyncioTestCase, TestCase, mock, skipUnless
+from models.settings import EmailConfig, NotificationSettings
+from services.notifications import EmailService
+
+try:
+    from aiosmtpd.controller import Controller
+except ImportError:
+    Controller = None
+
+
+def _free_port():
+    with socket.socket() as sock:
+        sock.bind(("127.0.0.1", 0))
+        return sock.getsockname()[1]
+
+
+class _RecordingHandler:
+    def __init__(self):
+        self.messages = []
+        self.sessions = set()
+
+    async def handle_DATA(self, server, session, envelope):
+        self.messages.append(envelope)
+        self.sessions.add(id(session))
+        return "250 OK"
+
+
+class _WebhookSink(BaseHTTPRequestHandler):
+    received = []
+
+    def do_POST(self):
+        length = int(self.headers["Content-Length"])
+        self.received.append(json.loads(self.rfile.read(length)))
+        self.send_response(200)
+        self.end_headers()
+
+    def log_message(self, *args):
+        pass
+
+
+class _DeliveryFixture:
+    def setUp(self):
+        self.handler = _RecordingHandler()
+        self.smtp = Controller(self.handler, hostname="127.0.0.1", port=_free_port())
+        self.smtp.start()
+        self.http = HTTPServer(("127.0.0.1", 0), _WebhookSink)
+        threading.Thread(target=self.http.serve_forever, daemon=True).start()
+        _WebhookSink.received = []
+
+        self.service = EmailService(
+            EmailConfig(
+                enabled=True,
+                smtp_host="127.0.0.1",
+                smtp_port=self.smtp.port,
+                username="",
+                password="",
+                from_address="scheduler@example.com",
+                admin_emails=["admin@example.com"],
+            ),
+            NotificationSettings(
+                slack_webhook=f"http://127.0.0.1:{self.http.server_port}/slack",
+                teams_webhook=None,
+            ),
+            pool_size=1,
+            digest_window=0.2,
+        )
+
+    def tearDown(self):
+        self.smtp.stop()
+        self.http.shutdown()
+
+
+@skipUnless(Controller, "aiosmtpd is not installed")
+class EmailServiceTests(_DeliveryFixture, IsolatedAsyncioTestCase):
+    async def asyncTearDown(self):
+        await self.service.close()
+
+    async def test_reports_share_a_pooled_connection(self):
+        """
+        Ensure queued messages are delivered over one persistent connection.
+        """
+        for i in range(5):
+            await self.service.send_admin_report({"job_type": "Cleanup Job", "status": "SUCCESS", "run": i})
+        await self.service.flush()
+        self.assertEqual(len(self.handler.messages), 5)
+        self.assertEqual(len(self.handler.sessions), 1)
+
+    async def test_repeated_alerts_are_digested(self):
+        """
+        Ensure repeated alerts within the window collapse into one digest.
+        """
+        for i in range(4):
+            await self.service.send_alert("Cleanup job failed", f"error {i}")
+        await self.service.flush()
+        self.assertEqual(len(self.handler.messages), 1)
+
+        await asyncio.sleep(0.3)
+        await self.service.flush()
+        self.assertEqual(len(self.handler.messages), 2)
+        self.assertIn(b"3 more", self.handler.messages[1].content)
+        self.assertEqual(len(_WebhookSink.received), 2)
+        self.assertEqual(self.service.stats["digested"], 3)
+
+    async def test_bad_message_fails_alone(self):
+        """
+        Ensure a message that cannot be built is counted as failed and the rest of the batch, webhooks included, still goes out.
+        """
+        build = self.service._build_message
+
+        def flaky(email):
+            if email.subject == "bad":
+                raise ValueError("invalid header")
+            return build(email)
+
+        with mock.patch.object(self.service, "_build_message", side_effect=flaky):
+            for subject in ("first", "bad", "last"):
+                await self.service.send_report(["ops@example.com"], subject, "body")
+            await self.service.send_alert("Disk almost full", "92%")
+            await self.service.flush()
+
+        self.assertEqual(len(self.handler.messages), 3)
+        self.assertEqual(self.service.stats["failed"], 1)
+        self.assertEqual(self.service.stats["sent"], 3)
+        self.assertEqual(len(_WebhookSink.received), 1)
+
+
+@skipUnless(Controller, "aiosmtpd is not installed")
+class CallerLoopTests(_DeliveryFixture, TestCase):
+    def tearDown(self):
+        asyncio.run(self.service.close())
+        super().tearDown()
+
+    def test_messages_survive_separate_event_loops(self):
+        """
+        Ensure messages sent from successive asyncio.run calls are all delivered.
+        """
+        for i in range(3):
+            asyncio.run(self.service.send_admin_report({"job_type": "Cleanup Job", "status": "SUCCESS", "run": i}))
+        asyncio.run(self.service.flush())
+        self.assertEqual(len(self.handler.messages), 3)
+
+    def test_digest_is_sent_after_caller_loop_exits(self):
+        """
+        Ensure a digest collected across event loops is still sent when its window closes.
+        """
+        asyncio.run(self.service.send_alert("Disk space low", "first"))
+        asyncio.run(self.service.send_alert("Disk space low", "second"))
+        time.sleep(0.3)
+        asyncio.run(self.service.flush())
+        self.assertEqual(len(self.handler.messages), 2)
+        self.assertIn(b"1 more", self.handler.messages[1].content)
@@ -0,0 +1,109 @@
+import json
+import pstats
+import tempfile
+import time
+from pathlib import Path
+from unittest import TestCase
+from services.profiling import ProfileStore, RunProfiler
+
+
+class ProfileStoreTests(TestCase):
+    def setUp(self):
+        tmp = tempfile.TemporaryDirectory()
+        self.addCleanup(tmp.cleanup)
+        self.store = ProfileStore(Path(tmp.name), keep=2)
+
+    def _profiled_run(self, run_id):
+        profiler = RunProfiler(run_id=run_id)
+        profiler.start()
+        with profiler.phase("backup"):
+            time.sleep(0.01)
+        with self.assertRaises(RuntimeError):
+            with profiler.phase("verify"):
+                raise RuntimeError("bad checksum")
+        profiler.stop()
+        return profiler
+
+    def test_saved_profile_has_timeline_and_stats(self):
+        """
+        Ensure a run's timeline and cProfile output are stored and listed.
+        """
+        self.store.save(self._profiled_run("20240101_020000_000001"))
+
+        timeline = json.loads(self.store.artifact_path("20240101_020000_000001", "timeline.json").read_text())
+        self.assertEqual([p["name"] for p in timeline["phases"]], ["backup", "verify"])
+        self.assertEqual(timeline["phases"][1]["status"], "error")
+        self.assertGreaterEqual(timeline["phases"][0]["duration_seconds"], 0.01)
+        self.assertGreaterEqual(timeline["total_seconds"], timeline["phases"][0]["duration_seconds"])
+        pstats.Stats(str(self.store.artifact_path("20240101_020000_000001", "profile.pstats")))
+        self.assertIn("cumulative", self.store.artifact_path("20240101_020000_000001", "profile.txt").read_text())
+        self.assertEqual([p["run_id"] for p in self.store.list_profiles()], ["20240101_020000_000001"])
+
+    def test_artifact_lookup_rejects_unknown_names(self):
+        """
+        Ensure downloads only resolve known artifacts of well-formed run ids.
+        """
+        self.store.save(self._profiled_run("20240101_020000_000001"))
+        self.assertIsNone(self.store.artifact_path("../20240101_020000_000001", "timeline.json"))
+        self.assertIsNone(self.store.artifact_path("20240101_020000_000001", "../../etc/passwd"))
+        self.assertIsNone(self.store.artifact_path("20240102_020000_000001", "timeline.json"))
+
+    def test_trigger_is_consumed_once_and_old_profiles_pruned(self):
+        """
+        Ensure a requested profile applies to one run and only the newest profiles are kept.
+        """
+        self.assertIsNone(self.store.start_profiler())
+        self.store.request_next_run("admin")
+        profiler = self.store.start_profiler()
+        self.assertIsNotNone(profiler)
+        profiler.stop()
+        self.assertIsNone(self.store.start_profiler())
+
+        for day in (1, 2, 3):
+            self.store.save(self._profiled_run(f"2024010{day}_020000_000001"))
+        self.assertEqual(
+            [p["run_id"] for p in self.store.list_profiles()],
+            ["20240103_020000_000001", "20240102_020000_000001"]
+        )
+
+    def test_request_survives_a_busy_profiler(self):
+        """
+        Ensure a requested profile is kept for the next run when another run holds the profiler.
+        """
+        busy = RunProfiler(run_id="20240101_020000_000001")
+        busy.start()
+        self.addCleanup(busy.stop)
+        self.store.request_next_run("admin")
+        self.assertIsNone(self.store.start_profiler())
+
+        busy.stop()
+        profiler = self.store.start_profiler()
+        self.assertIsNotNone(profiler)
+        profiler.stop()
+
+    def test_root_is_created_lazily(self):
+        """
+        Ensure creating a store does not create its directory until something is written.
+        """
+        root = self.store.root / "nested"
+        store = ProfileStore(root)
+        self.assertFalse(root.exists())
+        self.assertEqual(store.list_profiles(), [])
+        store.request_next_run("admin")
+        self.assertTrue(root.is_dir())
+
+    def test_only_one_profile_runs_at_a_time(self):
+        """
+        Ensure a second profiler cannot start while another run is being profiled.
+        """
+        first = RunProfiler(run_id="20240101_020000_000001")
+        first.start()
+        self.addCleanup(first.stop)
+        with self.assertRaises(RuntimeError):
+            RunProfiler(run_id="20240101_020000_000002").start()
+
+        first.stop()
+        second = RunProfiler(run_id="20240101_020000_000003")
+        second.start()
+        second.stop()
+        self.assertIsNotNone(second.timeline()["total_seconds"])
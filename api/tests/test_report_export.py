@@ -0,0 +1,115 @@
+import csv
+import io
+import os
+import tempfile
+from datetime import datetime, timedelta, timezone
+from pathlib import Path
+from unittest import IsolatedAsyncioTestCase, TestCase, mock
+from fastapi import HTTPException
+from fastapi.responses import StreamingResponse
+from openpyxl import load_workbook
+from sqlalchemy.orm import Session
+from models.reports import ExportFormat
+from services.report_export import ROWS_PER_CHUNK, export_runs, stream_csv
+from services.rollups import CleanupRun, RollupStore, RUN_EXPORT_COLUMNS
+
+# api.reports builds its services at import; keep their files out of the working directory
+os.environ.setdefault("ROLLUP_DATABASE_URL", "sqlite://")
+os.environ.setdefault("REPORT_ARTIFACT_DIR", str(Path(tempfile.gettempdir()) / "report-artifacts"))
+from api import reports
+
+START = datetime(2024, 1, 1)
+RUNS = 1200
+
+
+def seeded_store() -> RollupStore:
+    store = RollupStore("sqlite://")
+    with Session(store.engine) as session, session.begin():
+        session.add_all(
+            CleanupRun(finished_at=START + timedelta(minutes=10 * i), success=i % 10 != 0,
+                       records_processed=i, duration_seconds=1.5, space_reclaimed=0,
+                       error_message=None if i % 10 else "Disk quota exceeded")
+            for i in range(RUNS)
+        )
+    return store
+
+
+def utc(timestamp: datetime) -> datetime:
+    return timestamp.replace(tzinfo=timezone.utc)
+
+
+class ExportRunsTests(TestCase):
+    def setUp(self):
+        self.store = seeded_store()
+
+    def test_csv_filters_range(self):
+        """
+        Ensure CSV output has a header and exactly the runs in [start, end).
+        """
+        start, end = START + timedelta(hours=10), START + timedelta(days=5)
+        chunks = list(export_runs(self.store, utc(start), utc(end), ExportFormat.CSV))
+        rows = list(csv.reader(io.StringIO(b"".join(chunks).decode())))
+
+        self.assertEqual(rows[0], list(RUN_EXPORT_COLUMNS))
+        self.assertEqual(len(rows) - 1, (5 * 24 - 10) * 6)
+        self.assertEqual(rows[1][0], start.isoformat())
+        self.assertLess(datetime.fromisoformat(rows[-1][0]), end)
+        self.assertTrue(all(chunks))
+
+    def test_xlsx_output(self):
+        """
+        Ensure XLSX output is a workbook with a header row and one row per run.
+        """
+        end = START + timedelta(days=1)
+        content = b"".join(export_runs(self.store, utc(START), utc(end), ExportFormat.XLSX))
+        sheet = load_workbook(io.BytesIO(content), read_only=True)["Cleanup Runs"]
+        rows = list(sheet.iter_rows(values_only=True))
+
+        self.assertEqual(rows[0], RUN_EXPORT_COLUMNS)
+        self.assertEqual(len(rows) - 1, 24 * 6)
+        self.assertEqual(rows[1][0], START)
+        self.assertEqual(rows[1][-1], "Disk quota exceeded")
+
+    def test_csv_streams_rows_as_read(self):
+        """
+        Ensure the first chunk is produced before the rest of the rows are read.
+        """
+        consumed = []
+
+        def rows():
+            for i in range(ROWS_PER_CHUNK * 4):
+                consumed.append(i)
+                yield (START, True, i, 1.0, None, None, None, 0, None)
+
+        chunks = stream_csv(rows())
+        next(chunks)
+        self.assertEqual(len(consumed), ROWS_PER_CHUNK)
+        self.assertEqual(len(list(chunks)), 3)
+
+
+class ExportEndpointTests(IsolatedAsyncioTestCase):
+    def setUp(self):
+        patcher = mock.patch.object(reports.report_service, "rollups", seeded_store())
+        patcher.start()
+        self.addCleanup(patcher.stop)
+
+    async def test_streamed_ndjson_response(self):
+        """
+        Ensure the endpoint returns a streaming attachment of the requested format.
+        """
+        response = await reports.export_cleanup_runs(
+            utc(START), utc(START + timedelta(hours=1)), ExportFormat.NDJSON, current_user=None
+        )
+        self.assertIsInstance(response, StreamingResponse)
+        self.assertEqual(response.media_type, "application/x-ndjson")
+        self.assertIn("cleanup-runs.ndjson", response.headers["content-disposition"])
+        body = b"".join([chunk async for chunk in response.body_iterator])
+        self.assertEqual(len(body.splitlines()), 6)
+
+    async def test_reversed_range(self):
+        """
+        Ensure an end date before the start date is rejected.
+        """
+        with self.assertRaises(HTTPException) as raised:
+            await reports.export_cleanup_runs(utc(START), utc(START - timedelta(days=1)), current_user=None)
+        self.assertEqual(raised.exception.status_code, 400)
@@ -0,0 +1,207 @@
+import asyncio
+import json
+import os
+import tempfile
+from datetime import datetime, timedelta
+from pathlib import Path
+from unittest import IsolatedAsyncioTestCase, mock
+from fastapi import HTTPException
+from models.reports import ReportFormat, ReportType
+from services.report_jobs import ReportJobManager
+
+# api.reports builds its services at import; keep their files out of the working directory
+os.environ.setdefault("ROLLUP_DATABASE_URL", "sqlite://")
+os.environ.setdefault("REPORT_ARTIFACT_DIR", str(Path(tempfile.gettempdir()) / "report-artifacts"))
+from api import reports
+
+
+class FakeReportService:
+    def __init__(self):
+        self.builds = 0
+        self.gate = asyncio.Event()
+        self.gate.set()
+
+    async def build_report(self, report_type, start_date, end_date):
+        self.builds += 1
+        await self.gate.wait()
+        return {"summary": {"total_jobs": 3}, "trends": {"daily": [{"jobs_run": 3}]}}
+
+
+class ReportJobManagerTests(IsolatedAsyncioTestCase):
+    async def asyncSetUp(self):
+        tmp = tempfile.TemporaryDirectory()
+        self.addCleanup(tmp.cleanup)
+        self.service = FakeReportService()
+        self.manager = ReportJobManager(self.service, artifact_dir=Path(tmp.name), max_workers=1)
+        self.addCleanup(self.manager.shutdown)
+        self.end = datetime.now().replace(microsecond=0) - timedelta(days=1)
+        self.start = self.end - timedelta(days=7)
+
+    async def _completed(self, start, end, report_format=ReportFormat.EXCEL):
+        job = await self.manager.submit(ReportType.PERFORMANCE, start, end, report_format)
+        job = await self.manager.wait(job.id, 30)
+        self.assertEqual(job.status, "completed", job.error)
+        return job
+
+    async def test_identical_submissions_reuse_artifact(self):
+        """
+        Ensure the same (type, range, format) is rendered once and other formats separately.
+        """
+        first = await self._completed(self.start, self.end)
+        second = await self.manager.submit(ReportType.PERFORMANCE, self.start, self.end, ReportFormat.EXCEL)
+
+        self.assertNotEqual(first.id, second.id)
+        self.assertEqual(second.status, "completed")
+        self.assertEqual(second.artifact_path, first.artifact_path)
+        self.assertEqual(self.service.builds, 1)
+        self.assertTrue(first.artifact_path.read_bytes().startswith(b"PK"))
+
+        pdf = await self._completed(self.start, self.end, ReportFormat.PDF)
+        self.assertNotEqual(pdf.artifact_path, first.artifact_path)
+        self.assertEqual(self.service.builds, 2)
+
+    async def test_joins_inflight_job(self):
+        """
+        Ensure a submission matching a running job returns that job instead of starting another.
+        """
+        self.service.gate.clear()
+        first = await self.manager.submit(ReportType.PERFORMANCE, self.start, self.end, ReportFormat.EXCEL)
+        await asyncio.sleep(0)
+        second = await self.manager.submit(ReportType.PERFORMANCE, self.start, self.end, ReportFormat.EXCEL)
+        self.assertIs(second, first)
+
+        self.service.gate.set()
+        await self.manager.wait(first.id, 30)
+        self.assertEqual(first.status, "completed")
+        self.assertEqual(self.service.builds, 1)
+
+    async def test_open_range_artifact_expires(self):
+        """
+        Ensure artifacts of ranges still open when rendered expire after the TTL and closed ones do not.
+        """
+        open_end = datetime.now() + timedelta(days=1)
+        stale = (datetime.now() - timedelta(minutes=10)).timestamp()
+        for end in (self.end, open_end):
+            job = await self._completed(self.start, end)
+            os.utime(job.artifact_path, (stale, stale))
+
+        await self._completed(self.start, self.end)
+        self.assertEqual(self.service.builds, 2)
+        await self._completed(self.start, open_end)
+        self.assertEqual(self.service.builds, 3)
+
+    async def test_other_worker_sees_job(self):
+        """
+        Ensure a manager sharing the artifact directory finds, waits on and serves another manager's job.
+        """
+        other = ReportJobManager(FakeReportService(), artifact_dir=self.manager.artifact_dir, poll_interval=0.05)
+        self.service.gate.clear()
+        job = await self.manager.submit(ReportType.PERFORMANCE, self.start, self.end, ReportFormat.EXCEL)
+
+        seen = other.get(job.id)
+        self.assertEqual(seen.status, job.status)
+        self.assertIsNone(other.get("not-a-job-id"))
+
+        self.service.gate.set()
+        seen = await other.wait(job.id, 30)
+        self.assertEqual(seen.status, "completed")
+        self.assertEqual(seen.artifact_path, job.artifact_path)
+
+    async def test_prunes_old_and_excess_artifacts(self):
+        """
+        Ensure artifacts past retention are deleted and the oldest go once the size cap is exceeded.
+        """
+        directory = self.manager.artifact_dir
+        now = datetime.now().timestamp()
+        for name, age_days in (("expired.xlsx", 8), ("old.xlsx", 2), ("new.xlsx", 1)):
+            path = directory / name
+            path.write_bytes(b"x" * 100)
+            os.utime(path, (now - age_days * 86400, now - age_days * 86400))
+        self.manager.max_artifact_bytes = 150
+
+        self.manager._prune()
+        self.assertEqual(sorted(p.name for p in directory.iterdir()), ["new.xlsx"])
+
+
+class ReportJobEndpointTests(IsolatedAsyncioTestCase):
+    async def asyncSetUp(self):
+        tmp = tempfile.TemporaryDirectory()
+        self.addCleanup(tmp.cleanup)
+        self.service = FakeReportService()
+        self.manager = ReportJobManager(self.service, artifact_dir=Path(tmp.name), max_workers=1)
+        self.addCleanup(self.manager.shutdown)
+        patcher = mock.patch.object(reports, "report_jobs", self.manager)
+        patcher.start()
+        self.addCleanup(patcher.stop)
+        self.end = datetime(2024, 3, 8)
+        self.start = datetime(2024, 3, 1)
+
+    async def test_performance_artifact_returns_job(self):
+        """
+        Ensure Excel/PDF performance reports answer 202 with the job instead of blocking.
+        """
+        self.service.gate.clear()
+        response = await reports.get_performance_report(self.start, self.end, ReportFormat.PDF, current_user=None)
+        self.assertEqual(response.status_code, 202)
+        body = json.loads(response.body)
+        self.assertEqual(response.headers["location"], f"/reports/jobs/{body['job_id']}")
+        self.assertIsNone(body["download_url"])
+        self.service.gate.set()
+        await self.manager.wait(body["job_id"], 30)
+
+    async def test_wait_then_download(self):
+        """
+        Ensure ?wait long-polls until completion and the artifact is then downloadable.
+        """
+        self.service.gate.clear()
+        job = await self.manager.submit(ReportType.PERFORMANCE, self.start, self.end, ReportFormat.EXCEL)
+
+        status = await reports.get_report_job(job.id, wait=0, current_user=None)
+        self.assertIn(status.status, ("pending", "running"))
+        with self.assertRaises(HTTPException) as raised:
+            await reports.download_report_artifact(job.id, current_user=None)
+        self.assertEqual(raised.exception.status_code, 409)
+
+        self.service.gate.set()
+        status = await reports.get_report_job(job.id, wait=30, current_user=None)
+        self.assertEqual(status.status, "completed")
+        self.assertEqual(status.download_url, f"/reports/jobs/{job.id}/download")
+
+        response = await reports.download_report_artifact(job.id, current_user=None)
+        self.assertEqual(Path(response.path), job.artifact_path)
+        self.assertEqual(response.media_type, job.media_type)
+
+    async def test_expired_artifact_is_gone(self):
+        """
+        Ensure downloading a job whose artifact was pruned answers 410.
+        """
+        job = await self.manager.submit(ReportType.PERFORMANCE, self.start, self.end, ReportFormat.EXCEL)
+        await self.manager.wait(job.id, 30)
+        job.artifact_path.unlink()
+        with self.assertRaises(HTTPException) as raised:
+            await reports.download_report_artifact(job.id, current_user=None)
+        self.assertEqual(raised.exception.status_code, 410)
+
+    async def test_lifespan_starts_and_stops_services(self):
+        """
+        Ensure the lifespan handler runs the report scheduler and shuts the job manager down.
+        """
+        with mock.patch.object(reports, "report_scheduler") as scheduler, \
+                mock.patch.object(self.manager, "shutdown") as shutdown:
+            scheduler.stop = mock.AsyncMock()
+            async with reports.lifespan(None):
+                scheduler.start.assert_called_once()
+                shutdown.assert_not_called()
+            scheduler.stop.assert_awaited_once()
+            shutdown.assert_called_once()
+
+    async def test_unknown_job(self):
+        """
+        Ensure unknown job ids are 404 for both status and download.
+        """
+        with self.assertRaises(HTTPException) as raised:
+            await reports.get_report_job("missing", wait=0, current_user=None)
+        self.assertEqual(raised.exception.status_code, 404)
+        with self.assertRaises(HTTPException) as raised:
+            await reports.download_report_artifact("missing", current_user=None)
+        self.assertEqual(raised.exception.status_code, 404)
@@ -0,0 +1,97 @@
+from datetime import timedelta
+from types import SimpleNamespace
+from unittest import IsolatedAsyncioTestCase
+from models.reports import ReportFormat, ReportSchedule, ReportType, compile_crontab
+from services.report_scheduler import ScheduledReportExecutor
+
+
+class FakeReportService:
+    def __init__(self):
+        self.builds = []
+
+    async def build_report(self, report_type, start_date, end_date):
+        self.builds.append((report_type, start_date, end_date))
+        return {"total_jobs": len(self.builds)}
+
+
+class FakeEmailService:
+    def __init__(self):
+        self.messages = []
+
+    async def send_report(self, recipients, subject, body, attachment):
+        self.messages.append({"recipients": recipients, "subject": subject, "attachment": attachment})
+
+
+def schedule(cron, recipients, report_type=ReportType.CLEANUP, custom_params=None):
+    return ReportSchedule(report_type=report_type, schedule=cron, recipients=recipients,
+                          format=ReportFormat.JSON, custom_params=custom_params)
+
+
+class ScheduledReportExecutorTests(IsolatedAsyncioTestCase):
+    def setUp(self):
+        self.service = FakeReportService()
+        self.email = FakeEmailService()
+        self.executor = ScheduledReportExecutor(
+            SimpleNamespace(report_service=self.service), self.email, max_recipients_per_message=2
+        )
+
+    async def test_matching_schedules_render_once(self):
+        """
+        Ensure schedules due together with the same report settings share one render.
+        """
+        first = self.executor.add(schedule("0 6 * * *", ["a@example.com", "b@example.com"]))
+        self.executor.add(schedule("0 6 * * *", ["b@example.com", "c@example.com"]))
+        self.executor.add(schedule("0 6 * * *", ["d@example.com"], custom_params={"period": "30d"}))
+        fire_time = self.executor.schedules[first].next_run
+
+        rendered = await self.executor.run_due(fire_time)
+
+        self.assertEqual(rendered, 2)
+        self.assertEqual(len(self.service.builds), 2)
+        end = fire_time.astimezone().replace(tzinfo=None)
+        self.assertEqual({start for _, start, _ in self.service.builds},
+                         {end - timedelta(days=7), end - timedelta(days=30)})
+
+    async def test_recipients_are_deduplicated_and_batched(self):
+        """
+        Ensure merged recipients are unique, keep their order and are split into batches.
+        """
+        first = self.executor.add(schedule("0 6 * * *", ["a@example.com", "b@example.com"]))
+        self.executor.add(schedule("0 6 * * *", ["b@example.com", "c@example.com", "a@example.com"]))
+
+        await self.executor.run_due(self.executor.schedules[first].next_run)
+
+        self.assertEqual([m["recipients"] for m in self.email.messages],
+                         [["a@example.com", "b@example.com"], ["c@example.com"]])
+        self.assertEqual(len({m["attachment"] for m in self.email.messages}), 1)
+
+    async def test_missed_fire_times_are_coalesced(self):
+        """
+        Ensure a schedule that missed several fire times runs once and then moves past now.
+        """
+        schedule_id = self.executor.add(schedule("*/5 * * * *", ["a@example.com"]))
+        compiled = self.executor.schedules[schedule_id]
+        now = compiled.next_run + timedelta(hours=1, minutes=2)
+
+        self.assertEqual(await self.executor.run_due(now), 1)
+        self.assertEqual(len(self.service.builds), 1)
+        self.assertEqual(compiled.next_run, now.replace(minute=now.minute - now.minute % 5, second=0,
+                                                        microsecond=0) + timedelta(minutes=5))
+        self.assertEqual(await self.executor.run_due(now), 0)
+
+    async def test_removed_schedule_does_not_run(self):
+        """
+        Ensure removing a schedule drops its queued fire time.
+        """
+        schedule_id = self.executor.add(schedule("0 6 * * *", ["a@example.com"]))
+        fire_time = self.executor.schedules[schedule_id].next_run
+        self.assertTrue(self.executor.remove(schedule_id))
+        self.assertEqual(await self.executor.run_due(fire_time), 0)
+
+    def test_trigger_compiled_once(self):
+        """
+        Ensure the scheduler reuses the trigger compiled during validation.
+        """
+        cron = "15 4 * * 1"
+        schedule_id = self.executor.add(schedule(cron, ["a@example.com"]))
+        self.assertIs(self.executor.schedules[schedule_id].trigger, compile_crontab(cron))
@@ -0,0 +1,35 @@
+import gzip
+import json
+from datetime import datetime, timedelta
+from unittest import TestCase
+from api.responses import FastJSONResponse
+from models.logs import LogEntry
+
+
+class FastJSONResponseTests(TestCase):
+    def setUp(self):
+        now = datetime(2024, 1, 1)
+        self.entries = [
+            LogEntry(timestamp=now - timedelta(seconds=i), level="info", message=f"row {i}", module="scheduler")
+            for i in range(200)
+        ]
+
+    def test_large_body_is_gzipped_when_accepted(self):
+        """
+        Ensure large model lists are compressed and decode to the same JSON.
+        """
+        response = FastJSONResponse(self.entries, accept_encoding="gzip, deflate")
+        self.assertEqual(response.headers["content-encoding"], "gzip")
+        self.assertEqual(int(response.headers["content-length"]), len(response.body))
+        decoded = json.loads(gzip.decompress(response.body))
+        self.assertEqual(decoded, [json.loads(e.model_dump_json()) for e in self.entries])
+
+    def test_small_or_unaccepted_bodies_are_not_compressed(self):
+        """
+        Ensure compression only applies above the threshold and when the client accepts it.
+        """
+        small = FastJSONResponse(self.entries[:1], accept_encoding="gzip")
+        plain = FastJSONResponse(self.entries, accept_encoding="gzip;q=0")
+        self.assertNotIn("content-encoding", small.headers)
+        self.assertNotIn("content-encoding", plain.headers)
+        self.assertEqual(len(json.loads(plain.body)), 200)
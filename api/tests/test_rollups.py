@@ -0,0 +1,187 @@
+import asyncio
+import json
+import tempfile
+import threading
+from datetime import datetime, timedelta, timezone
+from pathlib import Path
+from unittest import TestCase
+from services.rollups import RollupStore
+from services.report_service import ReportService
+
+
+class RollupStoreTests(TestCase):
+    def setUp(self):
+        self.store = RollupStore("sqlite://")
+        self.now = datetime.now().replace(second=0, microsecond=0) - timedelta(minutes=1)
+        self.runs = []
+        for hours_ago in range(0, 24 * 10, 6):
+            timestamp = self.now - timedelta(hours=hours_ago)
+            run = {
+                "timestamp": timestamp,
+                "success": hours_ago % 24 != 6,
+                "records_archived": 100,
+                "duration_seconds": 20.0,
+                "cpu_usage": 10.0 + hours_ago % 7,
+                "memory_usage": 50.0,
+                "disk_usage": 60.0,
+                "error_message": None if hours_ago % 24 != 6 else "Backup verification failed",
+            }
+            self.runs.append(run)
+            self.store.record_run(run)
+
+    def test_incremental_rollups_match_backfill(self):
+        """
+        Ensure incrementally maintained rollups equal a full rebuild.
+        """
+        start, end = self.now - timedelta(days=7, hours=5), self.now + timedelta(hours=1)
+        before = self.store.query_daily(start, end, now=self.now)
+        self.store.backfill()
+        after = self.store.query_daily(start, end, now=self.now)
+        self.assertEqual(before, after)
+
+    def test_cleanup_stats_from_rollups(self):
+        """
+        Ensure cleanup stats include failure reason histograms.
+        """
+        stats = asyncio.run(ReportService(self.store).get_cleanup_stats("30d"))
+        failures = [r for r in self.runs if not r["success"]]
+        self.assertEqual(stats.total_jobs, len(self.runs))
+        self.assertEqual(stats.failure_reasons, {"Backup verification failed": len(failures)})
+        self.assertEqual(stats.total_records, 100 * (len(self.runs) - len(failures)))
+
+    def test_performance_report_daily_trends(self):
+        """
+        Ensure the report covers every day with runs in the range.
+        """
+        start = self.now - timedelta(days=3)
+        report = asyncio.run(ReportService(self.store).generate_performance_report(start, self.now + timedelta(minutes=1)))
+        expected = [r for r in self.runs if r["timestamp"] >= start]
+        self.assertEqual(sum(d.jobs_run for d in report.trends["daily"]), len(expected))
+        self.assertEqual(report.performance.peak_memory, 50.0)
+
+    def test_partial_edges_are_exact(self):
+        """
+        Ensure runs just outside a range that starts and ends mid-hour are not counted.
+        """
+        start, end = self.now - timedelta(days=4, minutes=30), self.now - timedelta(days=1, minutes=-30)
+        expected = [r for r in self.runs if start <= r["timestamp"] < end]
+        self.assertEqual(self.store.summarize(start, end).jobs_run, len(expected))
+        self.assertEqual(self.store.summarize(self.now - timedelta(minutes=5), self.now).jobs_run, 0)
+
+    def test_aware_and_naive_ranges_agree(self):
+        """
+        Ensure ranges parsed from ISO strings with a Z suffix work and match local naive ones.
+        """
+        start, end = self.now - timedelta(days=3), self.now + timedelta(minutes=1)
+        aware = [(d, a.jobs_run) for d, a in self.store.query_daily(start.astimezone(timezone.utc),
+                                                                     end.astimezone(timezone.utc))]
+        naive = [(d, a.jobs_run) for d, a in self.store.query_daily(start, end)]
+        self.assertEqual(aware, naive)
+
+    def test_space_reclaimed_per_run(self):
+        """
+        Ensure reclaimed bytes are summed into the rollups and the performance report.
+        """
+        self.store.record_run({"timestamp": self.now, "success": True, "space_reclaimed": 4096})
+        start = self.now - timedelta(hours=1)
+        self.assertEqual(self.store.summarize(start, self.now + timedelta(minutes=1)).space_reclaimed, 4096)
+        report = asyncio.run(ReportService(self.store).generate_performance_report(start, self.now + timedelta(minutes=1)))
+        self.assertEqual(report.storage.space_reclaimed, 4096.0)
+
+
+class RollupWriteTests(TestCase):
+    def setUp(self):
+        tmp = tempfile.TemporaryDirectory()
+        self.addCleanup(tmp.cleanup)
+        self.root = Path(tmp.name)
+        self.store = RollupStore(f"sqlite:///{self.root}/rollups.db")
+        self.addCleanup(self.store.engine.dispose)
+
+    def test_concurrent_runs_keep_every_increment(self):
+        """
+        Ensure runs recorded from several threads into the same buckets are all counted.
+        """
+        timestamp = datetime(2024, 5, 1, 10, 15)
+
+        def record(count):
+            for _ in range(count):
+                self.store.record_run({"timestamp": timestamp, "success": True, "records_archived": 1})
+
+        threads = [threading.Thread(target=record, args=(25,)) for _ in range(4)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+
+        total = self.store.summarize(timestamp, timestamp + timedelta(minutes=1))
+        self.assertEqual(total.jobs_run, 100)
+        self.assertEqual(total.records_processed, 100)
+        self.store.backfill()
+        self.assertEqual(self.store.summarize(datetime(2024, 5, 1), datetime(2024, 5, 2)).jobs_run, 100)
+
+    def test_reimporting_metrics_does_not_double_count(self):
+        """
+        Ensure importing the same metrics file twice only adds its runs once.
+        """
+        metrics_file = self.root / "metrics.json"
+        start = datetime(2024, 4, 1)
+        metrics = [
+            {"timestamp": (start + timedelta(hours=i)).isoformat(), "success": True,
+             "records_processed": 10, "duration_seconds": 5.0}
+            for i in range(48)
+        ]
+        metrics_file.write_text(json.dumps(metrics + metrics[:5]))
+
+        self.assertEqual(self.store.import_metrics_file(metrics_file), 48)
+        self.assertEqual(self.store.import_metrics_file(metrics_file), 0)
+        self.store.backfill()
+        self.assertEqual(self.store.summarize(start, start + timedelta(days=2)).records_processed, 480)
+
+
+class SchedulerReportTests(TestCase):
+    def setUp(self):
+        self.service = ReportService(RollupStore("sqlite://"))
+        self.start = datetime(2024, 3, 1)
+        # Three runs a day for ten days, every third one failing
+        for index in range(30):
+            self.service.rollups.record_run({
+                "timestamp": self.start + timedelta(days=index // 3, hours=2 + 6 * (index % 3)),
+                "success": index % 3 != 2,
+                "records_archived": 100,
+                "duration_seconds": 30.0,
+                "cpu_usage": float(index),
+                "memory_usage": 40.0,
+                "space_reclaimed": 1024,
+                "error_message": None if index % 3 != 2 else "Disk quota exceeded",
+            })
+
+    def test_full_report(self):
+        """
+        Ensure the report's totals and pagination describe the same runs.
+        """
+        report = asyncio.run(self.service.generate_scheduler_report(
+            self.start + timedelta(days=2), self.start + timedelta(days=7), lmt=10, offset=5
+        ))
+        self.assertEqual(report["cleanup_stats"]["total_jobs"], 15)
+        self.assertEqual(report["cleanup_stats"]["successful_jobs"], 10)
+        self.assertEqual(report["cleanup_stats"]["records_archived"], 1000)
+        self.assertEqual(report["pagination"], {"total": 15, "offset": 5, "limit": 10, "has_more": False})
+        self.assertEqual(len(report["job_history"]), 10)
+        self.assertEqual(report["job_history"][0]["timestamp"],
+                         (self.start + timedelta(days=3, hours=14)).astimezone(timezone.utc))
+        self.assertEqual(report["performance_metrics"]["peak_cpu_at_start"], 20.0)
+        # Keys from before the rollup rewrite stay for existing consumers
+        metrics = report["performance_metrics"]
+        self.assertEqual(metrics["avg_cpu_usage"], metrics["avg_cpu_at_start"])
+        self.assertEqual(metrics["peak_memory_usage"], metrics["peak_memory_at_start"])
+        self.assertEqual(report["performance_metrics"]["avg_job_duration"], 30.0)
+        self.assertEqual(report["disk_usage"], {"space_reclaimed": 15 * 1024})
+
+    def test_invalid_period(self):
+        """
+        Ensure reversed ranges and negative paging are rejected.
+        """
+        with self.assertRaises(ValueError):
+            asyncio.run(self.service.generate_scheduler_report(self.start, self.start - timedelta(days=1)))
+        with self.assertRaises(ValueError):
+            asyncio.run(self.service.generate_scheduler_report(self.start, self.start, lmt=-1))
@@ -0,0 +1,30 @@
+from unittest import TestCase
+from services.tracing import JOB_OP, SamplingConfig, TraceSampler, parse_endpoint_rates
+
+
+class TraceSamplerTests(TestCase):
+    def setUp(self):
+        self.sampler = TraceSampler(SamplingConfig(
+            base_rate=0.05,
+            job_rate=1.0,
+            endpoint_rates={'*/monitor/*': 0.01, '*/health*': 0.0},
+        ))
+
+    def test_rates_by_endpoint_job_and_parent(self):
+        """
+        Ensure upstream decisions win, jobs are always traced and endpoints use their overrides.
+        """
+        self.assertEqual(self.sampler({'parent_sampled': True, 'wsgi_environ': {'PATH_INFO': '/health'}}), 1.0)
+        self.assertEqual(self.sampler({'parent_sampled': False}), 0.0)
+        self.assertEqual(self.sampler({'transaction_context': {'op': JOB_OP}}), 1.0)
+        self.assertEqual(self.sampler({'wsgi_environ': {'PATH_INFO': '/api/monitor/stats'}}), 0.01)
+        self.assertEqual(self.sampler({'asgi_scope': {'path': '/health'}}), 0.0)
+        self.assertEqual(self.sampler({'wsgi_environ': {'PATH_INFO': '/api/projects/'}}), 0.05)
+
+    def test_parse_endpoint_rates(self):
+        """
+        Ensure env overrides are parsed, clamped and malformed entries skipped.
+        """
+        rates = parse_endpoint_rates("*/reports/*=0.2, */export*=5,broken,*/x=abc")
+        self.assertEqual(rates, {'*/reports/*': 0.2, '*/export*': 1.0})
+
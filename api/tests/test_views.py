@@ -1,4 +1,6 @@
+from datetime import timedelta
 from django.urls import reverse
+from django.utils import timezone
 from rest_framework import status
 from rest_framework.test import APITestCase
 from api.models import Project
@@ -29,7 +31,7 @@ class ProjectTests(APITestCase):
         url = reverse("project-list")
         response = self.client.get(url)
         self.assertEqual(response.status_code, status.HTTP_200_OK)
-        self.assertEqual(len(response.data), 1)
+        self.assertEqual(len(response.data["results"]), 1)
 
     def test_get_project_detail(self):
         """
@@ -58,3 +60,57 @@ class ProjectTests(APITestCase):
         response = self.client.delete(url)
         self.assertEqual(response.status_code, status.HTTP_204_NO_CONTENT)
         self.assertEqual(Project.objects.count(), 0)
+
+    def test_project_list_is_cursor_paginated(self):
+        """
+        Ensure the list is paged by cursor, newest first, without repeats.
+        """
+        Project.objects.bulk_create(Project(name=f"Project {i}") for i in range(4))
+        url = reverse("project-list")
+        response = self.client.get(url, {"page_size": 2})
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(len(response.data["results"]), 2)
+        self.assertIn("cursor=", response.data["next"])
+
+        seen = [p["id"] for p in response.data["results"]]
+        while response.data["next"]:
+            response = self.client.get(response.data["next"])
+            seen.extend(p["id"] for p in response.data["results"])
+        self.assertEqual(sorted(seen), sorted(Project.objects.values_list("id", flat=True)))
+
+    def test_filter_and_order_projects(self):
+        """
+        Ensure projects can be filtered by name prefix and creation time and ordered by name.
+        """
+        Project.objects.create(name="Alpha")
+        Project.objects.create(name="Alpine")
+        old = Project.objects.create(name="Beta")
+        Project.objects.filter(pk=old.pk).update(created_at=timezone.now() - timedelta(days=30))
+        url = reverse("project-list")
+
+        response = self.client.get(url, {"name__startswith": "Alp", "ordering": "name"})
+        self.assertEqual([p["name"] for p in response.data["results"]], ["Alpha", "Alpine"])
+
+        since = (timezone.now() - timedelta(days=1)).isoformat()
+        response = self.client.get(url, {"created_after": since})
+        self.assertNotIn("Beta", [p["name"] for p in response.data["results"]])
+
+        response = self.client.get(url, {"created_after": "not-a-date"})
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+
+    def test_sparse_fieldsets(self):
+        """
+        Ensure ?fields= limits both the loaded columns and the serialized fields.
+        """
+        url = reverse("project-list")
+        response = self.client.get(url, {"fields": "id,name"})
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(set(response.data["results"][0]), {"id", "name"})
+
+        # One validator query and one select, with no per-row loads of deferred columns
+        Project.objects.create(name="Second")
+        with self.assertNumQueries(2):
+            self.client.get(url, {"fields": "name"})
+
+        response = self.client.get(url, {"fields": "name,secret"})
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
@@ -1,8 +1,49 @@
 from rest_framework import viewsets
+from rest_framework.exceptions import ValidationError
+from rest_framework.filters import OrderingFilter
+from .bulk import BulkModelMixin
+from .caching import ConditionalCacheMixin
+from .filters import ProjectFilterBackend
 from .models import Project
+from .pagination import CreatedAtCursorPagination
 from .serializers import ProjectSerializer
 
 
-class ProjectViewSet(viewsets.ModelViewSet):
+class ProjectViewSet(BulkModelMixin, ConditionalCacheMixin, viewsets.ModelViewSet):
     queryset = Project.objects.all()
     serializer_class = ProjectSerializer
+    pagination_class = CreatedAtCursorPagination
+    filter_backends = [ProjectFilterBackend, OrderingFilter]
+    ordering_fields = ["name", "created_at", "updated_at"]
+    ordering = "-created_at"
+    sparse_fields_param = "fields"
+    cache_prefix = "projects"
+
+    def get_requested_fields(self):
+        """Fields named in ``?fields=``, or None when the full representation is wanted"""
+        if not hasattr(self, "_requested_fields"):
+            self._requested_fields = None
+            raw = self.request.query_params.get(self.sparse_fields_param) if self.request else None
+            if raw and self.request.method == "GET":
+                requested = [name.strip() for name in raw.split(",") if name.strip()]
+                unknown = set(requested) - set(ProjectSerializer.Meta.fields)
+                if unknown:
+                    raise ValidationError({self.sparse_fields_param: f"Unknown fields: {', '.join(sorted(unknown))}"})
+                self._requested_fields = requested
+        return self._requested_fields
+
+    def get_queryset(self):
+        queryset = super().get_queryset()
+        fields = self.get_requested_fields()
+        if fields:
+            # Load only the requested columns, plus the pk and whatever the cursor orders on
+            ordering = OrderingFilter().get_ordering(self.request, queryset, self) or [self.ordering]
+            columns = set(fields) | {"id"} | {field.lstrip("-") for field in ordering}
+            queryset = queryset.only(*columns)
+        return queryset
+
+    def get_serializer(self, *args, **kwargs):
+        fields = self.get_requested_fields()
+        if fields:
+            kwargs["fields"] = fields
+        return super().get_serializer(*args, **kwargs)
@@ -1,60 +1,73 @@
 from datetime import datetime, timedelta
 import jwt
-import bcrypt
+import asyncio
+import os
 import re
-from typing import Optional, Dict
-from dataclasses import dataclass
-from pydantic import BaseModel, EmailStr, validator
-from config.roles import Role, Permission, ROLE_PERMISSIONS
+import time
+import uuid
+from typing import Optional, Dict, Set
+from pydantic import EmailStr, field_validator
+from config.roles import Role, Permission, ROLE_PERMISSIONS, PERMISSION_BITS, ROLE_PERMISSION_MASKS
+from auth.token_cache import TokenCache, VerifiedToken
+from auth.password_hasher import PasswordHasher
+from auth.rate_limit import LoginRateLimiter
+from auth.user_repository import User, UserRepository
 from fastapi import HTTPException, Security
 from fastapi.security import OAuth2PasswordBearer
+from models.base import ApiModel
 
-class SignupRequest(BaseModel):
+USERNAME_PATTERN = re.compile(r'^[a-zA-Z0-9_]{3,}$')
+LETTER_PATTERN = re.compile(r'[A-Za-z]')
+DIGIT_PATTERN = re.compile(r'\d')
+SPECIAL_PATTERN = re.compile(r'[!@#$%^&*(),.?":{}|<>]')
+
+class SignupRequest(ApiModel):
     username: str
     password: str
     email: EmailStr
     role: Optional[Role] = None
 
-    @validator('username')
+    @field_validator('username')
+    @classmethod
     def username_valid(cls, v):
-        if not re.match(r'^[a-zA-Z0-9_]{3,}$', v):
+        if not USERNAME_PATTERN.match(v):
             raise ValueError('Username must be at least 3 characters and contain only letters, numbers, and underscores')
         return v
 
-    @validator('password')
+    @field_validator('password')
+    @classmethod
     def password_strong(cls, v):
         if len(v) < 8:
             raise ValueError('Password must be at least 8 characters')
-        if not re.search(r'[A-Za-z]', v):
+        if not LETTER_PATTERN.search(v):
             raise ValueError('Password must contain letters')
-        if not re.search(r'\d', v):
+        if not DIGIT_PATTERN.search(v):
             raise ValueError('Password must contain numbers')
-        if not re.search(r'[!@#$%^&*(),.?":{}|<>]', v):
+        if not SPECIAL_PATTERN.search(v):
             raise ValueError('Password must contain special characters')
         return v
 
-@dataclass
-class User:
-    id: int
-    username: str
-    email: str
-    role: str
-    password_hash: str
-    created_at: datetime
-
 class AuthService:
-    def __init__(self, secret_key: str, token_expiry: int = 24):
+    def __init__(self, secret_key: str, token_expiry: int = 24, token_cache_size: int = 10000,
+                 password_hasher: Optional[PasswordHasher] = None,
+                 login_limiter: Optional[LoginRateLimiter] = None,
+                 user_repository: Optional[UserRepository] = None,
+                 revocation_refresh: float = 5):
         self.secret_key = secret_key
         self.token_expiry = token_expiry
-        self._users = {}  # In-memory user store (replace with database)
+        self.users = user_repository or UserRepository()
+        self.password_hasher = password_hasher or PasswordHasher()
+        self.login_limiter = login_limiter or LoginRateLimiter()
+        self.token_cache = TokenCache(token_cache_size)
+        # Revocations live in the user database; each worker re-reads them every ``revocation_refresh`` seconds
+        self.revocation_refresh = revocation_refresh
+        self._revoked: Set[str] = set()
+        self._revoked_loaded_at: Optional[float] = None
 
     async def signup(self, request: SignupRequest, admin_user: Optional[User] = None) -> Dict:
         """Register a new user with role validation"""
-        if request.username in self._users:
-            raise ValueError('Username already exists')
-
         # Role validation
-        requested_role = request.role if hasattr(request, 'role') else Role.USER
+        requested_role = request.role or Role.USER
         
         # Only admins can create other admins
         if requested_role == Role.ADMIN and (not admin_user or admin_user.role != Role.ADMIN):
@@ -63,39 +76,34 @@ class AuthService:
         if requested_role not in Role:
             raise ValueError('Invalid role specified')
 
-        # Create user with role
-        user = User(
-            id=len(self._users) + 1,
-            username=request.username,
-            email=request.email,
-            role=requested_role,
-            password_hash=self._hash_password(request.password),
-            created_at=datetime.utcnow()
+        # Create user with role; the unique indexes reject duplicate usernames and emails
+        password_hash = await self.password_hasher.hash(request.password)
+        user = await asyncio.to_thread(
+            self.users.create, request.username, request.email, requested_role, password_hash
         )
-        
-        self._users[request.username] = user
         return self._create_user_response(user)
 
-    def create_user(self, username: str, password: str, role: str = 'user') -> User:
+    async def create_user(self, username: str, password: str, role: str = 'user', email: str = '') -> User:
         """Create a new user with hashed password"""
-        password_hash = bcrypt.hashpw(password.encode(), bcrypt.gensalt())
-        user = User(
-            id=len(self._users) + 1,
-            username=username,
-            role=role,
-            password_hash=password_hash
-        )
-        self._users[username] = user
-        return user
-
-    async def authenticate(self, username: str, password: str) -> Optional[Dict]:
-        """Authenticate user and return JWT token"""
-        user = self._users.get(username)
+        password_hash = await self.password_hasher.hash(password)
+        return await asyncio.to_thread(self.users.create, username, email, role, password_hash)
+
+    async def authenticate(self, username: str, password: str, client_ip: Optional[str] = None) -> Optional[Dict]:
+        """
+        Authenticate user and return JWT token.
+
+        Raises:
+            RateLimitExceeded: too many attempts for this username or client IP
+            HasherBusyError: the password hashing queue is full
+        """
+        self.login_limiter.check(username, client_ip)
+        user = await asyncio.to_thread(self.users.get_by_username, username)
         if not user:
             return None
 
-        if not bcrypt.checkpw(password.encode(), user.password_hash):
+        if not await self.password_hasher.verify(password, user.password_hash):
             return None
+        self.login_limiter.succeeded(username)
 
         token = self.create_token(user)
         return {
@@ -113,16 +121,60 @@ class AuthService:
             'user_id': user.id,
             'username': user.username,
             'role': user.role,
+            'jti': uuid.uuid4().hex,
             'exp': datetime.utcnow() + timedelta(hours=self.token_expiry)
         }
         return jwt.encode(payload, self.secret_key, algorithm='HS256')
 
     def verify_token(self, token: str) -> Optional[Dict]:
         """Verify JWT token and return payload"""
-        try:
-            return jwt.decode(token, self.secret_key, algorithms=['HS256'])
-        except jwt.InvalidTokenError:
+        verified = self._verify(token)
+        return dict(verified.claims) if verified else None
+
+    def token_has_permission(self, token: str, permission: Permission) -> bool:
+        """Check a permission straight from a (cached) token"""
+        verified = self._verify(token)
+        return bool(verified and verified.permission_mask & PERMISSION_BITS[permission])
+
+    def _verify(self, token: str) -> Optional[VerifiedToken]:
+        verified = self.token_cache.get(token)
+        if verified is None:
+            try:
+                claims = jwt.decode(token, self.secret_key, algorithms=['HS256'])
+            except jwt.InvalidTokenError:
+                return None
+            role = claims.get('role')
+            verified = VerifiedToken(
+                claims=claims,
+                permissions=frozenset(ROLE_PERMISSIONS.get(role, set())),
+                permission_mask=ROLE_PERMISSION_MASKS.get(role, 0),
+                expires_at=claims.get('exp', 0)
+            )
+            self.token_cache.put(token, verified)
+
+        self.sync_revocations()
+        if verified.claims.get('jti') in self._revoked:
             return None
+        return verified
+
+    def sync_revocations(self, force: bool = False) -> None:
+        """Reload revoked token ids from the user database once the local copy is stale"""
+        now = time.monotonic()
+        if not force and self._revoked_loaded_at is not None and now - self._revoked_loaded_at < self.revocation_refresh:
+            return
+        self._revoked = self.users.revoked_tokens()
+        self._revoked_loaded_at = now
+
+    def revoke_token(self, token: str) -> bool:
+        """Revoke a token by its jti for every worker; returns False if the token is not valid"""
+        verified = self._verify(token)
+        if not verified or 'jti' not in verified.claims:
+            return False
+        jti = verified.claims['jti']
+        self.users.revoke_token(jti, datetime.utcfromtimestamp(verified.expires_at))
+        self._revoked.add(jti)
+        self.token_cache.discard_jti(jti)
+        return True
 
     async def update_user_role(
         self, 
@@ -137,16 +189,14 @@ class AuthService:
         if new_role not in Role:
             raise ValueError('Invalid role specified')
 
-        user = self._find_user_by_id(user_id)
+        user = await asyncio.to_thread(self.users.update_role, user_id, new_role)
         if not user:
             raise ValueError('User not found')
-
-        user.role = new_role
         return self._create_user_response(user)
 
     def has_permission(self, user: User, permission: Permission) -> bool:
         """Check if user has specific permission"""
-        return permission in ROLE_PERMISSIONS.get(user.role, set())
+        return bool(ROLE_PERMISSION_MASKS.get(user.role, 0) & PERMISSION_BITS[permission])
 
     def _create_user_response(self, user: User) -> Dict:
         """Create standardized user response"""
@@ -161,18 +211,40 @@ class AuthService:
             }
         }
 
-    def _hash_password(self, password: str) -> str:
-        # Implement password hashing logic
-        pass
+    async def get_user(self, user_id: int) -> Optional[User]:
+        """Look up a user, serving repeat lookups from the repository cache"""
+        user = self.users.get_cached(user_id)
+        if user is None:
+            user = await asyncio.to_thread(self.users.get_by_id, user_id)
+        return user
+
 
-    def _find_user_by_id(self, user_id: int) -> Optional[User]:
-        # Implement logic to find a user by ID
-        return None
+oauth2_scheme = OAuth2PasswordBearer(tokenUrl="login")
+_auth_service: Optional[AuthService] = None
 
-    def _hash_password(self, password: str) -> str:
-        # Implement password hashing logic
-        pass
 
-    def _find_user_by_id(self, user_id: int) -> Optional[User]:
-        # Implement logic to find a user by ID
-        return None 
\ No newline at end of file
+def get_auth_service() -> AuthService:
+    """Process-wide AuthService configured from the environment"""
+    global _auth_service
+    if _auth_service is None:
+        _auth_service = AuthService(
+            secret_key=os.getenv("JWT_SECRET_KEY", "your-secret-key"),
+            token_expiry=int(os.getenv("JWT_EXPIRY_HOURS", "24"))
+        )
+    return _auth_service
+
+
+async def get_current_user(token: str = Security(oauth2_scheme)) -> User:
+    """FastAPI dependency resolving the bearer token to its user"""
+    service = get_auth_service()
+    # Refresh revocations off the event loop so verify_token only reads the local copy
+    await asyncio.to_thread(service.sync_revocations)
+    claims = service.verify_token(token)
+    if not claims:
+        raise HTTPException(status_code=401, detail="Invalid or expired token",
+                            headers={"WWW-Authenticate": "Bearer"})
+    user = await service.get_user(claims['user_id'])
+    if not user:
+        raise HTTPException(status_code=401, detail="User no longer exists",
+                            headers={"WWW-Authenticate": "Bearer"})
+    return user
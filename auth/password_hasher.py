@@ -0,0 +1,92 @@
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, Dict, Optional
+import asyncio
+import os
+import threading
+import time
+import bcrypt
+from services.metrics import HASH_QUEUE_DEPTH, HASH_REJECTED
+
+
+class HasherBusyError(RuntimeError):
+    """Raised when the hashing queue is full"""
+
+
+class PasswordHasher:
+    """
+    Runs bcrypt on a dedicated, size-limited thread pool.
+
+    bcrypt releases the GIL while hashing, so the work runs in parallel with
+    the event loop instead of stalling it. At most ``max_workers`` hashes run
+    at once and at most ``max_queue`` more may wait; further calls fail fast
+    with HasherBusyError rather than piling up.
+    """
+
+    def __init__(self, max_workers: Optional[int] = None, max_queue: int = 64, rounds: int = 12):
+        self.max_workers = max_workers or int(os.getenv("PASSWORD_HASH_WORKERS", min(4, os.cpu_count() or 1)))
+        self.max_queue = max_queue
+        self.rounds = rounds
+        self._executor = ThreadPoolExecutor(max_workers=self.max_workers, thread_name_prefix="bcrypt")
+        self._lock = threading.Lock()
+        self._pending = 0
+        self._active = 0
+        self._stats = {'completed': 0, 'rejected': 0, 'wait_seconds': 0.0, 'run_seconds': 0.0, 'peak_pending': 0}
+
+    async def hash(self, password: str) -> str:
+        hashed = await self._submit(bcrypt.hashpw, password.encode(), bcrypt.gensalt(self.rounds))
+        return hashed.decode()
+
+    async def verify(self, password: str, password_hash: str) -> bool:
+        if not password_hash:
+            return False
+        return await self._submit(bcrypt.checkpw, password.encode(), password_hash.encode())
+
+    async def _submit(self, func, *args) -> Any:
+        with self._lock:
+            if self._pending >= self.max_workers + self.max_queue:
+                self._stats['rejected'] += 1
+                HASH_REJECTED.inc()
+                raise HasherBusyError("Password hashing queue is full")
+            self._pending += 1
+            self._stats['peak_pending'] = max(self._stats['peak_pending'], self._pending)
+        HASH_QUEUE_DEPTH.inc()
+        submitted = time.perf_counter()
+        try:
+            return await asyncio.get_running_loop().run_in_executor(
+                self._executor, self._timed, func, submitted, *args
+            )
+        finally:
+            HASH_QUEUE_DEPTH.dec()
+            with self._lock:
+                self._pending -= 1
+
+    def _timed(self, func, submitted: float, *args) -> Any:
+        started = time.perf_counter()
+        with self._lock:
+            self._active += 1
+            self._stats['wait_seconds'] += started - submitted
+        try:
+            return func(*args)
+        finally:
+            with self._lock:
+                self._active -= 1
+                self._stats['completed'] += 1
+                self._stats['run_seconds'] += time.perf_counter() - started
+
+    def metrics(self) -> Dict[str, Any]:
+        with self._lock:
+            completed = self._stats['completed']
+            return {
+                'max_workers': self.max_workers,
+                'max_queue': self.max_queue,
+                'active': self._active,
+                'queued': max(0, self._pending - self._active),
+                'completed': completed,
+                'rejected': self._stats['rejected'],
+                'peak_pending': self._stats['peak_pending'],
+                'avg_wait_ms': self._stats['wait_seconds'] / completed * 1000 if completed else 0.0,
+                'avg_run_ms': self._stats['run_seconds'] / completed * 1000 if completed else 0.0
+            }
+
+    def shutdown(self) -> None:
+        self._executor.shutdown(wait=False, cancel_futures=True)
@@ -0,0 +1,76 @@
+from collections import deque
+from typing import Deque, Dict, Optional
+import threading
+import time
+
+
+class RateLimitExceeded(Exception):
+    def __init__(self, retry_after: float):
+        super().__init__(f"Too many login attempts, retry in {retry_after:.0f}s")
+        self.retry_after = retry_after
+
+
+class SlidingWindowLimiter:
+    """Allows at most ``limit`` hits per key within a rolling ``window`` of seconds"""
+
+    def __init__(self, limit: int, window: float, max_keys: int = 100000):
+        self.limit = limit
+        self.window = window
+        self.max_keys = max_keys
+        self._hits: Dict[str, Deque[float]] = {}
+        self._lock = threading.Lock()
+
+    def hit(self, key: str, now: Optional[float] = None) -> float:
+        """
+        Record an attempt.
+
+        Returns:
+            0 if allowed, otherwise the seconds until the oldest attempt leaves the window
+        """
+        now = now if now is not None else time.monotonic()
+        with self._lock:
+            hits = self._hits.get(key)
+            if hits is None:
+                if len(self._hits) >= self.max_keys:
+                    self._evict_idle(now)
+                hits = self._hits[key] = deque()
+            while hits and hits[0] <= now - self.window:
+                hits.popleft()
+            if len(hits) >= self.limit:
+                return hits[0] + self.window - now
+            hits.append(now)
+            return 0.0
+
+    def reset(self, key: str) -> None:
+        with self._lock:
+            self._hits.pop(key, None)
+
+    def _evict_idle(self, now: float) -> None:
+        for key in [k for k, hits in self._hits.items() if not hits or hits[-1] <= now - self.window]:
+            del self._hits[key]
+
+
+class LoginRateLimiter:
+    """
+    Per-username and per-client-IP limits on login attempts.
+
+    Every attempt counts, successful or not, since each one costs a bcrypt
+    verification; a successful login clears the username's window.
+    """
+
+    def __init__(self, per_user: int = 10, per_user_window: float = 300,
+                 per_ip: int = 30, per_ip_window: float = 60):
+        self.users = SlidingWindowLimiter(per_user, per_user_window)
+        self.ips = SlidingWindowLimiter(per_ip, per_ip_window)
+
+    def check(self, username: str, client_ip: Optional[str] = None) -> None:
+        if client_ip:
+            retry_after = self.ips.hit(client_ip)
+            if retry_after:
+                raise RateLimitExceeded(retry_after)
+        retry_after = self.users.hit(username.lower())
+        if retry_after:
+            raise RateLimitExceeded(retry_after)
+
+    def succeeded(self, username: str) -> None:
+        self.users.reset(username.lower())
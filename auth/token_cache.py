@@ -0,0 +1,65 @@
+from collections import OrderedDict
+from typing import Dict, FrozenSet, Optional
+from dataclasses import dataclass
+import threading
+import time
+from config.roles import Permission
+
+
+@dataclass(frozen=True)
+class VerifiedToken:
+    """Claims of a token that already passed signature verification"""
+    claims: Dict
+    permissions: FrozenSet[Permission]
+    permission_mask: int
+    expires_at: float
+
+
+class TokenCache:
+    """
+    Bounded LRU of verified tokens.
+
+    Entries expire at the token's ``exp`` claim, so a cached token is never
+    accepted after the time ``jwt.decode`` would have rejected it.
+    """
+
+    def __init__(self, max_entries: int = 10000):
+        self.max_entries = max_entries
+        self._entries: "OrderedDict[str, VerifiedToken]" = OrderedDict()
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+
+    def get(self, token: str) -> Optional[VerifiedToken]:
+        with self._lock:
+            entry = self._entries.get(token)
+            if entry is None:
+                self.misses += 1
+                return None
+            if entry.expires_at <= time.time():
+                del self._entries[token]
+                self.misses += 1
+                return None
+            self._entries.move_to_end(token)
+            self.hits += 1
+            return entry
+
+    def put(self, token: str, entry: VerifiedToken) -> None:
+        with self._lock:
+            self._entries[token] = entry
+            self._entries.move_to_end(token)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+
+    def discard_jti(self, jti: str) -> None:
+        """Drop every cached token carrying the given ``jti``"""
+        with self._lock:
+            for token in [t for t, e in self._entries.items() if e.claims.get('jti') == jti]:
+                del self._entries[token]
+
+    def clear(self) -> None:
+        with self._lock:
+            self._entries.clear()
+
+    def __len__(self) -> int:
+        return len(self._entries)
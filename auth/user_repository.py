@@ -0,0 +1,167 @@
+from collections import OrderedDict
+from datetime import datetime
+from typing import Optional, Set, Tuple
+from dataclasses import dataclass
+import logging
+import os
+import threading
+import time
+from sqlalchemy import delete, select, update, DateTime, Integer, String
+from sqlalchemy.exc import IntegrityError
+from sqlalchemy.orm import DeclarativeBase, Mapped, Session, mapped_column
+from config.roles import Role
+from services.db_pool import get_engine
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_DATABASE_URL = "sqlite:///users.db"
+
+
+class Base(DeclarativeBase):
+    pass
+
+
+class UserRecord(Base):
+    __tablename__ = "auth_users"
+
+    id: Mapped[int] = mapped_column(Integer, primary_key=True, autoincrement=True)
+    username: Mapped[str] = mapped_column(String(150), unique=True, index=True)
+    email: Mapped[Optional[str]] = mapped_column(String(254), unique=True, index=True, nullable=True)
+    role: Mapped[str] = mapped_column(String(20))
+    password_hash: Mapped[str] = mapped_column(String(128))
+    created_at: Mapped[datetime] = mapped_column(DateTime, default=datetime.utcnow)
+
+
+class RevokedTokenRecord(Base):
+    __tablename__ = "auth_revoked_tokens"
+
+    jti: Mapped[str] = mapped_column(String(32), primary_key=True)
+    expires_at: Mapped[datetime] = mapped_column(DateTime, index=True)
+
+
+@dataclass
+class User:
+    id: int
+    username: str
+    email: str
+    role: str
+    password_hash: str
+    created_at: datetime
+
+
+def _to_user(record: UserRecord) -> User:
+    return User(
+        id=record.id,
+        username=record.username,
+        email=record.email or '',
+        role=Role(record.role),
+        password_hash=record.password_hash,
+        created_at=record.created_at
+    )
+
+
+class UserRepository:
+    """
+    SQLAlchemy-backed user store shared by every API worker.
+
+    Lookups by id go through a small LRU with a TTL so token-authenticated
+    requests rarely touch the database. Changes made by this process
+    invalidate its own cache entry; other workers see them once their
+    entry's TTL runs out.
+    """
+
+    def __init__(self, database_url: Optional[str] = None, cache_ttl: float = 30, cache_size: int = 1024):
+        self.engine = get_engine("auth", database_url or os.getenv("AUTH_DATABASE_URL", DEFAULT_DATABASE_URL))
+        Base.metadata.create_all(self.engine)
+        self.cache_ttl = cache_ttl
+        self.cache_size = cache_size
+        self._cache: "OrderedDict[int, Tuple[float, User]]" = OrderedDict()
+        self._lock = threading.Lock()
+
+    def create(self, username: str, email: str, role: str, password_hash: str) -> User:
+        """
+        Insert a user; the database assigns the id.
+
+        Raises:
+            ValueError: if the username or email is already taken
+        """
+        record = UserRecord(
+            username=username,
+            email=email or None,
+            role=str(getattr(role, 'value', role)),
+            password_hash=password_hash,
+            created_at=datetime.utcnow()
+        )
+        try:
+            with Session(self.engine) as session, session.begin():
+                session.add(record)
+                session.flush()
+                user = _to_user(record)
+        except IntegrityError:
+            raise ValueError('Username or email already exists')
+        self._remember(user)
+        return user
+
+    def get_by_username(self, username: str) -> Optional[User]:
+        with Session(self.engine) as session:
+            record = session.scalars(select(UserRecord).where(UserRecord.username == username)).first()
+            return _to_user(record) if record else None
+
+    def get_cached(self, user_id: int) -> Optional[User]:
+        """Cache-only lookup; never touches the database"""
+        with self._lock:
+            entry = self._cache.get(user_id)
+            if entry is None:
+                return None
+            if entry[0] <= time.monotonic():
+                del self._cache[user_id]
+                return None
+            self._cache.move_to_end(user_id)
+            return entry[1]
+
+    def get_by_id(self, user_id: int) -> Optional[User]:
+        """Read-through lookup by primary key"""
+        user = self.get_cached(user_id)
+        if user is not None:
+            return user
+        with Session(self.engine) as session:
+            record = session.get(UserRecord, user_id)
+            if record is None:
+                return None
+            user = _to_user(record)
+        self._remember(user)
+        return user
+
+    def update_role(self, user_id: int, role: str) -> Optional[User]:
+        with Session(self.engine) as session, session.begin():
+            result = session.execute(
+                update(UserRecord).where(UserRecord.id == user_id).values(role=str(getattr(role, 'value', role)))
+            )
+        self.invalidate(user_id)
+        if result.rowcount == 0:
+            return None
+        return self.get_by_id(user_id)
+
+    def _remember(self, user: User) -> None:
+        with self._lock:
+            self._cache[user.id] = (time.monotonic() + self.cache_ttl, user)
+            self._cache.move_to_end(user.id)
+            while len(self._cache) > self.cache_size:
+                self._cache.popitem(last=False)
+
+    def revoke_token(self, jti: str, expires_at: datetime) -> None:
+        """Record a revoked token id until the token would expire anyway"""
+        with Session(self.engine) as session, session.begin():
+            session.execute(delete(RevokedTokenRecord).where(RevokedTokenRecord.expires_at <= datetime.utcnow()))
+            session.merge(RevokedTokenRecord(jti=jti, expires_at=expires_at))
+
+    def revoked_tokens(self) -> Set[str]:
+        """Ids of revoked tokens that have not expired yet"""
+        with Session(self.engine) as session:
+            return set(session.scalars(
+                select(RevokedTokenRecord.jti).where(RevokedTokenRecord.expires_at > datetime.utcnow())
+            ))
+
+    def invalidate(self, user_id: int) -> None:
+        with self._lock:
+            self._cache.pop(user_id, None)
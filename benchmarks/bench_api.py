@@ -0,0 +1,34 @@
+"""
+API response paths for log queries: filter validation and rendering of
+result pages through FastJSONResponse.
+"""
+from datetime import datetime, timedelta
+import pytest
+from api.responses import FastJSONResponse
+from models.logs import LogEntry, LogFilter, PaginatedLogs
+
+NOW = datetime(2024, 1, 1, 12, 0)
+
+
+def _page(size: int) -> PaginatedLogs:
+    logs = [
+        LogEntry(
+            timestamp=NOW - timedelta(seconds=i), level="error" if i % 25 == 0 else "info",
+            message=f"Processed batch {i} ({i * 37 % 10000} records)", module="scheduler",
+            function="cleanup_old_records", line_number=120, details={"batch": i}
+        )
+        for i in range(size)
+    ]
+    return PaginatedLogs(logs=logs, total=size * 50, page=1, total_pages=50, has_next=True, has_previous=False)
+
+
+def test_log_filter_validation(benchmark):
+    payload = {'level': 'error', 'start_date': NOW - timedelta(days=7), 'end_date': NOW, 'search': 'timeout'}
+    benchmark(LogFilter.model_validate, payload)
+
+
+@pytest.mark.parametrize("size", [100, 1000])
+@pytest.mark.parametrize("encoding", ["identity", "gzip"])
+def test_log_page_response(benchmark, size, encoding):
+    page = _page(size)
+    benchmark(FastJSONResponse, page, accept_encoding=encoding)
@@ -0,0 +1,87 @@
+"""
+Validation and serialization cost of the API schemas: model_validate (from
+a dict), model_validate_json (from bytes), model_dump and model_dump_json.
+"""
+from datetime import datetime, timedelta
+from typing import Any, Dict
+import pytest
+from auth.auth_service import SignupRequest
+from models.logs import LogFilter, PaginatedLogs
+from models.reports import PerformanceReport, ReportSchedule
+from models.settings import SchedulerSettings
+
+NOW = datetime(2024, 1, 1, 12, 0)
+
+
+def _log_entry(i: int) -> Dict[str, Any]:
+    return {
+        'timestamp': NOW - timedelta(minutes=i), 'level': 'info', 'message': f'Processed batch {i}',
+        'module': 'scheduler', 'function': 'cleanup_old_records', 'line_number': 120 + i,
+        'details': {'batch': i}, 'stack_trace': None
+    }
+
+
+def _daily(i: int) -> Dict[str, Any]:
+    return {
+        'date': NOW - timedelta(days=i), 'jobs_run': 2, 'success_rate': 100.0,
+        'records_processed': 1000 * i, 'average_duration': 12.5
+    }
+
+
+SAMPLES = {
+    'SignupRequest': (SignupRequest, {'username': 'alice_01', 'password': 'Sup3r$ecret', 'email': 'alice@example.com'}),
+    'LogFilter': (LogFilter, {'level': 'error', 'start_date': NOW - timedelta(days=1), 'end_date': NOW, 'search': 'timeout'}),
+    'PaginatedLogs': (PaginatedLogs, {
+        'logs': [_log_entry(i) for i in range(50)], 'total': 5000, 'page': 1,
+        'total_pages': 100, 'has_next': True, 'has_previous': False
+    }),
+    'ReportSchedule': (ReportSchedule, {
+        'report_type': 'performance', 'schedule': '0 6 * * 1',
+        'recipients': ['ops@example.com', 'admin@example.com'], 'format': 'pdf'
+    }),
+    'PerformanceReport': (PerformanceReport, {
+        'period': {'start': NOW - timedelta(days=30), 'end': NOW},
+        'summary': {'total_jobs': 60.0, 'success_rate': 98.3},
+        'performance': {
+            'average_cpu': 40.0, 'peak_cpu': 90.0, 'average_memory': 55.0,
+            'peak_memory': 80.0, 'average_duration': 12.0, 'peak_duration': 45.0
+        },
+        'storage': {'average_usage': 60.0, 'peak_usage': 75.0, 'space_reclaimed': 1e9, 'growth_rate': 0.3},
+        'trends': {'daily': [_daily(i) for i in range(30)]}
+    }),
+    'SchedulerSettings': (SchedulerSettings, {
+        'cleanup_schedule': '0 2 * * *', 'retention_days': 30, 'batch_size': 1000, 'disk_threshold': 85,
+        'email_config': {
+            'enabled': True, 'smtp_host': 'smtp.example.com', 'smtp_port': 587, 'username': 'u',
+            'password': 'p', 'from_address': 'scheduler@example.com', 'admin_emails': ['admin@example.com']
+        },
+        'backup_config': {'enabled': True, 'retention_days': 7, 'backup_path': './backups'},
+        'notification_settings': {'slack_webhook': 'https://hooks.example.com/x'}
+    }),
+}
+
+
+@pytest.mark.parametrize("name", list(SAMPLES))
+def test_model_validate(benchmark, name):
+    model, payload = SAMPLES[name]
+    benchmark(model.model_validate, payload)
+
+
+@pytest.mark.parametrize("name", list(SAMPLES))
+def test_model_validate_json(benchmark, name):
+    model, payload = SAMPLES[name]
+    raw = model.model_validate(payload).model_dump_json().encode()
+    benchmark.extra_info['json_bytes'] = len(raw)
+    benchmark(model.model_validate_json, raw)
+
+
+@pytest.mark.parametrize("name", list(SAMPLES))
+def test_model_dump(benchmark, name):
+    model, payload = SAMPLES[name]
+    benchmark(model.model_validate(payload).model_dump)
+
+
+@pytest.mark.parametrize("name", list(SAMPLES))
+def test_model_dump_json(benchmark, name):
+    model, payload = SAMPLES[name]
+    benchmark(model.model_validate(payload).model_dump_json)
@@ -0,0 +1,69 @@
+"""
+Scheduler hot paths: batch sizing, trend analysis and report building.
+"""
+import asyncio
+from datetime import timedelta
+import pytest
+from benchmarks import datagen
+from services.batch_optimizer import BatchOptimizer
+from services.performance_tracker import PerformanceTracker
+from services.report_service import ReportService
+from services.rollups import RollupStore
+
+
+@pytest.fixture
+def optimizer():
+    optimizer = BatchOptimizer()
+    for metrics in datagen.batch_metrics(100):
+        optimizer.record_batch_performance(metrics)
+    return optimizer
+
+
+@pytest.fixture(scope="module")
+def tracker(scale, now, tmp_path_factory):
+    tracker = PerformanceTracker(str(tmp_path_factory.mktemp("tracker") / "metrics.json"))
+    tracker.metrics_history = datagen.performance_metrics(scale.months, end=now)
+    return tracker
+
+
+@pytest.fixture(scope="module")
+def rollups(runs, tmp_path_factory):
+    store = RollupStore(f"sqlite:///{tmp_path_factory.mktemp('rollups')}/rollups.db")
+    for run in runs:
+        store.record_run(run)
+    return store
+
+
+def test_optimal_batch_size(benchmark, optimizer):
+    benchmark(optimizer.get_optimal_batch_size, 55.0)
+
+
+def test_analyze_batch_performance(benchmark, optimizer):
+    benchmark(optimizer.analyze_batch_performance)
+
+
+def test_record_batch_performance(benchmark, optimizer):
+    metrics = datagen.batch_metrics(1)[0]
+    benchmark(optimizer.record_batch_performance, metrics)
+
+
+@pytest.mark.parametrize("days", [30, 365])
+def test_analyze_performance_trends(benchmark, tracker, days):
+    benchmark(tracker.analyze_performance_trends, days)
+
+
+def test_scheduler_report(benchmark, rollups, now):
+    service = ReportService(rollups)
+    start = now - timedelta(days=90)
+    benchmark(lambda: asyncio.run(service.generate_scheduler_report(start, now, lmt=100, offset=100)))
+
+
+def test_performance_report_from_rollups(benchmark, rollups, now):
+    service = ReportService(rollups)
+    start = now - timedelta(days=90)
+    benchmark(lambda: asyncio.run(service.generate_performance_report(start, now)))
+
+
+def test_rollup_record_run(benchmark, rollups, runs):
+    run = dict(runs[-1])
+    benchmark(rollups.record_run, run)
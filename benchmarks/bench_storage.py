@@ -0,0 +1,97 @@
+"""
+Storage throughput: backup ingest/restore, log directory maintenance and
+batched scans of the archive table.
+"""
+from datetime import datetime
+import shutil
+from sqlalchemy import func, select
+from benchmarks.datagen import archive_records
+from services.backup_store import BackupStore
+from services.disk_usage import compress_files, scan_directory
+
+
+def _fresh_store(tmp_path_factory, dump_file):
+    store = BackupStore(tmp_path_factory.mktemp("store"))
+    staged = store.staging_path(dump_file.name)
+    shutil.copyfile(dump_file, staged)
+    return (store, staged), {}
+
+
+def test_backup_ingest(benchmark, tmp_path_factory, dump_file, scale):
+    benchmark.extra_info['megabytes'] = scale.backup_mb
+    benchmark.pedantic(
+        lambda store, staged: store.ingest(staged),
+        setup=lambda: _fresh_store(tmp_path_factory, dump_file),
+        rounds=3
+    )
+
+
+def test_backup_ingest_deduplicated(benchmark, tmp_path_factory, dump_file, scale):
+    # Second ingest of an unchanged dump: every chunk already exists
+    store = BackupStore(tmp_path_factory.mktemp("store"))
+    store.ingest(dump_file, name="base", remove_source=False)
+    counter = iter(range(10 ** 6))
+    benchmark.extra_info['megabytes'] = scale.backup_mb
+    benchmark.pedantic(
+        lambda: store.ingest(dump_file, name=f"copy_{next(counter)}", remove_source=False),
+        rounds=3
+    )
+
+
+def test_backup_restore_verify(benchmark, tmp_path_factory, dump_file, scale):
+    store = BackupStore(tmp_path_factory.mktemp("store"))
+    store.ingest(dump_file, name="base", remove_source=False)
+    destination = tmp_path_factory.mktemp("restore") / "restored.sql"
+    benchmark.extra_info['megabytes'] = scale.backup_mb
+    benchmark.pedantic(store.restore, args=("base", destination), rounds=3)
+
+
+def test_log_scan(benchmark, log_dir, scale):
+    benchmark.extra_info['megabytes'] = scale.log_mb
+    benchmark(scan_directory, log_dir)
+
+
+def test_log_compress(benchmark, log_dir, tmp_path_factory, scale):
+    def setup():
+        target = tmp_path_factory.mktemp("logs_copy")
+        for path in log_dir.iterdir():
+            shutil.copyfile(path, target / path.name)
+        return (target, lambda entry, stat: True), {}
+
+    benchmark.extra_info['megabytes'] = scale.log_mb
+    benchmark.pedantic(compress_files, setup=setup, rounds=2)
+
+
+def test_archive_count_older_than(benchmark, archive_engine):
+    cutoff = datetime(2023, 1, 1)
+    query = select(func.count()).select_from(archive_records).where(archive_records.c.created_at < cutoff)
+
+    def count():
+        with archive_engine.connect() as connection:
+            return connection.execute(query).scalar_one()
+
+    benchmark(count)
+
+
+def test_archive_batched_scan(benchmark, archive_engine, scale):
+    # The read side of archiving: keyset-paginate rows past the retention cutoff in batches
+    cutoff = datetime(2023, 1, 1)
+    batch_size = 1000
+
+    def scan():
+        last_id, total = 0, 0
+        with archive_engine.connect() as connection:
+            while True:
+                rows = connection.execute(
+                    select(archive_records.c.id, archive_records.c.payload)
+                    .where(archive_records.c.created_at < cutoff, archive_records.c.id > last_id)
+                    .order_by(archive_records.c.id)
+                    .limit(batch_size)
+                ).all()
+                if not rows:
+                    return total
+                total += len(rows)
+                last_id = rows[-1].id
+
+    benchmark.extra_info['rows'] = scale.archive_rows
+    benchmark.pedantic(scan, rounds=3)
@@ -0,0 +1,118 @@
+"""
+Compare a benchmark run against the baselines stored in the repo.
+
+    python -m pytest benchmarks --benchmark-json=benchmarks/results.json
+    python -m benchmarks.compare benchmarks/results.json [--threshold 0.25]
+    python -m benchmarks.compare run1.json run2.json run3.json --update
+
+Medians are compared per benchmark. Given several result files, the fastest
+median of each benchmark is used, which filters out noisy runs. The exit
+status is 1 when any benchmark is slower than its baseline by more than
+``threshold`` (a fraction), so the command can gate CI. ``--update`` rewrites
+the baselines from the run(s); commit the result together with the change
+that explains it. Baselines are only meaningful on comparable hardware and at
+the same BENCH_* scale.
+"""
+from pathlib import Path
+from typing import Any, Dict, List, Tuple
+import argparse
+import json
+import sys
+
+BASELINES = Path(__file__).with_name("baselines.json")
+
+
+def load_run(path: Path) -> Dict[str, Any]:
+    """Reduce a pytest-benchmark JSON file to what the baselines keep"""
+    with open(path) as f:
+        data = json.load(f)
+    return {
+        'machine': {
+            'python_version': data['machine_info'].get('python_version'),
+            'cpu': data['machine_info'].get('cpu', {}).get('brand_raw'),
+            'cpu_count': data['machine_info'].get('cpu', {}).get('count'),
+        },
+        'scale': data.get('scale', {}),
+        'benchmarks': {
+            bench['fullname']: {'median': bench['stats']['median'], 'min': bench['stats']['min']}
+            for bench in data['benchmarks']
+        },
+    }
+
+
+def merge_runs(runs: List[Dict[str, Any]]) -> Dict[str, Any]:
+    """Keep the fastest median (and min) of each benchmark across runs"""
+    merged = {**runs[0], 'benchmarks': {}}
+    for run in runs:
+        for name, stats in run['benchmarks'].items():
+            best = merged['benchmarks'].setdefault(name, dict(stats))
+            best['median'] = min(best['median'], stats['median'])
+            best['min'] = min(best['min'], stats['min'])
+    return merged
+
+
+def compare(baseline: Dict[str, Any], run: Dict[str, Any],
+            threshold: float) -> Tuple[List[Tuple[str, float, float, float]], List[str], List[str]]:
+    """Return (rows of name/baseline/current/ratio, regressed names, names without a baseline)"""
+    rows, regressed, new = [], [], []
+    for name, stats in sorted(run['benchmarks'].items()):
+        base = baseline['benchmarks'].get(name)
+        if base is None:
+            new.append(name)
+            continue
+        ratio = stats['median'] / base['median'] if base['median'] else float('inf')
+        rows.append((name, base['median'], stats['median'], ratio))
+        if ratio > 1 + threshold:
+            regressed.append(name)
+    return rows, regressed, new
+
+
+def _format_seconds(value: float) -> str:
+    if value >= 1:
+        return f"{value:.2f}s"
+    if value >= 1e-3:
+        return f"{value * 1e3:.2f}ms"
+    return f"{value * 1e6:.2f}us"
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('results', type=Path, nargs='+', help='JSON file(s) written by --benchmark-json')
+    parser.add_argument('--baselines', type=Path, default=BASELINES)
+    parser.add_argument('--threshold', type=float, default=0.25, help='allowed slowdown, as a fraction')
+    parser.add_argument('--update', action='store_true', help='replace the baselines with this run')
+    args = parser.parse_args()
+
+    run = merge_runs([load_run(path) for path in args.results])
+    if args.update:
+        with open(args.baselines, 'w') as f:
+            json.dump(run, f, indent=2, sort_keys=True)
+            f.write('\n')
+        print(f"Wrote {len(run['benchmarks'])} baselines to {args.baselines}")
+        return
+
+    with open(args.baselines) as f:
+        baseline = json.load(f)
+    if baseline.get('scale') != run['scale']:
+        print(f"warning: run scale {run['scale']} differs from baseline scale {baseline.get('scale')}")
+
+    rows, regressed, new = compare(baseline, run, args.threshold)
+    width = max((len(name) for name, *_ in rows), default=20)
+    print(f"{'benchmark':<{width}}  {'baseline':>10}  {'current':>10}  {'change':>8}")
+    for name, base, current, ratio in rows:
+        flag = '  REGRESSED' if name in regressed else ''
+        print(f"{name:<{width}}  {_format_seconds(base):>10}  {_format_seconds(current):>10}  "
+              f"{(ratio - 1) * 100:>+7.1f}%{flag}")
+    for name in new:
+        print(f"{name:<{width}}  (no baseline)")
+    missing = sorted(set(baseline['benchmarks']) - set(run['benchmarks']))
+    for name in missing:
+        print(f"{name:<{width}}  (not run)")
+
+    if regressed:
+        print(f"\n{len(regressed)} benchmark(s) regressed by more than {args.threshold:.0%}")
+        sys.exit(1)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,67 @@
+"""
+Shared fixtures for the pytest-benchmark suite.
+
+Dataset sizes (defaults match benchmarks/baselines.json; change them and the
+baselines no longer apply):
+
+    BENCH_MONTHS        months of cleanup runs / performance metrics (12)
+    BENCH_LOG_MB        megabytes of scheduler logs (32)
+    BENCH_ARCHIVE_ROWS  rows in the archive table (100000)
+    BENCH_BACKUP_MB     size of the backup dump (16)
+    BENCH_DATABASE_URL  database for the archive table (a temporary SQLite file);
+                        point it at a local Postgres to benchmark that instead
+"""
+from dataclasses import asdict, dataclass
+from datetime import datetime
+from pathlib import Path
+import os
+import pytest
+from benchmarks import datagen
+
+
+@dataclass(frozen=True)
+class BenchScale:
+    months: int = int(os.getenv("BENCH_MONTHS", "12"))
+    log_mb: int = int(os.getenv("BENCH_LOG_MB", "32"))
+    archive_rows: int = int(os.getenv("BENCH_ARCHIVE_ROWS", "100000"))
+    backup_mb: int = int(os.getenv("BENCH_BACKUP_MB", "16"))
+
+
+@pytest.fixture(scope="session")
+def scale() -> BenchScale:
+    return BenchScale()
+
+
+@pytest.fixture(scope="session")
+def now() -> datetime:
+    return datetime.now().replace(microsecond=0)
+
+
+@pytest.fixture(scope="session")
+def runs(scale, now):
+    return datagen.cleanup_runs(scale.months, end=now)
+
+
+@pytest.fixture(scope="session")
+def log_dir(scale, tmp_path_factory) -> Path:
+    root = tmp_path_factory.mktemp("logs")
+    datagen.write_logs(root, scale.log_mb)
+    return root
+
+
+@pytest.fixture(scope="session")
+def dump_file(scale, tmp_path_factory) -> Path:
+    return datagen.write_dump(tmp_path_factory.mktemp("dump") / "backup.sql", scale.backup_mb)
+
+
+@pytest.fixture(scope="session")
+def archive_engine(scale, tmp_path_factory):
+    url = os.getenv("BENCH_DATABASE_URL") or f"sqlite:///{tmp_path_factory.mktemp('db')}/archive.db"
+    engine = datagen.archive_table(url, scale.archive_rows)
+    yield engine
+    engine.dispose()
+
+
+def pytest_benchmark_update_json(config, benchmarks, output_json):
+    # Record dataset sizes so compare.py can tell when a run is not comparable
+    output_json['scale'] = asdict(BenchScale())
@@ -0,0 +1,209 @@
+"""
+Deterministic synthetic data for the benchmark suite.
+
+Every generator takes a seed so runs are comparable across machines and
+commits. Sizes come from the BENCH_* environment variables read by
+``conftest.py``.
+"""
+from datetime import datetime, timedelta
+from pathlib import Path
+from typing import Any, Dict, Iterator, List, Optional
+import math
+import random
+from sqlalchemy import Column, DateTime, Integer, MetaData, String, Table, create_engine, insert
+from sqlalchemy.engine import Engine
+
+LOG_LEVELS = ['INFO'] * 85 + ['WARNING'] * 10 + ['ERROR'] * 4 + ['DEBUG']
+LOG_MODULES = ['scheduler', 'services.backup_store', 'services.rollups', 'auth.auth_service', 'api.monitor']
+ERRORS = [
+    'Backup verification failed', 'Connection timeout while archiving',
+    'Disk quota exceeded', 'Deadlock detected during optimize'
+]
+
+metadata = MetaData()
+archive_records = Table(
+    'archive_records', metadata,
+    Column('id', Integer, primary_key=True),
+    Column('created_at', DateTime, nullable=False, index=True),
+    Column('status', String(20), nullable=False),
+    Column('payload', String(255), nullable=False),
+)
+archive_history = Table(
+    'archive_history', metadata,
+    Column('id', Integer, primary_key=True),
+    Column('created_at', DateTime, nullable=False),
+    Column('status', String(20), nullable=False),
+    Column('payload', String(255), nullable=False),
+)
+
+DISTRIBUTIONS = ('uniform', 'recent', 'old', 'bursty')
+BURSTS = 12
+BURST_WIDTH = 0.1
+
+
+def _run_times(months: int, runs_per_day: int, end: datetime) -> Iterator[datetime]:
+    start = end - timedelta(days=30 * months)
+    step = timedelta(hours=24 / runs_per_day)
+    current = start
+    while current < end:
+        yield current
+        current += step
+
+
+def cleanup_runs(months: int, runs_per_day: int = 2, seed: int = 1,
+                 end: Optional[datetime] = None) -> List[Dict[str, Any]]:
+    """Run records as passed to CleanupService.record_run, oldest first"""
+    rng = random.Random(seed)
+    end = end or datetime.now().replace(microsecond=0)
+    runs = []
+    for timestamp in _run_times(months, runs_per_day, end):
+        success = rng.random() > 0.05
+        runs.append({
+            'timestamp': timestamp,
+            'records_archived': rng.randint(500, 50000) if success else 0,
+            'duration_seconds': rng.uniform(5, 600),
+            'success': success,
+            'error_message': None if success else rng.choice(ERRORS),
+            'cpu_usage': rng.uniform(5, 95),
+            'memory_usage': rng.uniform(20, 90),
+            'disk_usage': rng.uniform(40, 90),
+        })
+    return runs
+
+
+def performance_metrics(months: int, runs_per_day: int = 24, seed: int = 2,
+                        end: Optional[datetime] = None) -> List[Dict[str, Any]]:
+    """PerformanceTracker.metrics_history entries (ISO timestamps), oldest first"""
+    return [
+        {
+            'duration_seconds': run['duration_seconds'],
+            'records_processed': run['records_archived'],
+            'cpu_usage': run['cpu_usage'],
+            'memory_usage': run['memory_usage'],
+            'success': run['success'],
+            'timestamp': run['timestamp'].isoformat(),
+        }
+        for run in cleanup_runs(months, runs_per_day, seed, end)
+    ]
+
+
+def batch_metrics(count: int, seed: int = 3) -> List[Dict[str, Any]]:
+    """BatchOptimizer.record_batch_performance inputs over a spread of batch sizes"""
+    rng = random.Random(seed)
+    metrics = []
+    for _ in range(count):
+        batch_size = rng.choice([100, 250, 500, 1000, 2000, 5000, 10000])
+        duration = max(1.0, batch_size / rng.uniform(20, 60))
+        metrics.append({
+            'batch_size': batch_size,
+            'duration_seconds': duration,
+            'success': rng.random() > 0.05,
+            'cpu_usage': rng.uniform(5, 95),
+            'memory_usage': rng.uniform(20, 90),
+            'records_processed': batch_size * rng.randint(1, 20),
+        })
+    return metrics
+
+
+def _log_line(rng: random.Random, timestamp: datetime) -> str:
+    level = rng.choice(LOG_LEVELS)
+    if level == 'ERROR':
+        message = f"Error in cleanup job: {rng.choice(ERRORS)}"
+    else:
+        message = f"Processed batch {rng.randint(1, 10 ** 6)} ({rng.randint(100, 10000)} records)"
+    return f"{timestamp:%Y-%m-%d %H:%M:%S},{rng.randint(0, 999):03d} - {rng.choice(LOG_MODULES)} - {level} - {message}\n"
+
+
+def write_logs(root: Path, total_mb: int, file_mb: int = 16, seed: int = 4) -> List[Path]:
+    """Write ``total_mb`` of scheduler-format log lines split across rotated files"""
+    rng = random.Random(seed)
+    root.mkdir(parents=True, exist_ok=True)
+    timestamp = datetime(2024, 1, 1)
+    files, remaining, index = [], total_mb * 1024 * 1024, 0
+    while remaining > 0:
+        path = root / (f"scheduler.log.{index}" if index else "scheduler.log")
+        target = min(remaining, file_mb * 1024 * 1024)
+        written = 0
+        with open(path, 'w') as f:
+            while written < target:
+                lines = []
+                for _ in range(1000):
+                    timestamp += timedelta(milliseconds=rng.randint(1, 2000))
+                    lines.append(_log_line(rng, timestamp))
+                block = ''.join(lines)
+                f.write(block)
+                written += len(block)
+        files.append(path)
+        remaining -= written
+        index += 1
+    return files
+
+
+def write_dump(path: Path, size_mb: int, seed: int = 5) -> Path:
+    """Write a SQL-dump-like file of roughly ``size_mb``"""
+    rng = random.Random(seed)
+    target, written, row = size_mb * 1024 * 1024, 0, 0
+    with open(path, 'w') as f:
+        f.write("BEGIN;\nCREATE TABLE archive_records (id integer, created_at timestamp, status text, payload text);\n")
+        while written < target:
+            lines = []
+            for _ in range(1000):
+                row += 1
+                lines.append(
+                    f"INSERT INTO archive_records VALUES ({row}, '2024-01-01 00:00:00', "
+                    f"'{rng.choice(['active', 'archived'])}', '{rng.getrandbits(256):064x}');\n"
+                )
+            block = ''.join(lines)
+            f.write(block)
+            written += len(block)
+        f.write("COMMIT;\n")
+    return path
+
+
+def _time_fraction(u: float, distribution: str) -> float:
+    """
+    Map the row's rank u in [0, 1) to its position in the time span.
+
+    Monotonic, so ids stay in insertion (time) order: ``recent`` puts most rows
+    near the end of the span, ``old`` near the start, and ``bursty`` packs
+    them into short windows, as after backfills or incident spikes.
+    """
+    if distribution == 'uniform':
+        return u
+    if distribution == 'recent':
+        return u ** (1 / 3)
+    if distribution == 'old':
+        return u ** 3
+    if distribution == 'bursty':
+        burst, within = divmod(u * BURSTS, 1)
+        return (burst + 0.5 + (within - 0.5) * BURST_WIDTH) / BURSTS
+    raise ValueError(f"Unknown distribution {distribution!r}, expected one of {DISTRIBUTIONS}")
+
+
+def archive_table(database_url: str, rows: int, seed: int = 6, chunk: int = 10000,
+                  distribution: str = 'uniform', start: datetime = datetime(2022, 1, 1),
+                  span_days: int = 730) -> Engine:
+    """
+    Create ``archive_records`` (and an empty ``archive_history``) and fill it
+    with ``rows`` rows between ``start`` and ``start + span_days``, spread
+    according to ``distribution``.
+    """
+    rng = random.Random(seed)
+    engine = create_engine(database_url)
+    metadata.drop_all(engine)
+    metadata.create_all(engine)
+    span_seconds = span_days * 24 * 3600
+    with engine.begin() as connection:
+        for offset in range(0, rows, chunk):
+            connection.execute(insert(archive_records), [
+                {
+                    'id': i + 1,
+                    'created_at': start + timedelta(
+                        seconds=math.floor(span_seconds * _time_fraction(i / rows, distribution))
+                    ),
+                    'status': rng.choice(['active', 'archived', 'pending']),
+                    'payload': f"{rng.getrandbits(256):064x}",
+                }
+                for i in range(offset, min(rows, offset + chunk))
+            ])
+    return engine
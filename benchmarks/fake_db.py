@@ -0,0 +1,144 @@
+"""
+In-process stand-in for the scheduler's ``Database`` service.
+
+FakeDatabase does the real work against a database seeded by
+``datagen.archive_table`` (rows are moved into ``archive_history``, dumps are
+streamed to disk, tables are vacuumed/analyzed) and then adds the latency a
+remote production database would, from a LatencyModel. Local SQLite is far
+faster than a networked Postgres under load, so without the model batch-size
+and throughput changes would look better here than they will in production.
+"""
+from dataclasses import dataclass
+from datetime import datetime
+from pathlib import Path
+from typing import Dict, List, Tuple
+import asyncio
+import random
+from sqlalchemy import func, select, text
+from sqlalchemy.engine import Engine
+from benchmarks.datagen import archive_history, archive_records
+
+
+@dataclass
+class LatencyModel:
+    """Simulated cost added on top of the local database work"""
+    round_trip_ms: float = 2.0  # per statement
+    per_row_us: float = 6.0  # per row written (WAL, replication, index maintenance)
+    per_mb_ms: float = 8.0  # backup streaming, ~125 MB/s
+    contention_batch: int = 5000  # batches above this hold locks long enough to collide with traffic
+    contention_per_row_us: float = 4.0  # extra per row above contention_batch
+    optimize_per_krow_ms: float = 2.0  # VACUUM/ANALYZE per thousand live rows
+    jitter: float = 0.25  # sigma of a lognormal multiplier
+
+    def sample(self, rng: random.Random, statements: int = 0, rows: int = 0, megabytes: float = 0.0,
+               live_rows: int = 0) -> float:
+        """Seconds to wait for one operation"""
+        ms = (
+            statements * self.round_trip_ms
+            + rows * self.per_row_us / 1000
+            + max(0, rows - self.contention_batch) * self.contention_per_row_us / 1000
+            + megabytes * self.per_mb_ms
+            + live_rows / 1000 * self.optimize_per_krow_ms
+        )
+        if self.jitter:
+            ms *= rng.lognormvariate(0, self.jitter)
+        return ms / 1000
+
+
+LATENCY_PROFILES: Dict[str, LatencyModel] = {
+    'none': LatencyModel(0, 0, 0, 0, 0, 0, 0),
+    'lan': LatencyModel(),
+    'cloud': LatencyModel(round_trip_ms=8.0, per_row_us=12.0, per_mb_ms=20.0, contention_per_row_us=10.0),
+}
+
+
+class FakeDatabase:
+    """
+    Implements the ``archive_old_records``, ``create_backup`` and
+    ``optimize_tables`` coroutines CleanupService calls.
+
+    Database work runs in a worker thread, like a driver call would, and the
+    modelled latency is awaited so other tasks keep running meanwhile.
+    """
+
+    def __init__(self, engine: Engine, latency: LatencyModel = LATENCY_PROFILES['lan'], seed: int = 7):
+        self.engine = engine
+        self.latency = latency
+        self._rng = random.Random(seed)
+        self.stats = {'batches': 0, 'rows_archived': 0, 'statements': 0, 'simulated_seconds': 0.0,
+                      'backup_bytes': 0}
+
+    async def _wait(self, **cost) -> None:
+        seconds = self.latency.sample(self._rng, **cost)
+        self.stats['simulated_seconds'] += seconds
+        if seconds > 0:
+            await asyncio.sleep(seconds)
+
+    def _archive_batch(self, cutoff: datetime, last_id: int, batch_size: int) -> Tuple[int, int]:
+        """Move one keyset-paginated batch; returns (rows moved, last id)"""
+        with self.engine.begin() as connection:
+            ids: List[int] = connection.execute(
+                select(archive_records.c.id)
+                .where(archive_records.c.created_at < cutoff, archive_records.c.id > last_id)
+                .order_by(archive_records.c.id)
+                .limit(batch_size)
+            ).scalars().all()
+            if not ids:
+                return 0, last_id
+            # Every row in [first, last] older than the cutoff is in this batch, so ranges replace IN lists
+            in_batch = (archive_records.c.id.between(ids[0], ids[-1]), archive_records.c.created_at < cutoff)
+            connection.execute(archive_history.insert().from_select(
+                [c.name for c in archive_records.c], select(archive_records).where(*in_batch)
+            ))
+            connection.execute(archive_records.delete().where(*in_batch))
+        return len(ids), ids[-1]
+
+    async def archive_old_records(self, cutoff_date: datetime, batch_size: int = 1000) -> int:
+        total, last_id = 0, 0
+        while True:
+            moved, last_id = await asyncio.to_thread(self._archive_batch, cutoff_date, last_id, batch_size)
+            self.stats['statements'] += 3 if moved else 1
+            if not moved:
+                await self._wait(statements=1)
+                return total
+            total += moved
+            self.stats['batches'] += 1
+            self.stats['rows_archived'] += moved
+            await self._wait(statements=3, rows=moved)
+
+    def _dump(self, backup_file: Path) -> int:
+        with self.engine.connect() as connection, open(backup_file, 'w') as f:
+            f.write("BEGIN;\n")
+            result = connection.execution_options(stream_results=True, yield_per=5000).execute(
+                select(archive_records).order_by(archive_records.c.id)
+            )
+            for rows in result.partitions():
+                f.write(''.join(
+                    f"INSERT INTO archive_records VALUES ({r.id}, '{r.created_at}', '{r.status}', '{r.payload}');\n"
+                    for r in rows
+                ))
+            f.write("COMMIT;\n")
+        return backup_file.stat().st_size
+
+    async def create_backup(self, backup_file: Path) -> None:
+        size = await asyncio.to_thread(self._dump, Path(backup_file))
+        self.stats['backup_bytes'] += size
+        self.stats['statements'] += 1
+        await self._wait(statements=1, megabytes=size / 1024 / 1024)
+
+    def _optimize(self) -> int:
+        # VACUUM can't run inside a transaction
+        with self.engine.connect().execution_options(isolation_level="AUTOCOMMIT") as connection:
+            live_rows = connection.execute(select(func.count()).select_from(archive_records)).scalar_one()
+            if self.engine.dialect.name == "sqlite":
+                connection.execute(text("VACUUM"))
+                connection.execute(text("ANALYZE"))
+            else:
+                connection.execute(text(f"VACUUM ANALYZE {archive_records.name}"))
+                connection.execute(text(f"VACUUM ANALYZE {archive_history.name}"))
+        return live_rows
+
+    async def optimize_tables(self) -> None:
+        live_rows = await asyncio.to_thread(self._optimize)
+        self.stats['statements'] += 2
+        await self._wait(statements=2, live_rows=live_rows)
@@ -0,0 +1,192 @@
+"""
+Load harness: drive CleanupService.cleanup_old_records end to end against
+a seeded database.
+
+    python -m benchmarks.load --rows 1000000 --distribution recent --retention-days 90 \\
+        [--latency lan|cloud|none] [--database-url postgresql://...] [--batch-size 2000] \\
+        [--runs 3] [--optimize] [--backup] [--json load.json]
+
+Seeds ``archive_records`` with aged rows (SQLite in the work directory
+unless --database-url is given), swaps in FakeDatabase for the scheduler's
+Database service, runs the cleanup and reports rows/sec, peak RSS and
+phase timings per run. The table is re-seeded before every run. With
+--runs > 1 the same CleanupService is reused, so its batch optimizer
+adapts between runs the way it does in production.
+
+The scheduler module is imported inside the work directory, where it writes
+its log, metrics and backups. Its module-level background scheduler is
+shut down straight away.
+"""
+from dataclasses import asdict, dataclass, field
+from datetime import datetime, timedelta
+from pathlib import Path
+from typing import Dict, List, Optional
+from unittest import mock
+import argparse
+import asyncio
+import importlib
+import json
+import os
+import resource
+import tempfile
+import threading
+import time
+import psutil
+from benchmarks import datagen
+from benchmarks.fake_db import LATENCY_PROFILES, FakeDatabase
+
+
+@dataclass
+class RunReport:
+    run: int
+    success: bool
+    rows_archived: int
+    batches: int
+    batch_size: int
+    seconds: float
+    rows_per_second: float
+    peak_rss_mb: float
+    simulated_db_seconds: float
+    phases: Dict[str, float] = field(default_factory=dict)
+    error: Optional[str] = None
+
+
+class RSSSampler:
+    """Track the process's peak resident set size while a run is in progress"""
+
+    def __init__(self, interval: float = 0.05):
+        self.interval = interval
+        self.peak = 0
+        self._process = psutil.Process(os.getpid())
+        self._stop = threading.Event()
+        self._thread = threading.Thread(target=self._sample, daemon=True)
+
+    def _sample(self) -> None:
+        while not self._stop.is_set():
+            self.peak = max(self.peak, self._process.memory_info().rss)
+            self._stop.wait(self.interval)
+
+    def __enter__(self) -> 'RSSSampler':
+        self.peak = self._process.memory_info().rss
+        self._thread.start()
+        return self
+
+    def __exit__(self, *exc) -> None:
+        self._stop.set()
+        self._thread.join()
+        self.peak = max(self.peak, self._process.memory_info().rss)
+
+
+def load_scheduler(workdir: Path):
+    """Import the scheduler module from inside ``workdir`` and stop its background jobs"""
+    os.chdir(workdir)
+    # Keep notifications local: no SMTP server or webhooks during load runs
+    for name in ("SMTP_HOST", "SLACK_WEBHOOK_URL", "TEAMS_WEBHOOK_URL"):
+        os.environ.pop(name, None)
+    scheduler = importlib.import_module("scheduler")
+    scheduler.cleanup_service.scheduler.shutdown(wait=False)
+    return scheduler
+
+
+def seed(database_url: str, rows: int, distribution: str, span_days: int):
+    start = datetime.now().replace(microsecond=0) - timedelta(days=span_days)
+    return datagen.archive_table(database_url, rows, distribution=distribution, start=start, span_days=span_days)
+
+
+async def _drive(args: argparse.Namespace, scheduler, database: FakeDatabase, database_url: str) -> List[RunReport]:
+    with mock.patch.object(scheduler, "Database", return_value=database):
+        service = scheduler.CleanupService()
+    if args.batch_size:
+        service.batch_optimizer.current_batch_size = args.batch_size
+
+    reports = []
+    for run in range(1, args.runs + 1):
+        if run > 1:
+            database.engine.dispose()
+            database.engine = await asyncio.to_thread(
+                seed, database_url, args.rows, args.distribution, args.span_days
+            )
+        config = scheduler.CleanupConfig(
+            retention_days=args.retention_days,
+            optimize_db=args.optimize,
+            backup_first=args.backup,
+            max_batch_size=args.max_batch_size,
+        )
+        before = dict(database.stats)
+        error = None
+        with RSSSampler() as rss:
+            started = time.perf_counter()
+            try:
+                await service.cleanup_old_records(config)
+            except Exception as e:
+                error = str(e)
+            seconds = time.perf_counter() - started
+
+        rows = database.stats['rows_archived'] - before['rows_archived']
+        reports.append(RunReport(
+            run=run,
+            success=error is None,
+            rows_archived=rows,
+            batches=database.stats['batches'] - before['batches'],
+            batch_size=config.batch_size,
+            seconds=round(seconds, 3),
+            rows_per_second=round(rows / seconds, 1) if seconds else 0.0,
+            peak_rss_mb=round(rss.peak / 1024 / 1024, 1),
+            simulated_db_seconds=round(database.stats['simulated_seconds'] - before['simulated_seconds'], 3),
+            phases={name: round(value, 3) for name, value in service.last_phase_timings.items()},
+            error=error,
+        ))
+    return reports
+
+
+def run_load(args: argparse.Namespace) -> List[RunReport]:
+    workdir = Path(args.workdir or tempfile.mkdtemp(prefix="cleanup-load-")).resolve()
+    workdir.mkdir(parents=True, exist_ok=True)
+    database_url = args.database_url or f"sqlite:///{workdir / 'load.db'}"
+    scheduler = load_scheduler(workdir)
+
+    database = FakeDatabase(
+        seed(database_url, args.rows, args.distribution, args.span_days), LATENCY_PROFILES[args.latency]
+    )
+    try:
+        # One event loop for all runs: the service's notification queue lives on it
+        return asyncio.run(_drive(args, scheduler, database, database_url))
+    finally:
+        database.engine.dispose()
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--rows', type=int, default=200000, help='rows to seed before each run')
+    parser.add_argument('--distribution', choices=datagen.DISTRIBUTIONS, default='uniform',
+                        help='how row timestamps are spread over the span')
+    parser.add_argument('--span-days', type=int, default=730, help='age of the oldest seeded row')
+    parser.add_argument('--retention-days', type=int, default=90)
+    parser.add_argument('--latency', choices=sorted(LATENCY_PROFILES), default='lan')
+    parser.add_argument('--database-url', help='seed this database instead of a SQLite file')
+    parser.add_argument('--workdir', help='directory for the database, logs and backups (default: a temp dir)')
+    parser.add_argument('--batch-size', type=int, help="starting batch size for the scheduler's optimizer")
+    parser.add_argument('--max-batch-size', type=int)
+    parser.add_argument('--runs', type=int, default=1)
+    parser.add_argument('--optimize', action='store_true', help='run optimize_tables after archiving')
+    parser.add_argument('--backup', action='store_true', help='take and verify a backup first')
+    parser.add_argument('--json', help='also write the reports to this file')
+    args = parser.parse_args()
+    output = Path(args.json).resolve() if args.json else None
+
+    reports = run_load(args)
+    print(f"{'run':>3} {'ok':>3} {'rows':>10} {'batch':>6} {'seconds':>9} {'rows/s':>10} {'rss MB':>8} phases")
+    for r in reports:
+        phases = ', '.join(f"{name}={value:.2f}s" for name, value in r.phases.items())
+        print(f"{r.run:>3} {'yes' if r.success else 'no':>3} {r.rows_archived:>10} {r.batch_size:>6} "
+              f"{r.seconds:>9.2f} {r.rows_per_second:>10.0f} {r.peak_rss_mb:>8.1f} {phases}")
+        if r.error:
+            print(f"    error: {r.error}")
+    print(f"process peak RSS: {resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024:.1f} MB")
+    if output:
+        with open(output, 'w') as f:
+            json.dump([asdict(r) for r in reports], f, indent=2)
+
+
+if __name__ == '__main__':
+    main()
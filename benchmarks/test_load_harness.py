@@ -0,0 +1,92 @@
+import random
+import tempfile
+from datetime import datetime, timedelta
+from pathlib import Path
+from unittest import IsolatedAsyncioTestCase, TestCase
+from sqlalchemy import func, select
+from benchmarks.datagen import archive_history, archive_records, archive_table
+from benchmarks.fake_db import LATENCY_PROFILES, FakeDatabase, LatencyModel
+
+START = datetime(2023, 1, 1)
+
+
+class SeedDistributionTests(TestCase):
+    def setUp(self):
+        tmp = tempfile.TemporaryDirectory()
+        self.addCleanup(tmp.cleanup)
+        self.root = tmp.name
+
+    def _older_than(self, distribution, days):
+        engine = archive_table(f"sqlite:///{self.root}/{distribution}.db", 5000, distribution=distribution,
+                               start=START, span_days=100)
+        self.addCleanup(engine.dispose)
+        with engine.connect() as connection:
+            return connection.execute(
+                select(func.count()).select_from(archive_records)
+                .where(archive_records.c.created_at < START + timedelta(days=days))
+            ).scalar_one()
+
+    def test_distributions_skew_row_ages(self):
+        """
+        Ensure skewed distributions put more or fewer rows past a cutoff than a uniform spread.
+        """
+        uniform = self._older_than("uniform", 50)
+        self.assertAlmostEqual(uniform, 2500, delta=5)
+        self.assertLess(self._older_than("recent", 50), uniform / 2)
+        self.assertGreater(self._older_than("old", 50), uniform * 1.5)
+
+
+class FakeDatabaseTests(IsolatedAsyncioTestCase):
+    async def asyncSetUp(self):
+        tmp = tempfile.TemporaryDirectory()
+        self.addCleanup(tmp.cleanup)
+        self.root = Path(tmp.name)
+        self.engine = archive_table(f"sqlite:///{self.root}/load.db", 3000, distribution="bursty",
+                                    start=START, span_days=100)
+        self.addCleanup(self.engine.dispose)
+        self.database = FakeDatabase(self.engine, LATENCY_PROFILES["none"])
+
+    def _count(self, table, cutoff=None):
+        query = select(func.count()).select_from(table)
+        if cutoff is not None:
+            query = query.where(table.c.created_at < cutoff)
+        with self.engine.connect() as connection:
+            return connection.execute(query).scalar_one()
+
+    async def test_archive_moves_only_aged_rows_in_batches(self):
+        """
+        Ensure every row older than the cutoff is moved to history, batch by batch.
+        """
+        cutoff = START + timedelta(days=40)
+        expected = self._count(archive_records, cutoff)
+
+        archived = await self.database.archive_old_records(cutoff, batch_size=250)
+
+        self.assertEqual(archived, expected)
+        self.assertEqual(self._count(archive_records, cutoff), 0)
+        self.assertEqual(self._count(archive_history), expected)
+        self.assertEqual(self._count(archive_records), 3000 - expected)
+        self.assertEqual(self.database.stats["batches"], -(-expected // 250))
+
+    async def test_backup_and_optimize(self):
+        """
+        Ensure backups dump every row and optimize runs on SQLite.
+        """
+        backup = self.root / "backup.sql"
+        await self.database.create_backup(backup)
+        self.assertEqual(sum(1 for line in backup.open() if line.startswith("INSERT")), 3000)
+        self.assertEqual(self.database.stats["backup_bytes"], backup.stat().st_size)
+        await self.database.optimize_tables()
+
+
+class LatencyModelTests(TestCase):
+    def test_large_batches_pay_contention(self):
+        """
+        Ensure per-row cost rises above the contention threshold.
+        """
+        model = LatencyModel(jitter=0)
+        rng = random.Random(0)
+        small = model.sample(rng, statements=3, rows=5000) / 5000
+        large = model.sample(rng, statements=3, rows=20000) / 20000
+        self.assertGreater(large, small)
+        self.assertEqual(LATENCY_PROFILES["none"].sample(rng, statements=3, rows=20000), 0)
@@ -32,6 +32,21 @@ ROLE_PERMISSIONS: Dict[Role, Set[Permission]] = {
     }
 }
 
+# One bit per permission so a role's permissions fit in a single int mask
+PERMISSION_BITS: Dict[Permission, int] = {
+    permission: 1 << index for index, permission in enumerate(Permission)
+}
+
+def permission_mask(permissions: Set[Permission]) -> int:
+    mask = 0
+    for permission in permissions:
+        mask |= PERMISSION_BITS[permission]
+    return mask
+
+ROLE_PERMISSION_MASKS: Dict[Role, int] = {
+    role: permission_mask(permissions) for role, permissions in ROLE_PERMISSIONS.items()
+}
+
 @dataclass
 class RoleConfig:
     role: Role
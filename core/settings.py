@@ -27,6 +27,8 @@ INSTALLED_APPS = [
 
 MIDDLEWARE = [
     "django.middleware.security.SecurityMiddleware",
+    "api.middleware.RequestMetricsMiddleware",
+    "api.middleware.SlowRequestMiddleware",
     "django.contrib.sessions.middleware.SessionMiddleware",
     "django.middleware.common.CommonMiddleware",
     "django.middleware.csrf.CsrfViewMiddleware",
@@ -64,9 +66,30 @@ DATABASES = {
         "PASSWORD": os.getenv("DB_PASSWORD", "postgres"),
         "HOST": os.getenv("DB_HOST", "localhost"),
         "PORT": os.getenv("DB_PORT", "5432"),
+        "CONN_MAX_AGE": int(os.getenv("DB_CONN_MAX_AGE", "60")),
+        "CONN_HEALTH_CHECKS": os.getenv("DB_CONN_HEALTH_CHECKS", "True") == "True",
     }
 }
 
+# DB_POOL_MODE:
+#   persistent - reuse each worker's connection for CONN_MAX_AGE seconds (default)
+#   pool       - psycopg 3 connection pool per process, sized by DB_POOL_MIN_SIZE/DB_POOL_SIZE
+#   pgbouncer  - persistent connections to pgbouncer in transaction pooling mode
+DB_POOL_MODE = os.getenv("DB_POOL_MODE", "persistent")
+
+if DB_POOL_MODE == "pool":
+    DATABASES["default"]["CONN_MAX_AGE"] = 0  # the pool owns connection lifetime
+    DATABASES["default"]["OPTIONS"] = {
+        "pool": {
+            "min_size": int(os.getenv("DB_POOL_MIN_SIZE", "2")),
+            "max_size": int(os.getenv("DB_POOL_SIZE", "5")),
+            "timeout": float(os.getenv("DB_POOL_TIMEOUT", "30")),
+        }
+    }
+elif DB_POOL_MODE == "pgbouncer":
+    # Server-side cursors don't survive transaction pooling
+    DATABASES["default"]["DISABLE_SERVER_SIDE_CURSORS"] = True
+
 # Password validation
 AUTH_PASSWORD_VALIDATORS = [
     {
@@ -93,19 +116,35 @@ USE_TZ = True
 STATIC_URL = "static/"
 STATIC_ROOT = os.path.join(BASE_DIR, "staticfiles")
 
+REDIS_URL = os.getenv("REDIS_URL")
+
+if REDIS_URL:
+    CACHES = {
+        "default": {
+            "BACKEND": "django.core.cache.backends.redis.RedisCache",
+            "LOCATION": REDIS_URL,
+            "KEY_PREFIX": "api",
+            "TIMEOUT": 300,
+        }
+    }
+else:
+    CACHES = {
+        "default": {
+            "BACKEND": "django.core.cache.backends.locmem.LocMemCache",
+        }
+    }
+
 REST_FRAMEWORK = {
     "DEFAULT_SCHEMA_CLASS": "drf_spectacular.openapi.AutoSchema",
+    "DEFAULT_PAGINATION_CLASS": "api.pagination.CreatedAtCursorPagination",
+    "PAGE_SIZE": 50,
 }
 
 SENTRY_DSN = os.getenv("SENTRY_DSN")
 
 if SENTRY_DSN:
-    import sentry_sdk
     from sentry_sdk.integrations.django import DjangoIntegration
+    from services.tracing import init_tracing
 
-    sentry_sdk.init(
-        dsn=SENTRY_DSN,
-        integrations=[DjangoIntegration()],
-        traces_sample_rate=1.0,
-        send_default_pii=True,
-    )
\ No newline at end of file
+    # Traces are sampled per endpoint (see services/tracing.py); errors are always sent
+    init_tracing(SENTRY_DSN, integrations=[DjangoIntegration()])
\ No newline at end of file
@@ -0,0 +1,11 @@
+from pydantic import BaseModel, ConfigDict
+
+
+class ApiModel(BaseModel):
+    """
+    Base for request/response schemas.
+
+    Error messages omit the submitted values, so passwords never end up in
+    422 responses or logs.
+    """
+    model_config = ConfigDict(hide_input_in_errors=True)
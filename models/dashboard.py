@@ -1,7 +1,7 @@
-from pydantic import BaseModel
 from datetime import datetime
 from typing import List, Optional, Dict
 from enum import Enum
+from models.base import ApiModel
 
 class SystemStatus(str, Enum):
     HEALTHY = "healthy"
@@ -14,33 +14,33 @@ class AlertSeverity(str, Enum):
     ERROR = "error"
     CRITICAL = "critical"
 
-class SystemHealth(BaseModel):
+class SystemHealth(ApiModel):
     status: SystemStatus
     metrics: Dict[str, float]
     disk_usage: Dict[str, float]
 
-class CleanupStats(BaseModel):
+class CleanupStats(ApiModel):
     total_records: int
     last_run_status: str
     success_rate: float
     next_scheduled_run: datetime
 
-class Alert(BaseModel):
+class Alert(ApiModel):
     id: str
     severity: AlertSeverity
     message: str
     timestamp: datetime
     resolved: bool
-    details: Optional[Dict]
+    details: Optional[Dict] = None
 
-class PerformanceMetric(BaseModel):
+class PerformanceMetric(ApiModel):
     timestamp: datetime
     cpu_usage: float
     memory_usage: float
-    cleanup_duration: Optional[float]
-    records_processed: Optional[int]
+    cleanup_duration: Optional[float] = None
+    records_processed: Optional[int] = None
 
-class PerformanceMetrics(BaseModel):
+class PerformanceMetrics(ApiModel):
     time_range: str
     data_points: List[PerformanceMetric]
     average_cpu: float
@@ -48,7 +48,7 @@ class PerformanceMetrics(BaseModel):
     peak_cpu: float
     peak_memory: float
 
-class DashboardOverview(BaseModel):
+class DashboardOverview(ApiModel):
     system_health: SystemHealth
     cleanup_stats: CleanupStats
     alerts: List[Alert]
@@ -1,7 +1,8 @@
-from pydantic import BaseModel, validator
+from pydantic import model_validator
 from typing import List, Optional, Dict
 from datetime import datetime
 from enum import Enum
+from models.base import ApiModel
 
 class LogLevel(str, Enum):
     DEBUG = "debug"
@@ -10,30 +11,29 @@ class LogLevel(str, Enum):
     ERROR = "error"
     CRITICAL = "critical"
 
-class LogEntry(BaseModel):
+class LogEntry(ApiModel):
     timestamp: datetime
     level: LogLevel
     message: str
     module: str
-    function: Optional[str]
-    line_number: Optional[int]
-    details: Optional[Dict]
-    stack_trace: Optional[str]
+    function: Optional[str] = None
+    line_number: Optional[int] = None
+    details: Optional[Dict] = None
+    stack_trace: Optional[str] = None
 
-class LogFilter(BaseModel):
-    level: Optional[LogLevel]
-    start_date: Optional[datetime]
-    end_date: Optional[datetime]
-    search: Optional[str]
+class LogFilter(ApiModel):
+    level: Optional[LogLevel] = None
+    start_date: Optional[datetime] = None
+    end_date: Optional[datetime] = None
+    search: Optional[str] = None
 
-    @validator('end_date')
-    def validate_date_range(cls, v, values):
-        if v and 'start_date' in values and values['start_date']:
-            if v < values['start_date']:
-                raise ValueError('end_date must be after start_date')
-        return v
+    @model_validator(mode='after')
+    def validate_date_range(self):
+        if self.start_date and self.end_date and self.end_date < self.start_date:
+            raise ValueError('end_date must be after start_date')
+        return self
 
-class LogSummary(BaseModel):
+class LogSummary(ApiModel):
     total_size: int
     error_count: int
     warning_count: int
@@ -43,7 +43,7 @@ class LogSummary(BaseModel):
     storage_usage: float
     file_count: int
 
-class PaginatedLogs(BaseModel):
+class PaginatedLogs(ApiModel):
     logs: List[LogEntry]
     total: int
     page: int
@@ -1,20 +1,34 @@
-from pydantic import BaseModel, EmailStr, validator
+from pydantic import EmailStr, field_validator
 from typing import List, Optional, Dict
 from datetime import datetime
 from enum import Enum
+from functools import lru_cache
+from apscheduler.triggers.cron import CronTrigger
+from models.base import ApiModel
+
+@lru_cache(maxsize=256)
+def compile_crontab(expression: str) -> CronTrigger:
+    # Building a CronTrigger dominates ReportSchedule validation; schedules repeat, so remember valid ones.
+    # Triggers are immutable, so the scheduler reuses the one compiled here.
+    return CronTrigger.from_crontab(expression)
 
 class ReportFormat(str, Enum):
     JSON = "json"
     PDF = "pdf"
     EXCEL = "excel"
 
+class ExportFormat(str, Enum):
+    CSV = "csv"
+    NDJSON = "ndjson"
+    XLSX = "xlsx"
+
 class ReportType(str, Enum):
     PERFORMANCE = "performance"
     CLEANUP = "cleanup"
     STORAGE = "storage"
     COMPREHENSIVE = "comprehensive"
 
-class PerformanceMetrics(BaseModel):
+class PerformanceMetrics(ApiModel):
     average_cpu: float
     peak_cpu: float
     average_memory: float
@@ -22,27 +36,27 @@ class PerformanceMetrics(BaseModel):
     average_duration: float
     peak_duration: float
 
-class StorageMetrics(BaseModel):
+class StorageMetrics(ApiModel):
     average_usage: float
     peak_usage: float
     space_reclaimed: float
     growth_rate: float
 
-class DailyStats(BaseModel):
+class DailyStats(ApiModel):
     date: datetime
     jobs_run: int
     success_rate: float
     records_processed: int
     average_duration: float
 
-class PerformanceReport(BaseModel):
+class PerformanceReport(ApiModel):
     period: Dict[str, datetime]
     summary: Dict[str, float]
     performance: PerformanceMetrics
     storage: StorageMetrics
     trends: Dict[str, List[DailyStats]]
 
-class CleanupStats(BaseModel):
+class CleanupStats(ApiModel):
     total_jobs: int
     success_rate: float
     total_records: int
@@ -50,14 +64,32 @@ class CleanupStats(BaseModel):
     records_per_job: float
     failure_reasons: Dict[str, int]
 
-class ReportSchedule(BaseModel):
+class ReportJobRequest(ApiModel):
+    report_type: ReportType = ReportType.PERFORMANCE
+    start_date: datetime
+    end_date: datetime
+    format: ReportFormat = ReportFormat.PDF
+
+class ReportJobStatus(ApiModel):
+    job_id: str
+    status: str
+    report_type: ReportType
+    format: ReportFormat
+    created_at: datetime
+    completed_at: Optional[datetime] = None
+    error: Optional[str] = None
+    download_url: Optional[str] = None
+
+class ReportSchedule(ApiModel):
     report_type: ReportType
     schedule: str  # cron expression
     recipients: List[EmailStr]
     format: ReportFormat = ReportFormat.PDF
-    custom_params: Optional[Dict]
+    custom_params: Optional[Dict] = None
 
-    @validator('schedule')
+    @field_validator('schedule')
+    @classmethod
     def validate_cron(cls, v):
-        # Add cron expression validation
+        # Raises ValueError with a descriptive message for malformed expressions
+        compile_crontab(v)
         return v 
\ No newline at end of file
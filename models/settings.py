@@ -1,7 +1,8 @@
-from pydantic import BaseModel, EmailStr, validator
+from pydantic import EmailStr, field_validator
 from typing import List, Optional, Dict
 from datetime import datetime, time
 from enum import Enum
+from models.base import ApiModel
 
 class ScheduleType(str, Enum):
     DAILY = "daily"
@@ -9,7 +10,7 @@ class ScheduleType(str, Enum):
     MONTHLY = "monthly"
     CUSTOM = "custom"
 
-class EmailConfig(BaseModel):
+class EmailConfig(ApiModel):
     enabled: bool
     smtp_host: str
     smtp_port: int
@@ -18,19 +19,19 @@ class EmailConfig(BaseModel):
     from_address: EmailStr
     admin_emails: List[EmailStr]
 
-class BackupConfig(BaseModel):
+class BackupConfig(ApiModel):
     enabled: bool
     retention_days: int
     backup_path: str
     compress: bool = True
 
-class NotificationSettings(BaseModel):
+class NotificationSettings(ApiModel):
     email_on_failure: bool = True
     email_on_success: bool = False
-    slack_webhook: Optional[str]
-    teams_webhook: Optional[str]
+    slack_webhook: Optional[str] = None
+    teams_webhook: Optional[str] = None
 
-class SchedulerSettings(BaseModel):
+class SchedulerSettings(ApiModel):
     cleanup_schedule: str
     retention_days: int
     batch_size: int
@@ -40,26 +41,29 @@ class SchedulerSettings(BaseModel):
     backup_config: BackupConfig
     notification_settings: NotificationSettings
     
-    @validator('retention_days')
+    @field_validator('retention_days')
+    @classmethod
     def validate_retention_days(cls, v):
         if v < 1:
             raise ValueError('Retention days must be at least 1')
         return v
     
-    @validator('batch_size')
+    @field_validator('batch_size')
+    @classmethod
     def validate_batch_size(cls, v):
         if not (100 <= v <= 10000):
             raise ValueError('Batch size must be between 100 and 10000')
         return v
     
-    @validator('disk_threshold')
+    @field_validator('disk_threshold')
+    @classmethod
     def validate_disk_threshold(cls, v):
         if not (50 <= v <= 95):
             raise ValueError('Disk threshold must be between 50 and 95')
         return v
 
-class SettingsHistory(BaseModel):
+class SettingsHistory(ApiModel):
     timestamp: datetime
     user: str
     settings: SchedulerSettings
-    comment: Optional[str] 
\ No newline at end of file
+    comment: Optional[str] = None
\ No newline at end of file
@@ -1,31 +1,52 @@
-from pydantic import BaseModel
 from datetime import datetime
 from typing import Dict, Optional, List
+from models.base import ApiModel
 
-class SystemMetrics(BaseModel):
+class SystemMetrics(ApiModel):
     cpu_percent: float
     memory_usage: float
     disk_usage: float
     process_memory: float
 
-class DiskUsage(BaseModel):
+class DiskUsage(ApiModel):
     total: int
     used: int
     free: int
     percent: float
+    backups_bytes: int = 0
+    logs_bytes: int = 0
+    temp_bytes: int = 0
+    reclaimed_bytes: int = 0
 
-class SchedulerStats(BaseModel):
+class SchedulerStats(ApiModel):
     uptime: float
-    last_cleanup: Optional[datetime]
+    last_cleanup: Optional[datetime] = None
     records_archived: int
     next_scheduled_run: datetime
     metrics: SystemMetrics
     disk_usage: DiskUsage
     active_jobs: int
+    db_pools: Dict[str, Dict[str, float]] = {}
 
-class CleanupHistory(BaseModel):
+class CleanupHistory(ApiModel):
     timestamp: datetime
     records_archived: int
     duration_seconds: float
     success: bool
-    error_message: Optional[str] 
\ No newline at end of file
+    error_message: Optional[str] = None
+    profile_id: Optional[str] = None
+
+class PhaseTimingEntry(ApiModel):
+    name: str
+    offset_seconds: float
+    duration_seconds: float
+    status: str
+
+class CleanupProfileSummary(ApiModel):
+    run_id: str
+    started_at: datetime
+    total_seconds: float
+    unaccounted_seconds: float
+
+class CleanupProfile(CleanupProfileSummary):
+    phases: List[PhaseTimingEntry]
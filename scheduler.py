@@ -1,17 +1,33 @@
 from apscheduler.schedulers.background import BackgroundScheduler
+from apscheduler.events import EVENT_JOB_SUBMITTED
 from datetime import datetime, timedelta
 from services.database import Database
 from services.notifications import EmailService
 import logging
 import psutil
 import os
-from typing import Dict, Any, List
+from typing import Dict, Any, List, Optional, Callable
 from dataclasses import dataclass
 from pathlib import Path
 import shutil
 import asyncio
+import time
+from contextlib import contextmanager
+from contextvars import ContextVar
 from services.performance_tracker import PerformanceTracker
 from services.batch_optimizer import BatchOptimizer
+from services.batch_tuner import BatchTuner
+from services.rollups import RollupStore
+from services.report_service import ReportService
+from services.backup_store import BackupStore, RetentionPolicy
+from services.disk_usage import (
+    DirectoryUsage, RemovalResult, scan_directory, remove_files, compress_files
+)
+from services.disk_forecast import DiskUsageForecaster, preemptive_cleanup_due
+from services.emergency_cleanup import EscalationStage, escalate
+from services.tracing import PHASE_OP, init_tracing, job_transaction, span
+from services.profiling import ProfileStore, RunProfiler
+from services import metrics
 
 # Configure logging
 logging.basicConfig(
@@ -24,12 +40,20 @@ logging.basicConfig(
 )
 logger = logging.getLogger(__name__)
 
+# Profiler and phase timings of the cleanup run executing in the current context,
+# so overlapping runs (each scheduler job has its own event loop) never share them
+_run_profiler: ContextVar[Optional[RunProfiler]] = ContextVar('cleanup_run_profiler', default=None)
+_run_phase_timings: ContextVar[Optional[Dict[str, float]]] = ContextVar('cleanup_run_phase_timings', default=None)
+
 @dataclass
 class CleanupConfig:
     retention_days: int
     batch_size: int = 1000
     optimize_db: bool = False
     backup_first: bool = True
+    max_batch_size: Optional[int] = None  # Caps the optimizer's batch size to throttle load
+    tune_batch_size: bool = True  # False keeps batch_size as given instead of asking the optimizer
+    profile: bool = False  # Capture a phase timeline and CPU profile for this run
 
 class CleanupService:
     def __init__(self):
@@ -37,13 +61,41 @@ class CleanupService:
         self.db = Database()
         self.email_service = EmailService()
         self.performance_tracker = PerformanceTracker()
-        self.batch_optimizer = BatchOptimizer()
+        # BATCH_TUNING=True explores batch sizes online instead of the fixed step rule
+        self.batch_optimizer = BatchOptimizer(
+            tuner=BatchTuner() if os.getenv("BATCH_TUNING", "False") == "True" else None
+        )
         self.backup_path = Path("./backups")
         self.backup_path.mkdir(exist_ok=True)
+        self.backup_store = BackupStore(self.backup_path)
+        self.backup_retention = RetentionPolicy.from_env()
         self.last_cleanup_time = None
         self.total_records_archived = 0
-        self.cleanup_history = []
+        self.rollups = RollupStore()
+        self.report_service = ReportService(self.rollups)
         self.start_time = datetime.now()
+        self.last_phase_timings: Dict[str, float] = {}
+        self.profile_store = ProfileStore()
+
+    @contextmanager
+    def _phase(self, name: str):
+        """Time one phase of a cleanup run and record it as a tracing span"""
+        started = time.perf_counter()
+        profiler = _run_profiler.get()
+        try:
+            if profiler is None:
+                with span(PHASE_OP, name):
+                    yield
+            else:
+                with span(PHASE_OP, name), profiler.phase(name):
+                    yield
+        finally:
+            elapsed = time.perf_counter() - started
+            timings = _run_phase_timings.get()
+            if timings is not None:
+                timings[name] = timings.get(name, 0.0) + elapsed
+            metrics.observe_phase(name, elapsed)
+            logger.debug(f"Cleanup phase {name} took {elapsed:.2f}s")
 
     def get_system_metrics(self) -> Dict[str, Any]:
         return {
@@ -54,37 +106,77 @@ class CleanupService:
         }
 
     async def cleanup_old_records(self, config: CleanupConfig):
+        profiler = self.profile_store.start_profiler(requested=config.profile)
+        timings: Dict[str, float] = {}
+        profiler_token = _run_profiler.set(profiler)
+        timings_token = _run_phase_timings.set(timings)
+        try:
+            with job_transaction("cleanup_old_records"):
+                await self._cleanup_old_records(config)
+        finally:
+            _run_phase_timings.reset(timings_token)
+            _run_profiler.reset(profiler_token)
+            # Timings of the most recently finished run, for callers that inspect it afterwards
+            self.last_phase_timings = timings
+            if profiler is not None:
+                profiler.stop()
+                try:
+                    await asyncio.to_thread(self.profile_store.save, profiler)
+                except Exception as e:
+                    logger.error(f"Failed to save cleanup profile {profiler.run_id}: {str(e)}")
+
+    async def _cleanup_old_records(self, config: CleanupConfig):
         start_time = datetime.now()
         metrics_start = self.get_system_metrics()
         
-        # Get optimal batch size based on current conditions
-        optimal_batch_size = self.batch_optimizer.get_optimal_batch_size(
-            metrics_start['memory_usage']
-        )
-        config.batch_size = optimal_batch_size
+        # Get optimal batch size based on current conditions. archive_old_records
+        # archives every table in one call, so the tuner keeps a single "default"
+        # model until it works per table.
+        if config.tune_batch_size:
+            config.batch_size = self.batch_optimizer.get_optimal_batch_size(
+                metrics_start['memory_usage'],
+                metrics_start['cpu_percent']
+            )
+        if config.max_batch_size:
+            config.batch_size = min(config.batch_size, config.max_batch_size)
+        metrics.BATCH_SIZE.set(config.batch_size)
         
         try:
             logger.info(f"Starting cleanup with config: {config}")
             metrics_before = self.get_system_metrics()
 
             if config.backup_first:
-                backup_file = await self.create_backup()
-                # Verify backup before proceeding
-                verification = await self.verify_backup_integrity(backup_file)
-                if not verification['status']:
-                    raise RuntimeError("Backup verification failed, aborting cleanup")
+                with self._phase('backup'):
+                    backup_file = await self.create_backup()
+                try:
+                    # Verify backup before proceeding
+                    with self._phase('verify'):
+                        verification = await self.verify_backup_integrity(backup_file)
+                    if not verification['status']:
+                        raise RuntimeError("Backup verification failed, aborting cleanup")
+                    # Move the verified dump into the deduplicated store
+                    with self._phase('ingest'):
+                        await asyncio.to_thread(self.backup_store.ingest, backup_file)
+                finally:
+                    # Ingest removes the dump; anything still staged here was never stored
+                    backup_file.unlink(missing_ok=True)
 
             # Get records older than specified days
             cutoff_date = datetime.now() - timedelta(days=config.retention_days)
-            archived_count = await self.db.archive_old_records(
-                cutoff_date, 
-                batch_size=config.batch_size
-            )
+            disk_used_before = shutil.disk_usage('/').used
+            with self._phase('archive'):
+                archived_count = await self.db.archive_old_records(
+                    cutoff_date, 
+                    batch_size=config.batch_size
+                )
+            metrics.observe_archive(archived_count, _run_phase_timings.get()['archive'])
 
             if config.optimize_db:
-                await self.db.optimize_tables()
+                with self._phase('optimize'):
+                    await self.db.optimize_tables()
 
             metrics_after = self.get_system_metrics()
+            space_reclaimed = max(0, disk_used_before - shutil.disk_usage('/').used)
             
             # Send summary email
             report_data = {
@@ -96,65 +188,75 @@ class CleanupService:
                 'metrics_after': metrics_after
             }
             
-            await self.email_service.send_admin_report(report_data)
+            with self._phase('notify'):
+                await self.email_service.send_admin_report(report_data)
             logger.info(f"Cleanup completed. Archived {archived_count} records.")
             
             self.last_cleanup_time = datetime.now()
             self.total_records_archived += archived_count
+            metrics.CLEANUP_RUNS.labels(status='success').inc()
             
-            # Record history
-            self.cleanup_history.append({
-                'timestamp': self.last_cleanup_time,
-                'records_archived': archived_count,
-                'duration_seconds': (datetime.now() - start_time).total_seconds(),
-                'success': True,
-                'error_message': None
-            })
-            
-            # Keep only last 100 entries
-            if len(self.cleanup_history) > 100:
-                self.cleanup_history = self.cleanup_history[-100:]
+            with self._phase('record'):
+                # Record history
+                self.record_run({
+                    'timestamp': self.last_cleanup_time,
+                    'records_archived': archived_count,
+                    'duration_seconds': (datetime.now() - start_time).total_seconds(),
+                    'success': True,
+                    'error_message': None,
+                    'cpu_usage': metrics_start['cpu_percent'],
+                    'memory_usage': metrics_start['memory_usage'],
+                    'disk_usage': metrics_after['disk_usage'],
+                    'space_reclaimed': space_reclaimed
+                })
             
-            # Record performance metrics
-            cleanup_duration = (datetime.now() - start_time).total_seconds()
-            self.performance_tracker.record_cleanup_metrics({
-                'duration_seconds': cleanup_duration,
-                'records_processed': archived_count,
-                'cpu_usage': metrics_start['cpu_percent'],
-                'memory_usage': metrics_start['memory_usage'],
-                'success': True
-            })
+                # Record performance metrics
+                cleanup_duration = (datetime.now() - start_time).total_seconds()
+                self.performance_tracker.record_cleanup_metrics({
+                    'duration_seconds': cleanup_duration,
+                    'records_processed': archived_count,
+                    'cpu_usage': metrics_start['cpu_percent'],
+                    'memory_usage': metrics_start['memory_usage'],
+                    'success': True
+                })
             
-            # Record batch performance
-            self.batch_optimizer.record_batch_performance({
-                'batch_size': config.batch_size,
-                'duration_seconds': cleanup_duration,
-                'success': True,
-                'cpu_usage': metrics_start['cpu_percent'],
-                'memory_usage': metrics_start['memory_usage'],
-                'records_processed': archived_count
-            })
+                # Record batch performance; a run with nothing to archive says nothing about its batch size
+                if archived_count > 0:
+                    self.batch_optimizer.record_batch_performance({
+                        'batch_size': config.batch_size,
+                        'duration_seconds': cleanup_duration,
+                        'success': True,
+                        'cpu_usage': metrics_start['cpu_percent'],
+                        'memory_usage': metrics_start['memory_usage'],
+                        'peak_cpu_usage': max(metrics_start['cpu_percent'], metrics_after['cpu_percent']),
+                        'peak_memory_usage': max(metrics_start['memory_usage'], metrics_after['memory_usage']),
+                        'records_processed': archived_count
+                    })
             
-            # Analyze performance and adjust schedule if needed
-            if archived_count > 0:
-                analysis = self.performance_tracker.analyze_performance_trends()
-                if analysis['recommendations']:
-                    logger.info(f"Performance recommendations: {analysis['recommendations']}")
-                    await self.adjust_schedule(analysis)
+                # Analyze performance and adjust schedule if needed
+                if archived_count > 0:
+                    analysis = self.performance_tracker.analyze_performance_trends()
+                    if analysis['recommendations']:
+                        logger.info(f"Performance recommendations: {analysis['recommendations']}")
+                        await self.adjust_schedule(analysis)
             
-            # Analyze batch performance
-            batch_analysis = self.batch_optimizer.analyze_batch_performance()
-            if batch_analysis['recommendations']:
-                logger.info(f"Batch size recommendations: {batch_analysis['recommendations']}")
+                # Analyze batch performance
+                batch_analysis = self.batch_optimizer.analyze_batch_performance()
+                if batch_analysis['recommendations']:
+                    logger.info(f"Batch size recommendations: {batch_analysis['recommendations']}")
             
         except Exception as e:
+            metrics.CLEANUP_RUNS.labels(status='failure').inc()
             # Record failed cleanup
-            self.cleanup_history.append({
+            self.record_run({
                 'timestamp': datetime.now(),
                 'records_archived': 0,
                 'duration_seconds': (datetime.now() - start_time).total_seconds(),
                 'success': False,
-                'error_message': str(e)
+                'error_message': str(e),
+                'cpu_usage': metrics_start['cpu_percent'],
+                'memory_usage': metrics_start['memory_usage'],
+                'disk_usage': metrics_start['disk_usage']
             })
             logger.error(f"Error in cleanup job: {str(e)}", exc_info=True)
             await self.email_service.send_alert('Cleanup job failed', str(e))
@@ -180,13 +282,28 @@ class CleanupService:
             
             raise
 
+    def record_run(self, run: Dict[str, Any]) -> None:
+        """Add a finished run to the rollup tables, the single store of run history"""
+        profiler = _run_profiler.get()
+        if profiler is not None:
+            run['profile_id'] = profiler.run_id
+        try:
+            self.rollups.record_run(run)
+        except Exception as e:
+            logger.error(f"Failed to update cleanup rollups: {str(e)}")
+
     async def create_backup(self):
         timestamp = datetime.now().strftime('%Y%m%d_%H%M%S')
-        backup_file = self.backup_path / f"backup_{timestamp}.sql"
+        backup_file = self.backup_store.staging_path(f"backup_{timestamp}.sql")
+        started = time.perf_counter()
         await self.db.create_backup(backup_file)
+        metrics.observe_backup(backup_file.stat().st_size, time.perf_counter() - started)
         logger.info(f"Created backup: {backup_file}")
         return backup_file
 
+    def get_disk_usage(self) -> Dict[str, float]:
+        return disk_monitor.get_usage_report()
+
     def get_uptime(self) -> float:
         return (datetime.now() - self.start_time).total_seconds()
 
@@ -196,110 +313,20 @@ class CleanupService:
             return None
         return min(job.next_run_time for job in jobs)
 
-    async def get_cleanup_history(self) -> List[Dict]:
-        return self.cleanup_history
+    async def get_cleanup_history(self, limit: int = 100) -> List[Dict]:
+        return await asyncio.to_thread(self.rollups.recent_runs, limit)
 
-    async def generate_scheduler_report(self, start_date: datetime, end_date: datetime, lmt: int = 100) -> Dict[str, Any]:
+    async def generate_scheduler_report(self, start_date: datetime, end_date: datetime, lmt: int = 100, offset: int = 0) -> Dict[str, Any]:
         """
-        Generate a comprehensive report of scheduler activities and performance metrics for a specified time period.
-
-        This function analyzes scheduler performance, cleanup operations, and system metrics to create
-        a detailed report. It includes statistics about cleanup jobs, system resource utilization,
-        and overall efficiency metrics.
-
-        Args:
-            start_date (datetime): The start date for the report period
-            end_date (datetime): The end date for the report period
+        Generate a report of scheduler activities and performance metrics for a specified time period.
 
-        Returns:
-            Dict[str, Any]: A dictionary containing the following report sections:
-                - performance_metrics: CPU and memory usage statistics
-                - cleanup_stats: Statistics about cleanup operations
-                - disk_usage: Storage utilization metrics
-                - job_history: Historical data about scheduled jobs
-                Example:
-                {
-                    'performance_metrics': {
-                        'avg_cpu_usage': 45.2,
-                        'peak_memory_usage': 1024.5,
-                        'avg_job_duration': 120.5
-                    },
-                    'cleanup_stats': {
-                        'total_jobs': 48,
-                        'successful_jobs': 45,
-                        'records_archived': 15000,
-                        'success_rate': 93.75
-                    },
-                    'disk_usage': {
-                        'space_reclaimed': 1024000,
-                        'efficiency_ratio': 0.85
-                    },
-                    'job_history': [
-                        {
-                            'timestamp': '2024-03-10T15:30:00',
-                            'status': 'success',
-                            'duration': 118.5,
-                            'records_processed': 500
-                        },
-                        ...
-                    ]
-                }
+        See ReportService.generate_scheduler_report for the report layout.
 
         Raises:
-            ValueError: If end_date is before start_date or if the date range is invalid
-            RuntimeError: If there's an error accessing the metrics or generating the report
-
-        Example:
-            >>> start = datetime(2024, 3, 1)
-            >>> end = datetime(2024, 3, 15)
-            >>> report = await scheduler.generate_scheduler_report(start, end)
-            >>> print(f"Success rate: {report['cleanup_stats']['success_rate']}%")
-            Success rate: 93.75%
+            RuntimeError: If the period or paging is invalid or the report can't be built
         """
         try:
-            # Validate date range
-            if end_date < start_date:
-                raise ValueError("End date must be after start date")
-            
-            # Get performance metrics
-            metrics = self.get_system_metrics()
-            
-            # Get cleanup history for the period
-            cleanup_history = [job for job in self.cleanup_history 
-                             if start_date <= job['timestamp'] <= end_date]
-            
-            # Calculate cleanup statistics
-            total_jobs = len(cleanup_history)
-            successful_jobs = len([job for job in cleanup_history if job['success']])
-            success_rate = (successful_jobs / total_jobs * 100) if total_jobs > 0 else 0
-            
-            # Calculate total records archived
-            total_records = sum(job['records_archived'] for job in cleanup_history if job['success'])
-            
-            # Calculate average job duration
-            durations = [job['duration_seconds'] for job in cleanup_history if job['success']]
-            avg_duration = sum(durations) / len(durations) if durations else 0
-            
-            # Compile the report
-            report = {
-                'performance_metrics': {
-                    'avg_cpu_usage': metrics['cpu_percent'],
-                    'peak_memory_usage': metrics['memory_usage'],
-                    'avg_job_duration': avg_duration
-                },
-                'cleanup_stats': {
-                    'total_jobs': total_jobs,
-                    'successful_jobs': successful_jobs,
-                    'records_archived': total_records,
-                    'success_rate': success_rate
-                },
-                'disk_usage': {
-                    'space_reclaimed': self.calculate_space_reclaimed(),
-                    'efficiency_ratio': self.calculate_efficiency_ratio()
-                },
-                'job_history': cleanup_history
-            }
-            
+            report = await self.report_service.generate_scheduler_report(start_date, end_date, lmt, offset)
             logger.info(f"Generated scheduler report for period: {start_date} to {end_date}")
             return report
             
@@ -363,19 +390,83 @@ class CleanupService:
             logger.info(f"Adjusted cleanup schedule to optimal hour: {optimal_hour}")
 
 class DiskSpaceMonitor:
-    def __init__(self, threshold_percent: float = 85.0):
+    def __init__(self,
+                 threshold_percent: float = 85.0,
+                 managed_paths: Optional[Dict[str, Path]] = None,
+                 forecast_horizon: timedelta = timedelta(hours=6),
+                 preemptive_cooldown: timedelta = timedelta(hours=3),
+                 preemptive_batch_size: int = 500,
+                 recovery_margin: float = 5.0,
+                 emergency_keep_backups: int = 3,
+                 usage_scan_interval: timedelta = timedelta(hours=1)):
         self.threshold_percent = threshold_percent
         self.emergency_mode = False
+        self.forecaster = DiskUsageForecaster()
+        self.forecast_horizon = forecast_horizon
+        self.preemptive_cooldown = preemptive_cooldown
+        self.preemptive_batch_size = preemptive_batch_size
+        self.last_preemptive_cleanup: Optional[datetime] = None
+        self.recovery_margin = recovery_margin
+        self.emergency_keep_backups = emergency_keep_backups
+        self.managed_paths = managed_paths or {
+            'backups': Path("./backups"),
+            'logs': Path("./logs"),
+            'temp': Path("./temp")
+        }
+        self.path_usage: Dict[str, DirectoryUsage] = {}
+        self.path_usage_at: Optional[datetime] = None
+        self.usage_scan_interval = usage_scan_interval
+        self.bytes_reclaimed_total = 0
+        self.scan_progress: Dict[str, Dict[str, int]] = {}
 
     def get_disk_usage(self, path: str = "/") -> float:
         usage = shutil.disk_usage(path)
         return (usage.used / usage.total) * 100
 
+    def get_usage_report(self, path: str = "/") -> Dict[str, float]:
+        """Filesystem usage plus the last measured size of each managed path"""
+        usage = shutil.disk_usage(path)
+        report = {
+            'total': usage.total,
+            'used': usage.used,
+            'free': usage.free,
+            'percent': (usage.used / usage.total) * 100,
+            'reclaimed_bytes': self.bytes_reclaimed_total,
+            'growth_rate_per_hour': self.forecaster.growth_rate()
+        }
+        time_left = self.forecaster.time_to_threshold(self.threshold_percent)
+        if time_left is not None:
+            report['hours_to_threshold'] = time_left.total_seconds() / 3600
+        for name in self.managed_paths:
+            measured = self.path_usage.get(name)
+            report[f'{name}_bytes'] = measured.total_bytes if measured else 0
+        return report
+
+    def _progress(self, operation: str) -> Callable[[int, int], None]:
+        def report(processed: int, byte_count: int) -> None:
+            self.scan_progress[operation] = {'processed': processed, 'bytes': byte_count}
+            logger.debug(f"{operation}: {processed} entries, {byte_count} bytes")
+        return report
+
+    def _usage_stale(self) -> bool:
+        return self.path_usage_at is None or datetime.now() - self.path_usage_at >= self.usage_scan_interval
+
+    async def refresh_usage(self) -> Dict[str, DirectoryUsage]:
+        """Re-measure every managed path in a worker thread"""
+        for name, path in self.managed_paths.items():
+            self.path_usage[name] = await asyncio.to_thread(
+                scan_directory, path, progress=self._progress(f"scan:{name}")
+            )
+        self.path_usage_at = datetime.now()
+        return self.path_usage
+
     async def check_disk_space(self) -> None:
         try:
             usage_percent = self.get_disk_usage()
             logger.info(f"Current disk usage: {usage_percent:.2f}%")
+            self.forecaster.add_sample(usage_percent)
 
+            # Decide on statvfs alone; the directory scan only feeds the usage breakdown
             if usage_percent > self.threshold_percent:
                 if not self.emergency_mode:
                     logger.warning(f"Disk usage critical ({usage_percent:.2f}%), initiating emergency cleanup")
@@ -383,99 +474,191 @@ class DiskSpaceMonitor:
                     await self.perform_emergency_cleanup()
             else:
                 self.emergency_mode = False
+                self.schedule_preemptive_cleanup()
+                if self._usage_stale():
+                    await self.refresh_usage()
 
         except Exception as e:
             logger.error(f"Disk space check failed: {str(e)}", exc_info=True)
 
-    async def perform_emergency_cleanup(self) -> None:
-        try:
-            # 1. Clear old log files
-            await self.cleanup_old_logs(days=2)
-
-            # 2. Aggressive database cleanup
-            config = CleanupConfig(
-                retention_days=7,
-                batch_size=5000,
-                optimize_db=True,
-                backup_first=False  # Skip backup in emergency mode
-            )
-            await cleanup_service.cleanup_old_records(config)
+    def schedule_preemptive_cleanup(self) -> bool:
+        """
+        Schedule a normal, throttled cleanup when the usage trend projects
+        crossing the threshold within the forecast horizon.
 
-            # 3. Clear temporary files
-            temp_files_removed = await self.cleanup_temp_files()
+        Returns:
+            True if a cleanup was scheduled
+        """
+        time_left = self.forecaster.time_to_threshold(self.threshold_percent)
+        now = datetime.now()
+        if not preemptive_cleanup_due(time_left, self.forecast_horizon,
+                                      self.last_preemptive_cleanup, self.preemptive_cooldown, now):
+            return False
+
+        logger.warning(
+            f"Disk usage growing {self.forecaster.growth_rate():.2f}%/h, projected to reach "
+            f"{self.threshold_percent}% in {time_left}; scheduling pre-emptive cleanup"
+        )
+        config = CleanupConfig(
+            retention_days=30,
+            optimize_db=False,
+            backup_first=True,
+            max_batch_size=self.preemptive_batch_size
+        )
+        cleanup_service.scheduler.add_job(
+            lambda: asyncio.run(cleanup_service.cleanup_old_records(config)),
+            'date',
+            run_date=now + timedelta(minutes=1),
+            id='preemptive_cleanup',
+            replace_existing=True
+        )
+        self.last_preemptive_cleanup = now
+        return True
 
-            # 4. Send emergency notification
-            await self.send_emergency_report(temp_files_removed)
+    def bytes_to_free(self, path: str = "/") -> int:
+        """Bytes that must be freed to get back below threshold minus the recovery margin"""
+        usage = shutil.disk_usage(path)
+        target_used = usage.total * (self.threshold_percent - self.recovery_margin) / 100
+        return max(0, int(usage.used - target_used))
+
+    def _escalation_stages(self) -> List[EscalationStage]:
+        """Emergency actions ordered from cheapest and least destructive to most"""
+        return [
+            ('temp_files', self._stage_temp_files),
+            ('compress_logs', self._stage_compress_logs),
+            ('prune_backups', self._stage_prune_backups),
+            ('delete_old_logs', self._stage_delete_old_logs),
+            ('database_archival', self._stage_database_archival)
+        ]
 
+    async def perform_emergency_cleanup(self) -> None:
+        """
+        Free space in escalating stages until usage is back under threshold.
+
+        The byte budget is re-measured after every stage and escalation stops
+        as soon as it is met, so aggressive database archival only runs when
+        every file-level stage was not enough.
+        """
+        try:
+            await escalate(
+                self._escalation_stages(),
+                self.bytes_to_free,
+                self.get_disk_usage,
+                cleanup_service.email_service.send_admin_report
+            )
         except Exception as e:
             logger.error(f"Emergency cleanup failed: {str(e)}", exc_info=True)
 
-    async def cleanup_old_logs(self, days: int) -> List[str]:
-        removed_files = []
-        log_dir = Path("./logs")
-        if not log_dir.exists():
-            return removed_files
+    async def _stage_temp_files(self) -> int:
+        before = self.bytes_reclaimed_total
+        await self.cleanup_temp_files()
+        return self.bytes_reclaimed_total - before
+
+    async def _stage_compress_logs(self) -> int:
+        cutoff = (datetime.now() - timedelta(days=1)).timestamp()
+        result = await asyncio.to_thread(
+            compress_files,
+            self.managed_paths['logs'],
+            lambda entry, stat: entry.name.endswith('.log') and stat.st_mtime < cutoff,
+            progress=self._progress("emergency:compress_logs")
+        )
+        self._record_removal('logs', result)
+        return result.bytes_reclaimed
+
+    async def _stage_prune_backups(self) -> int:
+        # Ignore the GFS tiers and keep only the newest few backups
+        policy = RetentionPolicy(daily=0, weekly=0, monthly=0, keep_last=self.emergency_keep_backups)
+        pruned = await asyncio.to_thread(cleanup_service.backup_store.prune, policy)
+        self._record_removal('backups', RemovalResult(
+            files_removed=pruned.chunks_removed,
+            bytes_reclaimed=pruned.bytes_reclaimed
+        ))
+        return pruned.bytes_reclaimed
+
+    async def _stage_delete_old_logs(self) -> int:
+        before = self.bytes_reclaimed_total
+        await self.cleanup_old_logs(days=2)
+        return self.bytes_reclaimed_total - before
+
+    async def _stage_database_archival(self) -> int:
+        used_before = shutil.disk_usage("/").used
+        config = CleanupConfig(
+            retention_days=7,
+            batch_size=5000,
+            tune_batch_size=False,
+            optimize_db=True,
+            backup_first=False  # Skip backup in emergency mode
+        )
+        await cleanup_service.cleanup_old_records(config)
+        return max(0, used_before - shutil.disk_usage("/").used)
 
-        cutoff_date = datetime.now() - timedelta(days=days)
-        
-        for log_file in log_dir.glob("*.log"):
-            if log_file.stat().st_mtime < cutoff_date.timestamp():
-                log_file.unlink()
-                removed_files.append(log_file.name)
-                logger.info(f"Removed old log file: {log_file.name}")
+    def _record_removal(self, name: str, result: RemovalResult) -> None:
+        self.bytes_reclaimed_total += result.bytes_reclaimed
+        measured = self.path_usage.get(name)
+        if measured:
+            measured.total_bytes = max(0, measured.total_bytes - result.bytes_reclaimed)
+            measured.file_count = max(0, measured.file_count - result.files_removed)
 
-        return removed_files
+    async def cleanup_old_logs(self, days: int) -> List[str]:
+        log_dir = self.managed_paths['logs']
+        cutoff = (datetime.now() - timedelta(days=days)).timestamp()
+
+        result = await asyncio.to_thread(
+            remove_files,
+            log_dir,
+            lambda entry, stat: entry.name.endswith(('.log', '.log.gz')) and stat.st_mtime < cutoff,
+            progress=self._progress("cleanup:logs")
+        )
+        self._record_removal('logs', result)
+        logger.info(f"Removed {result.files_removed} old log files ({result.bytes_reclaimed} bytes)")
+        return result.removed
 
     async def cleanup_temp_files(self) -> int:
-        temp_dir = Path("./temp")
-        if not temp_dir.exists():
-            return 0
-
-        count = 0
-        for temp_file in temp_dir.glob("*"):
-            if temp_file.is_file():
-                temp_file.unlink()
-                count += 1
+        result = await asyncio.to_thread(
+            remove_files,
+            self.managed_paths['temp'],
+            lambda entry, stat: True,
+            progress=self._progress("cleanup:temp")
+        )
+        self._record_removal('temp', result)
+        logger.info(f"Removed {result.files_removed} temp files ({result.bytes_reclaimed} bytes)")
+        return result.files_removed
 
-        return count
+cleanup_service = CleanupService()
 
-    async def send_emergency_report(self, temp_files_removed: int):
-        current_usage = self.get_disk_usage()
-        report = {
-            'type': 'Emergency Cleanup Report',
-            'timestamp': datetime.now(),
-            'initial_disk_usage': f"{self.threshold_percent}%+",
-            'current_disk_usage': f"{current_usage:.2f}%",
-            'actions_taken': {
-                'temp_files_removed': temp_files_removed,
-                'aggressive_cleanup_performed': True,
-                'logs_cleaned': True
-            }
-        }
-        
-        await cleanup_service.email_service.send_admin_report(report)
+# Record how far behind schedule each job run starts
+cleanup_service.scheduler.add_listener(metrics.scheduler_lag_listener, EVENT_JOB_SUBMITTED)
 
-cleanup_service = CleanupService()
+# Send sampled traces and errors to Sentry when SENTRY_DSN is set
+init_tracing()
 
 # Run at 2 AM and 2 PM every day
 cleanup_service.scheduler.add_job(
-    lambda: cleanup_service.cleanup_old_records(
+    lambda: asyncio.run(cleanup_service.cleanup_old_records(
         CleanupConfig(retention_days=30, optimize_db=False)
-    ),
+    )),
     'cron',
     hour='2,14'
 )
 
 # Run every Monday and Thursday at 3 AM with optimization
 cleanup_service.scheduler.add_job(
-    lambda: cleanup_service.cleanup_old_records(
+    lambda: asyncio.run(cleanup_service.cleanup_old_records(
         CleanupConfig(retention_days=90, optimize_db=True, backup_first=True)
-    ),
+    )),
     'cron',
     day_of_week='mon,thu',
     hour=3
 )
 
+# Apply backup retention and collect unreferenced chunks daily at 4 AM
+cleanup_service.scheduler.add_job(
+    lambda: cleanup_service.backup_store.prune(cleanup_service.backup_retention),
+    'cron',
+    hour=4,
+    id='backup_pruner'
+)
+
 # Health check every 30 minutes
 cleanup_service.scheduler.add_job(
     lambda: logger.info(f"Health check: {cleanup_service.get_system_metrics()}"),
@@ -488,7 +671,7 @@ disk_monitor = DiskSpaceMonitor()
 
 # Add disk space monitoring job (every 15 minutes)
 cleanup_service.scheduler.add_job(
-    disk_monitor.check_disk_space,
+    lambda: asyncio.run(disk_monitor.check_disk_space()),
     'interval',
     minutes=15,
     id='disk_space_monitor'
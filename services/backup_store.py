@@ -0,0 +1,296 @@
+from datetime import datetime, timedelta
+from typing import Iterator, List, Optional, Set
+from contextlib import contextmanager
+from dataclasses import dataclass, field, asdict
+from pathlib import Path
+import fcntl
+import hashlib
+import json
+import logging
+import os
+import uuid
+import zlib
+
+logger = logging.getLogger(__name__)
+
+
+@dataclass
+class RetentionPolicy:
+    """
+    Grandfather-father-son retention: the newest backup of each of the last
+    ``daily`` days, ``weekly`` ISO weeks and ``monthly`` months is kept,
+    plus the ``keep_last`` most recent backups regardless of age.
+    """
+    daily: int = 7
+    weekly: int = 4
+    monthly: int = 6
+    keep_last: int = 1
+
+    @classmethod
+    def from_env(cls) -> 'RetentionPolicy':
+        """Build the policy from BACKUP_KEEP_DAILY, _WEEKLY, _MONTHLY and _LAST"""
+        return cls(
+            daily=int(os.getenv("BACKUP_KEEP_DAILY", "7")),
+            weekly=int(os.getenv("BACKUP_KEEP_WEEKLY", "4")),
+            monthly=int(os.getenv("BACKUP_KEEP_MONTHLY", "6")),
+            keep_last=int(os.getenv("BACKUP_KEEP_LAST", "1")),
+        )
+
+
+@dataclass
+class BackupManifest:
+    name: str
+    created_at: datetime
+    size: int
+    sha256: str
+    chunks: List[str]
+    compressed: bool
+    new_bytes: int = 0
+    reused_bytes: int = 0
+
+
+@dataclass
+class PruneResult:
+    manifests_removed: List[str] = field(default_factory=list)
+    chunks_removed: int = 0
+    staging_removed: int = 0
+    bytes_reclaimed: int = 0
+
+
+class BackupStore:
+    """
+    Content-addressed backup storage with cross-backup deduplication.
+
+    Dumps are split into content-defined chunks: once a chunk has reached
+    ``min_chunk`` bytes, a boundary falls after a line with probability
+    proportional to its length (decided by the line's CRC32), so chunks
+    average ``avg_chunk`` bytes whatever the line length and an insert or
+    delete only changes the chunks around it. Lines that would overflow
+    ``max_chunk`` are cut inside the line. Chunks are stored once by
+    SHA-256 and each backup is a manifest listing its chunks, so storage
+    grows with changed data rather than with the number of backups.
+
+    Ingests hold a shared lock on the store and pruning an exclusive one,
+    so chunks written or reused by an ingest whose manifest is not yet
+    written are never garbage-collected.
+    """
+
+    def __init__(self, root: Path = Path("./backups"), compress: bool = True,
+                 min_chunk: int = 256 * 1024, avg_chunk: int = 1024 * 1024,
+                 max_chunk: int = 8 * 1024 * 1024,
+                 staging_max_age: timedelta = timedelta(days=1)):
+        if not min_chunk < avg_chunk < max_chunk:
+            raise ValueError("Chunk sizes must satisfy min_chunk < avg_chunk < max_chunk")
+        self.root = root
+        self.compress = compress
+        self.min_chunk = min_chunk
+        self.max_chunk = max_chunk
+        # Past min_chunk each byte ends a chunk with probability 1/boundary_span,
+        # so the expected chunk size is min_chunk + boundary_span = avg_chunk
+        self.boundary_span = avg_chunk - min_chunk
+        self.staging_max_age = staging_max_age
+        self.chunk_dir = root / "chunks"
+        self.manifest_dir = root / "manifests"
+        self.staging_dir = root / "staging"
+        for directory in (self.chunk_dir, self.manifest_dir, self.staging_dir):
+            directory.mkdir(parents=True, exist_ok=True)
+        self.lock_path = root / ".lock"
+
+    @contextmanager
+    def _locked(self, operation: int):
+        """Hold an flock on the store; shared for ingest, exclusive for prune"""
+        with open(self.lock_path, "a") as lock_file:
+            fcntl.flock(lock_file, operation)
+            try:
+                yield
+            finally:
+                fcntl.flock(lock_file, fcntl.LOCK_UN)
+
+    def staging_path(self, filename: str) -> Path:
+        """Where a raw dump should be written before it is ingested"""
+        return self.staging_dir / filename
+
+    def _chunk_path(self, digest: str) -> Path:
+        return self.chunk_dir / digest[:2] / digest
+
+    def _split(self, path: Path) -> Iterator[bytes]:
+        buffer = bytearray()
+        with open(path, "rb") as f:
+            for line in f:
+                while len(buffer) + len(line) > self.max_chunk:
+                    # Very long lines (bulk COPY/INSERT rows) are cut so no chunk exceeds max_chunk
+                    take = self.max_chunk - len(buffer)
+                    buffer += line[:take]
+                    line = line[take:]
+                    yield bytes(buffer)
+                    buffer.clear()
+                buffer += line
+                size = len(buffer)
+                if size >= self.max_chunk or (
+                    size >= self.min_chunk and zlib.crc32(line) % self.boundary_span < len(line)
+                ):
+                    yield bytes(buffer)
+                    buffer.clear()
+        if buffer:
+            yield bytes(buffer)
+
+    def ingest(self, dump_file: Path, name: Optional[str] = None, remove_source: bool = True) -> BackupManifest:
+        """
+        Chunk a dump into the store and write its manifest.
+
+        Blocking; run in a worker thread from async code.
+        """
+        with self._locked(fcntl.LOCK_SH):
+            return self._ingest(dump_file, name or dump_file.stem, remove_source)
+
+    def _ingest(self, dump_file: Path, name: str, remove_source: bool) -> BackupManifest:
+        whole = hashlib.sha256()
+        digests: List[str] = []
+        size = new_bytes = reused_bytes = 0
+
+        for chunk in self._split(dump_file):
+            whole.update(chunk)
+            size += len(chunk)
+            digest = hashlib.sha256(chunk).hexdigest()
+            digests.append(digest)
+
+            chunk_path = self._chunk_path(digest)
+            if chunk_path.exists():
+                reused_bytes += len(chunk)
+                continue
+            chunk_path.parent.mkdir(exist_ok=True)
+            # Concurrent ingests may write the same new chunk; each needs its own temp file
+            temp_path = chunk_path.parent / f"{digest}.{os.getpid()}.{uuid.uuid4().hex}.tmp"
+            temp_path.write_bytes(zlib.compress(chunk, 1) if self.compress else chunk)
+            if chunk_path.exists():
+                temp_path.unlink()
+                reused_bytes += len(chunk)
+                continue
+            os.replace(temp_path, chunk_path)
+            new_bytes += len(chunk)
+
+        manifest = BackupManifest(
+            name=name,
+            created_at=datetime.fromtimestamp(dump_file.stat().st_mtime),
+            size=size,
+            sha256=whole.hexdigest(),
+            chunks=digests,
+            compressed=self.compress,
+            new_bytes=new_bytes,
+            reused_bytes=reused_bytes
+        )
+        self._write_manifest(manifest)
+        if remove_source:
+            dump_file.unlink()
+
+        logger.info(
+            f"Stored backup {name}: {size} bytes in {len(digests)} chunks, "
+            f"{new_bytes} new, {reused_bytes} deduplicated"
+        )
+        return manifest
+
+    def _write_manifest(self, manifest: BackupManifest) -> None:
+        data = asdict(manifest)
+        data['created_at'] = manifest.created_at.isoformat()
+        temp_path = self.manifest_dir / f"{manifest.name}.json.tmp"
+        temp_path.write_text(json.dumps(data))
+        os.replace(temp_path, self.manifest_dir / f"{manifest.name}.json")
+
+    def list_backups(self) -> List[BackupManifest]:
+        """All manifests, newest first"""
+        manifests = []
+        for path in self.manifest_dir.glob("*.json"):
+            data = json.loads(path.read_text())
+            data['created_at'] = datetime.fromisoformat(data['created_at'])
+            manifests.append(BackupManifest(**data))
+        return sorted(manifests, key=lambda m: m.created_at, reverse=True)
+
+    def _read_chunk(self, digest: str, compressed: bool) -> bytes:
+        data = self._chunk_path(digest).read_bytes()
+        return zlib.decompress(data) if compressed else data
+
+    def restore(self, name: str, destination: Path) -> Path:
+        """Reassemble a backup into ``destination`` and verify its checksum"""
+        manifest = next((m for m in self.list_backups() if m.name == name), None)
+        if manifest is None:
+            raise FileNotFoundError(f"Backup {name} not found")
+
+        whole = hashlib.sha256()
+        with open(destination, "wb") as f:
+            for digest in manifest.chunks:
+                chunk = self._read_chunk(digest, manifest.compressed)
+                whole.update(chunk)
+                f.write(chunk)
+        if whole.hexdigest() != manifest.sha256:
+            raise RuntimeError(f"Backup {name} failed checksum verification on restore")
+        return destination
+
+    @staticmethod
+    def select_retained(manifests: List[BackupManifest], policy: RetentionPolicy) -> Set[str]:
+        """Names of the backups the policy keeps"""
+        keep = {m.name for m in manifests[:policy.keep_last]}
+        buckets = (
+            (policy.daily, lambda m: m.created_at.date()),
+            (policy.weekly, lambda m: m.created_at.isocalendar()[:2]),
+            (policy.monthly, lambda m: (m.created_at.year, m.created_at.month)),
+        )
+        for limit, period_of in buckets:
+            seen = set()
+            for manifest in manifests:
+                period = period_of(manifest)
+                if period in seen:
+                    continue
+                if len(seen) >= limit:
+                    break
+                seen.add(period)
+                keep.add(manifest.name)
+        return keep
+
+    def prune(self, policy: Optional[RetentionPolicy] = None) -> PruneResult:
+        """
+        Drop backups outside the retention policy and garbage-collect chunks
+        no remaining backup references. Blocking; run in a worker thread.
+        """
+        with self._locked(fcntl.LOCK_EX):
+            return self._prune(policy or RetentionPolicy())
+
+    def _prune(self, policy: RetentionPolicy) -> PruneResult:
+        result = PruneResult()
+        manifests = self.list_backups()
+        keep = self.select_retained(manifests, policy)
+
+        referenced: Set[str] = set()
+        for manifest in manifests:
+            if manifest.name in keep:
+                referenced.update(manifest.chunks)
+            else:
+                (self.manifest_dir / f"{manifest.name}.json").unlink()
+                result.manifests_removed.append(manifest.name)
+
+        if result.manifests_removed:
+            with os.scandir(self.chunk_dir) as prefixes:
+                for prefix in prefixes:
+                    if not prefix.is_dir():
+                        continue
+                    with os.scandir(prefix.path) as chunks:
+                        for chunk in chunks:
+                            if chunk.name not in referenced:
+                                result.bytes_reclaimed += chunk.stat().st_size
+                                os.unlink(chunk.path)
+                                result.chunks_removed += 1
+
+        # Dumps left behind by failed verifications or crashed runs are never ingested
+        cutoff = (datetime.now() - self.staging_max_age).timestamp()
+        with os.scandir(self.staging_dir) as staged:
+            for entry in staged:
+                stat = entry.stat()
+                if entry.is_file() and stat.st_mtime < cutoff:
+                    result.bytes_reclaimed += stat.st_size
+                    os.unlink(entry.path)
+                    result.staging_removed += 1
+
+        logger.info(
+            f"Pruned {len(result.manifests_removed)} backups, {result.chunks_removed} chunks, "
+            f"{result.staging_removed} stale staged dumps, {result.bytes_reclaimed} bytes reclaimed"
+        )
+        return result
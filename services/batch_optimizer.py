@@ -4,6 +4,7 @@ import statistics
 import logging
 import psutil
 from dataclasses import dataclass
+from services.batch_tuner import BatchTuner
 
 logger = logging.getLogger(__name__)
 
@@ -21,22 +22,31 @@ class BatchOptimizer:
     """
     Optimizes batch size for cleanup operations based on system performance.
     Automatically adjusts batch size to maintain optimal throughput while avoiding system overload.
+    With a ``tuner``, batch sizes are chosen by online exploration (see BatchTuner)
+    instead of the +/-20% step rule.
     """
     
     def __init__(self, 
                  min_batch_size: int = 100,
                  max_batch_size: int = 10000,
                  target_duration: float = 300,  # 5 minutes
-                 max_memory_threshold: float = 80.0):
+                 max_memory_threshold: float = 80.0,
+                 tuner: Optional[BatchTuner] = None):
         self.min_batch_size = min_batch_size
         self.max_batch_size = max_batch_size
         self.target_duration = target_duration
         self.max_memory_threshold = max_memory_threshold
         self.performance_history: List[BatchMetrics] = []
         self.current_batch_size = 1000  # Default starting point
+        self.tuner = tuner
 
-    def record_batch_performance(self, metrics: Dict) -> None:
-        """Record performance metrics for a batch operation"""
+    def record_batch_performance(self, metrics: Dict, table: str = "default") -> None:
+        """
+        Record performance metrics for a batch operation.
+
+        ``peak_memory_usage`` and ``peak_cpu_usage``, when present, are used for
+        the tuner's safety limits instead of the usage at the start of the run.
+        """
         batch_metrics = BatchMetrics(
             batch_size=metrics['batch_size'],
             duration=metrics['duration_seconds'],
@@ -51,17 +61,40 @@ class BatchOptimizer:
         if len(self.performance_history) > 100:
             self.performance_history = self.performance_history[-100:]
 
-    def get_optimal_batch_size(self, current_memory_usage: float) -> int:
+        if self.tuner is not None:
+            self.tuner.record(
+                table,
+                batch_size=metrics['batch_size'],
+                duration_seconds=metrics['duration_seconds'],
+                records_processed=metrics['records_processed'],
+                memory_usage=metrics.get('peak_memory_usage', metrics['memory_usage']),
+                cpu_usage=metrics.get('peak_cpu_usage', metrics['cpu_usage']),
+                success=metrics['success']
+            )
+
+    def get_optimal_batch_size(self, current_memory_usage: float, current_cpu_usage: float = 0.0,
+                               table: str = "default") -> int:
         """
         Calculate optimal batch size based on recent performance history
         and current system conditions.
 
         Args:
             current_memory_usage: Current system memory usage percentage
+            current_cpu_usage: Current CPU usage percentage (used by the tuner)
+            table: Table being archived; the tuner learns each table separately
 
         Returns:
             Optimal batch size based on performance history and system load
         """
+        if self.tuner is not None:
+            new_batch_size = self.tuner.suggest(
+                table, current_memory_usage, current_cpu_usage, default=self.current_batch_size
+            )
+            if new_batch_size != self.current_batch_size:
+                logger.info(f"Batch tuner moved batch size from {self.current_batch_size} to {new_batch_size}")
+                self.current_batch_size = new_batch_size
+            return new_batch_size
+
         if not self.performance_history:
             return self.current_batch_size
 
@@ -103,7 +136,7 @@ class BatchOptimizer:
 
         return new_batch_size
 
-    def analyze_batch_performance(self) -> Dict:
+    def analyze_batch_performance(self, table: str = "default") -> Dict:
         """
         Analyze batch size performance patterns and generate recommendations.
         
@@ -112,6 +145,7 @@ class BatchOptimizer:
                 - optimal_batch_size: Best performing batch size
                 - batch_efficiency: Performance metrics for each batch size
                 - recommendations: List of suggested improvements
+                - tuning: The tuner's per-bucket model for ``table``, when tuning is enabled
         """
         if not self.performance_history:
             return {
@@ -136,24 +170,22 @@ class BatchOptimizer:
         # Calculate efficiency for each batch size
         batch_efficiency = {}
         for batch_size, metrics in batch_stats.items():
-            avg_duration = statistics.mean(m.duration for m in metrics)
-            avg_records_per_second = statistics.mean(m.records_per_second for m in metrics)
-            avg_memory = statistics.mean(m.memory_usage for m in metrics)
-            
-            # Calculate efficiency score
-            efficiency_score = (
-                avg_records_per_second * 0.5 +  # Prioritize throughput
-                (1 - avg_memory/100) * 0.3 +    # Lower memory usage is better
-                (self.target_duration/avg_duration) * 0.2  # Closer to target duration is better
-            )
-            
             batch_efficiency[batch_size] = {
-                "efficiency_score": efficiency_score,
-                "avg_duration": avg_duration,
-                "avg_records_per_second": avg_records_per_second,
-                "avg_memory_usage": avg_memory
+                "avg_duration": statistics.mean(m.duration for m in metrics),
+                "avg_records_per_second": statistics.mean(m.records_per_second for m in metrics),
+                "avg_memory_usage": statistics.mean(m.memory_usage for m in metrics)
             }
 
+        # Every term is in [0, 1] so raw records/sec can't drown out the others
+        best_throughput = max(e["avg_records_per_second"] for e in batch_efficiency.values())
+        for efficiency in batch_efficiency.values():
+            relative_throughput = efficiency["avg_records_per_second"] / best_throughput if best_throughput else 0.0
+            efficiency["efficiency_score"] = (
+                relative_throughput * 0.5 +  # Prioritize throughput
+                (1 - efficiency["avg_memory_usage"]/100) * 0.3 +    # Lower memory usage is better
+                min(1.0, self.target_duration/efficiency["avg_duration"]) * 0.2  # Finishing within the target is better
+            )
+
         # Find optimal batch size
         optimal_batch_size = max(
             batch_efficiency.items(),
@@ -168,8 +200,11 @@ class BatchOptimizer:
                 f"for optimal performance"
             )
 
-        return {
+        analysis = {
             "optimal_batch_size": optimal_batch_size,
             "batch_efficiency": batch_efficiency,
             "recommendations": recommendations
-        } 
\ No newline at end of file
+        }
+        if self.tuner is not None:
+            analysis["tuning"] = self.tuner.summary(table)
+        return analysis 
\ No newline at end of file
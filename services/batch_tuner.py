@@ -0,0 +1,254 @@
+from typing import Any, Dict, List, Optional
+from dataclasses import asdict, dataclass, field
+from pathlib import Path
+import json
+import logging
+import math
+import os
+import threading
+
+logger = logging.getLogger(__name__)
+
+
+def log_spaced_buckets(min_batch_size: int, max_batch_size: int, count: int) -> List[int]:
+    """``count`` batch sizes spaced evenly on a log scale, rounded to two significant digits"""
+    ratio = (max_batch_size / min_batch_size) ** (1 / max(1, count - 1))
+    buckets = []
+    for i in range(count):
+        raw = min_batch_size * ratio ** i
+        digits = max(0, int(math.floor(math.log10(raw))) - 1)
+        size = int(round(raw / 10 ** digits) * 10 ** digits)
+        size = max(min_batch_size, min(max_batch_size, size))
+        if not buckets or size > buckets[-1]:
+            buckets.append(size)
+    return buckets
+
+
+@dataclass
+class TuningObjective:
+    """
+    Weights and limits for scoring a batch size. Every term is in [0, 1]:
+    throughput relative to the best bucket, memory headroom, and how well runs
+    fit the target duration.
+    """
+    throughput_weight: float = 0.7
+    memory_weight: float = 0.15
+    duration_weight: float = 0.15
+    target_duration: float = 300
+    max_memory: float = 80.0
+    max_cpu: float = 90.0
+    max_violation_rate: float = 0.2
+    min_exclusion_pulls: float = 1.5
+
+
+@dataclass
+class BucketStats:
+    """Discounted sums for one batch-size bucket; older observations fade out"""
+    pulls: float = 0.0
+    throughput: float = 0.0
+    memory: float = 0.0
+    duration_score: float = 0.0
+    violations: float = 0.0
+
+    def discount(self, factor: float, violation_factor: float) -> None:
+        self.pulls *= factor
+        self.throughput *= factor
+        self.memory *= factor
+        self.duration_score *= factor
+        self.violations *= violation_factor
+
+    def mean(self, name: str) -> float:
+        return getattr(self, name) / self.pulls if self.pulls else 0.0
+
+
+@dataclass
+class _TableModel:
+    buckets: Dict[int, BucketStats] = field(default_factory=dict)
+    observations: int = 0
+
+
+class BatchTuner:
+    """
+    Online batch-size tuning with a UCB bandit over log-spaced buckets.
+
+    Each table keeps its own model. ``suggest`` tries every bucket once,
+    starting next to the best known size, and then picks the bucket with the
+    highest upper confidence bound on its normalized score. Any bucket whose
+    runs failed or breached the memory/CPU limits too often, over at least
+    ``min_exclusion_pulls`` recent runs, is excluded together with every larger
+    bucket. Violations fade faster than pulls (``violation_discount``), so an
+    exclusion expires and the bucket is probed again; one bad run cannot cap
+    the batch size for good. Under memory or CPU pressure the tuner stops
+    exploring and steps below the best known size. Statistics are discounted
+    on every observation so the model follows shifts in data volume, and are
+    saved to ``state_file`` so learning survives restarts.
+    """
+
+    def __init__(self,
+                 min_batch_size: int = 100,
+                 max_batch_size: int = 10000,
+                 bucket_count: int = 12,
+                 exploration: float = 0.3,
+                 discount: float = 0.98,
+                 violation_discount: float = 0.95,
+                 objective: Optional[TuningObjective] = None,
+                 state_file: Optional[str] = "batch_tuner.json"):
+        self.buckets = log_spaced_buckets(min_batch_size, max_batch_size, bucket_count)
+        self.exploration = exploration
+        self.discount = discount
+        self.violation_discount = violation_discount
+        self.objective = objective or TuningObjective()
+        self.state_file = Path(state_file) if state_file else None
+        self._lock = threading.Lock()
+        self._tables: Dict[str, _TableModel] = {}
+        self._load()
+
+    def _model(self, table: str) -> _TableModel:
+        model = self._tables.get(table)
+        if model is None:
+            model = self._tables[table] = _TableModel({size: BucketStats() for size in self.buckets})
+        return model
+
+    def bucket_for(self, batch_size: int) -> int:
+        """The bucket nearest to ``batch_size`` on a log scale"""
+        return min(self.buckets, key=lambda size: abs(math.log(size) - math.log(max(1, batch_size))))
+
+    def record(self, table: str, batch_size: int, duration_seconds: float, records_processed: int,
+               memory_usage: float, cpu_usage: float, success: bool) -> None:
+        """Add one run's outcome to the table's model and persist it"""
+        objective = self.objective
+        violated = not success or memory_usage > objective.max_memory or cpu_usage > objective.max_cpu
+        throughput = records_processed / duration_seconds if success and duration_seconds > 0 else 0.0
+        duration_score = min(1.0, objective.target_duration / duration_seconds) if duration_seconds > 0 else 1.0
+
+        with self._lock:
+            model = self._model(table)
+            for stats in model.buckets.values():
+                stats.discount(self.discount, self.violation_discount)
+            stats = model.buckets[self.bucket_for(batch_size)]
+            stats.pulls += 1
+            stats.throughput += throughput
+            stats.memory += min(100.0, max(0.0, memory_usage))
+            stats.duration_score += duration_score if success else 0.0
+            stats.violations += 1 if violated else 0
+            model.observations += 1
+            self._save()
+
+    def _safe_buckets(self, model: _TableModel) -> List[int]:
+        safe = []
+        for size in self.buckets:
+            stats = model.buckets[size]
+            if (stats.pulls >= self.objective.min_exclusion_pulls
+                    and stats.violations / stats.pulls > self.objective.max_violation_rate):
+                break  # larger batches only use more memory
+            safe.append(size)
+        return safe or self.buckets[:1]
+
+    def _scores(self, model: _TableModel, sizes: List[int]) -> Dict[int, float]:
+        """Normalized mean score of each tried bucket in ``sizes``"""
+        tried = [size for size in sizes if model.buckets[size].pulls]
+        best_throughput = max((model.buckets[s].mean('throughput') for s in tried), default=0.0)
+        objective = self.objective
+        scores = {}
+        for size in tried:
+            stats = model.buckets[size]
+            throughput = stats.mean('throughput') / best_throughput if best_throughput else 0.0
+            scores[size] = (
+                objective.throughput_weight * throughput
+                + objective.memory_weight * (1 - stats.mean('memory') / 100)
+                + objective.duration_weight * stats.mean('duration_score')
+            )
+        return scores
+
+    def best(self, table: str) -> Optional[int]:
+        """The safe bucket with the best mean score, or None before any observations"""
+        with self._lock:
+            model = self._tables.get(table)
+            if model is None:
+                return None
+            scores = self._scores(model, self._safe_buckets(model))
+            return max(scores, key=scores.get) if scores else None
+
+    def suggest(self, table: str, memory_usage: float, cpu_usage: float = 0.0,
+                default: int = 1000) -> int:
+        """Batch size for the next run of ``table`` given current system load"""
+        best = self.best(table)
+        with self._lock:
+            model = self._model(table)
+            safe = self._safe_buckets(model)
+            anchor = best or self.bucket_for(default)
+
+            if memory_usage > self.objective.max_memory or cpu_usage > self.objective.max_cpu:
+                smaller = [size for size in safe if size < anchor]
+                return smaller[-1] if smaller else safe[0]
+
+            untried = [size for size in safe if not model.buckets[size].pulls]
+            if untried:
+                return min(untried, key=lambda size: abs(math.log(size) - math.log(anchor)))
+
+            scores = self._scores(model, safe)
+            total = sum(model.buckets[size].pulls for size in safe)
+            return max(safe, key=lambda size: scores[size] + self.exploration * math.sqrt(
+                2 * math.log(max(total, 1.0)) / model.buckets[size].pulls
+            ))
+
+    def summary(self, table: str) -> Dict[str, Any]:
+        """Per-bucket statistics for reports and the monitor API"""
+        best = self.best(table)
+        with self._lock:
+            model = self._model(table)
+            safe = set(self._safe_buckets(model))
+            scores = self._scores(model, self.buckets)
+            return {
+                'best_batch_size': best,
+                'observations': model.observations,
+                'buckets': {
+                    size: {
+                        'pulls': round(stats.pulls, 3),
+                        'records_per_second': stats.mean('throughput'),
+                        'avg_memory_usage': stats.mean('memory'),
+                        'score': scores.get(size),
+                        'safe': size in safe,
+                    }
+                    for size, stats in model.buckets.items()
+                },
+            }
+
+    def _load(self) -> None:
+        if self.state_file is None or not self.state_file.exists():
+            return
+        try:
+            with open(self.state_file) as f:
+                state = json.load(f)
+        except (OSError, ValueError) as e:
+            logger.error(f"Failed to load batch tuner state from {self.state_file}: {str(e)}")
+            return
+        if state.get('buckets') != self.buckets:
+            logger.warning("Batch tuner buckets changed since the state was saved; starting fresh")
+            return
+        for table, saved in state.get('tables', {}).items():
+            self._tables[table] = _TableModel(
+                buckets={int(size): BucketStats(**stats) for size, stats in saved['buckets'].items()},
+                observations=saved.get('observations', 0),
+            )
+
+    def _save(self) -> None:
+        if self.state_file is None:
+            return
+        state = {
+            'buckets': self.buckets,
+            'tables': {
+                table: {
+                    'observations': model.observations,
+                    'buckets': {str(size): asdict(stats) for size, stats in model.buckets.items()},
+                }
+                for table, model in self._tables.items()
+            },
+        }
+        try:
+            temporary = self.state_file.with_suffix(self.state_file.suffix + '.tmp')
+            with open(temporary, 'w') as f:
+                json.dump(state, f)
+            os.replace(temporary, self.state_file)
+        except OSError as e:
+            logger.error(f"Failed to save batch tuner state to {self.state_file}: {str(e)}")
@@ -0,0 +1,200 @@
+from typing import Any, Dict, Optional
+import logging
+import os
+import threading
+import time
+from sqlalchemy import create_engine, event
+from sqlalchemy.engine import Engine
+from sqlalchemy.exc import TimeoutError as PoolTimeoutError
+from sqlalchemy.pool import NullPool, QueuePool, StaticPool
+
+logger = logging.getLogger(__name__)
+
+
+def pool_settings() -> Dict[str, Any]:
+    """Per-process pool sizing, shared with Django's settings"""
+    return {
+        'mode': os.getenv("DB_POOL_MODE", "persistent"),
+        'pool_size': int(os.getenv("DB_POOL_SIZE", "5")),
+        'max_overflow': int(os.getenv("DB_MAX_OVERFLOW", "10")),
+        'pool_timeout': float(os.getenv("DB_POOL_TIMEOUT", "30")),
+        'pool_recycle': int(os.getenv("DB_POOL_RECYCLE", "1800")),
+    }
+
+
+class PoolMetrics:
+    """Checkout counts, wait times and connection churn for one engine"""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self.checkouts = 0
+        self.checked_out = 0
+        self.peak_checked_out = 0
+        self.connects = 0
+        self.invalidations = 0
+        self.timeouts = 0
+        self.wait_seconds_total = 0.0
+        self.wait_seconds_max = 0.0
+
+    def record_wait(self, seconds: float, timed_out: bool = False) -> None:
+        with self._lock:
+            self.wait_seconds_total += seconds
+            self.wait_seconds_max = max(self.wait_seconds_max, seconds)
+            if timed_out:
+                self.timeouts += 1
+
+    def on_checkout(self, *args) -> None:
+        with self._lock:
+            self.checkouts += 1
+            self.checked_out += 1
+            self.peak_checked_out = max(self.peak_checked_out, self.checked_out)
+
+    def on_checkin(self, *args) -> None:
+        with self._lock:
+            self.checked_out = max(0, self.checked_out - 1)
+
+    def on_connect(self, *args) -> None:
+        with self._lock:
+            self.connects += 1
+
+    def on_invalidate(self, *args) -> None:
+        with self._lock:
+            self.invalidations += 1
+
+    def snapshot(self) -> Dict[str, float]:
+        with self._lock:
+            return {
+                'checkouts': self.checkouts,
+                'checked_out': self.checked_out,
+                'peak_checked_out': self.peak_checked_out,
+                'connects': self.connects,
+                'invalidations': self.invalidations,
+                'timeouts': self.timeouts,
+                'avg_wait_ms': self.wait_seconds_total / self.checkouts * 1000 if self.checkouts else 0.0,
+                'max_wait_ms': self.wait_seconds_max * 1000,
+            }
+
+
+class InstrumentedQueuePool(QueuePool):
+    """QueuePool that records how long callers wait for a connection"""
+
+    metrics: Optional[PoolMetrics] = None
+
+    def _do_get(self):
+        started = time.perf_counter()
+        try:
+            connection = super()._do_get()
+        except PoolTimeoutError:
+            if self.metrics:
+                self.metrics.record_wait(time.perf_counter() - started, timed_out=True)
+            raise
+        if self.metrics:
+            self.metrics.record_wait(time.perf_counter() - started)
+        return connection
+
+
+def _is_memory_sqlite(url: str) -> bool:
+    return url.startswith("sqlite") and (":memory:" in url or url.rstrip("/").endswith(":"))
+
+
+_engines: Dict[str, Engine] = {}
+_metrics: Dict[str, PoolMetrics] = {}
+_engines_lock = threading.Lock()
+
+
+def get_engine(name: str, url: str, **overrides) -> Engine:
+    """
+    Process-wide pooled engine for ``url``.
+
+    Components asking for the same URL share one pool. Sizing comes from the
+    DB_POOL_* environment variables. In ``pgbouncer`` mode connections are not
+    pooled client-side, since pgbouncer already does that. In-memory SQLite
+    URLs name a private database per engine, so they are never shared.
+    ``overrides`` only apply when the pool is created; a warning is logged
+    if they are passed for a URL that already has one.
+    """
+    if _is_memory_sqlite(url):
+        # One shared connection keeps the in-memory database alive and visible to worker threads
+        return create_engine(url, poolclass=StaticPool, connect_args={'check_same_thread': False})
+
+    with _engines_lock:
+        if url in _engines:
+            engine = _engines[url]
+            if overrides:
+                logger.warning(
+                    f"Ignoring pool overrides {sorted(overrides)} from {name}: "
+                    f"a pool for {engine.url!r} already exists"
+                )
+            return engine
+
+        settings = {**pool_settings(), **overrides}
+        metrics = PoolMetrics()
+        options: Dict[str, Any] = {'pool_pre_ping': True}
+        if settings['mode'] == "pgbouncer" and not url.startswith("sqlite"):
+            options['poolclass'] = NullPool
+        else:
+            pool_class = type("InstrumentedQueuePool", (InstrumentedQueuePool,), {'metrics': metrics})
+            options.update(
+                poolclass=pool_class,
+                pool_size=settings['pool_size'],
+                max_overflow=settings['max_overflow'],
+                pool_timeout=settings['pool_timeout'],
+                pool_recycle=settings['pool_recycle'],
+            )
+
+        engine = create_engine(url, **options)
+        event.listen(engine, 'checkout', metrics.on_checkout)
+        event.listen(engine, 'checkin', metrics.on_checkin)
+        event.listen(engine, 'connect', metrics.on_connect)
+        event.listen(engine, 'invalidate', metrics.on_invalidate)
+
+        _engines[url] = engine
+        _metrics[url] = metrics
+        logger.info(f"Created {name} database pool ({engine.pool.__class__.__name__}) for {engine.url!r}")
+        return engine
+
+
+def pool_metrics() -> Dict[str, Dict[str, Any]]:
+    """Usage and wait metrics for every pool in this process, keyed by masked URL"""
+    with _engines_lock:
+        report = {}
+        for url, engine in _engines.items():
+            stats = _metrics[url].snapshot()
+            pool = engine.pool
+            if isinstance(pool, QueuePool):
+                stats.update(size=pool.size(), idle=pool.checkedin(), overflow=pool.overflow())
+            report[repr(engine.url)] = stats
+        return report
+
+
+def dispose_engine(url: str) -> None:
+    """Close the pool for ``url`` and forget it"""
+    with _engines_lock:
+        engine = _engines.pop(url, None)
+        _metrics.pop(url, None)
+    if engine is not None:
+        engine.dispose()
+
+
+def dispose_all() -> None:
+    """Close every pooled connection (call at shutdown)"""
+    with _engines_lock:
+        for engine in _engines.values():
+            engine.dispose()
+        _engines.clear()
+        _metrics.clear()
+
+
+def _after_fork_in_child() -> None:
+    """
+    Drop connections inherited from the parent without closing them, so the
+    child never shares a socket with the parent; it reconnects on next use.
+    """
+    global _engines_lock
+    _engines_lock = threading.Lock()
+    for engine in _engines.values():
+        engine.dispose(close=False)
+
+
+if hasattr(os, "register_at_fork"):
+    os.register_at_fork(after_in_child=_after_fork_in_child)
@@ -0,0 +1,76 @@
+from datetime import datetime, timedelta
+from typing import Deque, List, Optional, Tuple
+from collections import deque
+
+
+def fit_growth_rate(points: List[Tuple[float, float]]) -> float:
+    """Least-squares slope of (x, y) points, 0 when undetermined"""
+    if len(points) < 2:
+        return 0.0
+    n = len(points)
+    mean_x = sum(x for x, _ in points) / n
+    mean_y = sum(y for _, y in points) / n
+    var_x = sum((x - mean_x) ** 2 for x, _ in points)
+    if var_x == 0:
+        return 0.0
+    return sum((x - mean_x) * (y - mean_y) for x, y in points) / var_x
+
+
+class DiskUsageForecaster:
+    """
+    Keeps a rolling series of disk usage samples and projects when usage
+    will cross a threshold, using a linear fit over the sample window.
+    """
+
+    def __init__(self, window: timedelta = timedelta(hours=24),
+                 min_samples: int = 4, max_samples: int = 1000):
+        self.window = window
+        self.min_samples = min_samples
+        self.samples: Deque[Tuple[datetime, float]] = deque(maxlen=max_samples)
+
+    def add_sample(self, usage_percent: float, at: Optional[datetime] = None) -> None:
+        at = at or datetime.now()
+        self.samples.append((at, usage_percent))
+        cutoff = at - self.window
+        while self.samples and self.samples[0][0] < cutoff:
+            self.samples.popleft()
+
+    def growth_rate(self) -> float:
+        """Usage growth in percentage points per hour (0 with too few samples)"""
+        if len(self.samples) < self.min_samples:
+            return 0.0
+        origin = self.samples[0][0]
+        return fit_growth_rate([
+            ((at - origin).total_seconds() / 3600, usage) for at, usage in self.samples
+        ])
+
+    def time_to_threshold(self, threshold_percent: float) -> Optional[timedelta]:
+        """
+        Projected time until usage reaches the threshold.
+
+        Returns:
+            timedelta (zero if already above), or None if usage is not growing
+        """
+        if not self.samples:
+            return None
+        current = self.samples[-1][1]
+        if current >= threshold_percent:
+            return timedelta(0)
+        rate = self.growth_rate()
+        if rate <= 0:
+            return None
+        return timedelta(hours=(threshold_percent - current) / rate)
+
+
+def preemptive_cleanup_due(time_left: Optional[timedelta], horizon: timedelta,
+                           last_cleanup: Optional[datetime], cooldown: timedelta,
+                           now: datetime) -> bool:
+    """
+    Whether a throttled cleanup should be scheduled ahead of the threshold.
+
+    True when usage is projected to cross the threshold within ``horizon``
+    and no pre-emptive cleanup has run during the last ``cooldown``.
+    """
+    if time_left is None or time_left > horizon:
+        return False
+    return last_cleanup is None or now - last_cleanup >= cooldown
@@ -0,0 +1,165 @@
+from datetime import datetime
+from typing import Callable, List, Optional
+from dataclasses import dataclass, field
+from pathlib import Path
+import gzip
+import logging
+import os
+import shutil
+
+logger = logging.getLogger(__name__)
+
+# progress(entries_processed, bytes_seen) is called once per batch
+ProgressCallback = Callable[[int, int], None]
+
+
+@dataclass
+class DirectoryUsage:
+    """Space used by a managed directory"""
+    path: str
+    total_bytes: int = 0
+    file_count: int = 0
+    scanned_at: datetime = field(default_factory=datetime.now)
+
+
+@dataclass
+class RemovalResult:
+    """Outcome of a file removal pass"""
+    files_removed: int = 0
+    bytes_reclaimed: int = 0
+    removed: List[str] = field(default_factory=list)
+    errors: int = 0
+
+
+def _walk(root: Path):
+    """Yield (DirEntry, stat) for every regular file below root using os.scandir"""
+    stack = [str(root)]
+    while stack:
+        current = stack.pop()
+        try:
+            with os.scandir(current) as entries:
+                for entry in entries:
+                    try:
+                        if entry.is_dir(follow_symlinks=False):
+                            stack.append(entry.path)
+                        elif entry.is_file(follow_symlinks=False):
+                            yield entry, entry.stat(follow_symlinks=False)
+                    except OSError:
+                        continue
+        except OSError as e:
+            logger.warning(f"Cannot scan {current}: {str(e)}")
+
+
+def scan_directory(root: Path, batch_size: int = 5000,
+                   progress: Optional[ProgressCallback] = None) -> DirectoryUsage:
+    """
+    Measure the bytes and files under a directory.
+
+    Blocking; intended to run in a worker thread via asyncio.to_thread.
+    """
+    usage = DirectoryUsage(path=str(root))
+    if not root.exists():
+        return usage
+
+    for _, stat in _walk(root):
+        usage.total_bytes += stat.st_size
+        usage.file_count += 1
+        if progress and usage.file_count % batch_size == 0:
+            progress(usage.file_count, usage.total_bytes)
+
+    usage.scanned_at = datetime.now()
+    return usage
+
+
+def remove_files(root: Path,
+                 should_remove: Callable[[os.DirEntry, os.stat_result], bool],
+                 recursive: bool = False,
+                 batch_size: int = 5000,
+                 progress: Optional[ProgressCallback] = None,
+                 max_names: int = 1000) -> RemovalResult:
+    """
+    Remove files under root matching ``should_remove``.
+
+    Entries come from os.scandir, so each file is stat'ed at most once.
+    Only the first ``max_names`` removed names are kept in the result.
+    Blocking; intended to run in a worker thread via asyncio.to_thread.
+    """
+    result = RemovalResult()
+    if not root.exists():
+        return result
+
+    if recursive:
+        entries = _walk(root)
+    else:
+        entries = _top_level_files(root)
+
+    processed = 0
+    for entry, stat in entries:
+        processed += 1
+        if should_remove(entry, stat):
+            try:
+                os.unlink(entry.path)
+            except OSError as e:
+                result.errors += 1
+                logger.warning(f"Could not remove {entry.path}: {str(e)}")
+            else:
+                result.files_removed += 1
+                result.bytes_reclaimed += stat.st_size
+                if len(result.removed) < max_names:
+                    result.removed.append(entry.name)
+        if progress and processed % batch_size == 0:
+            progress(processed, result.bytes_reclaimed)
+
+    return result
+
+
+def _top_level_files(root: Path):
+    with os.scandir(root) as entries:
+        for entry in entries:
+            try:
+                if entry.is_file(follow_symlinks=False):
+                    yield entry, entry.stat(follow_symlinks=False)
+            except OSError:
+                continue
+
+
+def compress_files(root: Path,
+                   should_compress: Callable[[os.DirEntry, os.stat_result], bool],
+                   progress: Optional[ProgressCallback] = None,
+                   batch_size: int = 500) -> RemovalResult:
+    """
+    Gzip matching top-level files in place (``name`` -> ``name.gz``).
+
+    ``bytes_reclaimed`` is the size saved (original minus compressed);
+    modification times are preserved so age-based retention still applies.
+    Blocking; intended to run in a worker thread via asyncio.to_thread.
+    """
+    result = RemovalResult()
+    if not root.exists():
+        return result
+
+    processed = 0
+    for entry, stat in _top_level_files(root):
+        processed += 1
+        if entry.name.endswith('.gz') or not should_compress(entry, stat):
+            continue
+        target = entry.path + '.gz'
+        try:
+            with open(entry.path, 'rb') as source, gzip.open(target, 'wb') as destination:
+                shutil.copyfileobj(source, destination, 1024 * 1024)
+            os.utime(target, (stat.st_atime, stat.st_mtime))
+            os.unlink(entry.path)
+        except OSError as e:
+            result.errors += 1
+            logger.warning(f"Could not compress {entry.path}: {str(e)}")
+            if os.path.exists(target) and os.path.exists(entry.path):
+                os.unlink(target)
+            continue
+        result.files_removed += 1
+        result.bytes_reclaimed += max(0, stat.st_size - os.stat(target).st_size)
+        result.removed.append(entry.name)
+        if progress and processed % batch_size == 0:
+            progress(processed, result.bytes_reclaimed)
+
+    return result
+
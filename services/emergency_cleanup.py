@@ -0,0 +1,64 @@
+from datetime import datetime
+from typing import Any, Awaitable, Callable, Dict, List, Tuple
+import logging
+
+logger = logging.getLogger(__name__)
+
+# (name, action) where action returns the bytes it reclaimed
+EscalationStage = Tuple[str, Callable[[], Awaitable[int]]]
+
+
+async def escalate(stages: List[EscalationStage],
+                   bytes_to_free: Callable[[], int],
+                   disk_usage: Callable[[], float],
+                   send_report: Callable[[Dict[str, Any]], Awaitable[None]]) -> Dict[str, Any]:
+    """
+    Run emergency stages in order until the byte budget is met, then report.
+
+    The budget is re-measured before every stage, so later (more destructive)
+    stages only run when the earlier ones were not enough. A failing stage is
+    logged and recorded in the report; escalation carries on with the next one.
+
+    Returns:
+        The report sent to admins
+    """
+    initial_usage = disk_usage()
+    budget = bytes_to_free()
+    logger.warning(f"Emergency cleanup needs to free {budget} bytes")
+
+    results = []
+    for name, action in stages:
+        remaining = bytes_to_free()
+        if remaining <= 0:
+            break
+        stage_start = datetime.now()
+        result = {'stage': name, 'bytes_reclaimed': 0}
+        try:
+            result['bytes_reclaimed'] = await action()
+            logger.info(f"Emergency stage {name} reclaimed {result['bytes_reclaimed']} bytes "
+                        f"({remaining} still needed before it)")
+        except Exception as e:
+            result['error'] = str(e)
+            logger.error(f"Emergency stage {name} failed: {str(e)}", exc_info=True)
+        result['duration_seconds'] = (datetime.now() - stage_start).total_seconds()
+        result['disk_usage_after'] = disk_usage()
+        results.append(result)
+
+    report = {
+        'type': 'Emergency Cleanup Report',
+        'timestamp': datetime.now(),
+        'initial_disk_usage': f"{initial_usage:.2f}%",
+        'current_disk_usage': f"{disk_usage():.2f}%",
+        'bytes_to_free': budget,
+        'bytes_reclaimed': sum(stage['bytes_reclaimed'] for stage in results),
+        'budget_met': bytes_to_free() <= 0,
+        'actions_taken': {
+            stage['stage']: (
+                f"failed after {stage['duration_seconds']:.1f}s: {stage['error']}" if 'error' in stage
+                else f"{stage['bytes_reclaimed']} bytes in {stage['duration_seconds']:.1f}s"
+            )
+            for stage in results
+        }
+    }
+    await send_report(report)
+    return report
@@ -0,0 +1,85 @@
+from typing import Optional, Tuple
+import os
+import time
+from prometheus_client import (
+    CONTENT_TYPE_LATEST, REGISTRY, CollectorRegistry, Counter, Gauge, Histogram, generate_latest, multiprocess
+)
+
+# Metric values live in mmap'd files under PROMETHEUS_MULTIPROC_DIR when it is set
+# (it must be set before this module is imported), so every uvicorn/gunicorn worker
+# and the scheduler process report into one scrape.
+MULTIPROCESS = bool(os.getenv("PROMETHEUS_MULTIPROC_DIR"))
+
+PHASE_BUCKETS = (0.1, 0.5, 1, 5, 15, 30, 60, 120, 300, 600, 1800, 3600)
+LATENCY_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1, 2.5, 5, 10)
+LAG_BUCKETS = (0.01, 0.1, 0.5, 1, 5, 15, 60, 300)
+
+CLEANUP_PHASE_SECONDS = Histogram(
+    'cleanup_phase_duration_seconds', 'Duration of each cleanup job phase', ['phase'], buckets=PHASE_BUCKETS
+)
+CLEANUP_RUNS = Counter('cleanup_runs_total', 'Cleanup job runs by outcome', ['status'])
+RECORDS_ARCHIVED = Counter('cleanup_records_archived_total', 'Records archived by cleanup jobs')
+ARCHIVE_RATE = Gauge(
+    'cleanup_archive_rows_per_second', 'Archive throughput of the most recent cleanup run',
+    multiprocess_mode='mostrecent'
+)
+BATCH_SIZE = Gauge('cleanup_batch_size', 'Batch size chosen for the current cleanup run', multiprocess_mode='mostrecent')
+BACKUP_BYTES = Counter('backup_bytes_total', 'Bytes written by database backups')
+BACKUP_THROUGHPUT = Gauge(
+    'backup_throughput_bytes_per_second', 'Write throughput of the most recent backup', multiprocess_mode='mostrecent'
+)
+BACKUP_VERIFY_SECONDS = Histogram(
+    'backup_verification_duration_seconds', 'Time spent verifying backup integrity', buckets=PHASE_BUCKETS
+)
+SCHEDULER_LAG_SECONDS = Histogram(
+    'scheduler_job_lag_seconds', 'Delay between a job\'s scheduled run time and its submission', ['job'],
+    buckets=LAG_BUCKETS
+)
+HTTP_REQUEST_SECONDS = Histogram(
+    'http_request_duration_seconds', 'API request latency by route', ['method', 'route', 'status'],
+    buckets=LATENCY_BUCKETS
+)
+HASH_QUEUE_DEPTH = Gauge(
+    'auth_hash_queue_depth', 'Password hashes waiting for or running on the hash pool', multiprocess_mode='livesum'
+)
+HASH_REJECTED = Counter('auth_hash_rejected_total', 'Password hashes rejected because the pool queue was full')
+
+
+def observe_phase(phase: str, seconds: float) -> None:
+    CLEANUP_PHASE_SECONDS.labels(phase=phase).observe(seconds)
+    if phase == 'verify':
+        BACKUP_VERIFY_SECONDS.observe(seconds)
+
+
+def observe_archive(records: int, seconds: float) -> None:
+    RECORDS_ARCHIVED.inc(records)
+    if seconds > 0:
+        ARCHIVE_RATE.set(records / seconds)
+
+
+def observe_backup(size_bytes: int, seconds: float) -> None:
+    BACKUP_BYTES.inc(size_bytes)
+    if seconds > 0:
+        BACKUP_THROUGHPUT.set(size_bytes / seconds)
+
+
+def observe_request(method: str, route: str, status: int, seconds: float) -> None:
+    HTTP_REQUEST_SECONDS.labels(method=method, route=route, status=str(status)).observe(seconds)
+
+
+def scheduler_lag_listener(event) -> None:
+    """APScheduler EVENT_JOB_SUBMITTED listener recording how late each run started"""
+    now = time.time()
+    for scheduled in getattr(event, 'scheduled_run_times', None) or []:
+        SCHEDULER_LAG_SECONDS.labels(job=event.job_id).observe(max(0.0, now - scheduled.timestamp()))
+
+
+def render_latest(registry: Optional[CollectorRegistry] = None) -> Tuple[bytes, str]:
+    """Exposition body and content type for a scrape, aggregated across processes in multiprocess mode"""
+    if registry is None:
+        if MULTIPROCESS:
+            registry = CollectorRegistry()
+            multiprocess.MultiProcessCollector(registry)
+        else:
+            registry = REGISTRY
+    return generate_latest(registry), CONTENT_TYPE_LATEST
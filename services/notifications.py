@@ -0,0 +1,412 @@
+from datetime import datetime
+from email.message import EmailMessage
+from typing import Any, Dict, List, Optional, Tuple
+from dataclasses import dataclass, field
+import asyncio
+import logging
+import os
+import queue
+import smtplib
+import threading
+import time
+import requests
+from models.settings import EmailConfig, NotificationSettings
+
+logger = logging.getLogger(__name__)
+
+
+@dataclass
+class OutboundEmail:
+    recipients: List[str]
+    subject: str
+    body: str
+    attachments: List[Tuple[str, bytes, str]] = field(default_factory=list)
+
+
+@dataclass
+class _Digest:
+    """Alerts with the same subject collected while a digest window is open"""
+    opened_at: float
+    messages: List[str] = field(default_factory=list)
+
+
+class SMTPConnectionPool:
+    """
+    Thread-safe pool of persistent SMTP connections.
+    Connections are reused across messages and health-checked with NOOP
+    when they have been idle for longer than ``idle_check_seconds``.
+    """
+
+    def __init__(self, config: EmailConfig, size: int = 2, timeout: float = 30,
+                 use_tls: bool = False, idle_check_seconds: float = 30):
+        self.config = config
+        self.size = size
+        self.timeout = timeout
+        self.use_tls = use_tls
+        self.idle_check_seconds = idle_check_seconds
+        self._idle: "queue.LifoQueue[Tuple[smtplib.SMTP, float]]" = queue.LifoQueue()
+        self._slots = threading.BoundedSemaphore(size)
+
+    def _connect(self) -> smtplib.SMTP:
+        connection = smtplib.SMTP(self.config.smtp_host, self.config.smtp_port, timeout=self.timeout)
+        if self.use_tls:
+            connection.starttls()
+        if self.config.username:
+            connection.login(self.config.username, self.config.password)
+        return connection
+
+    def acquire(self) -> smtplib.SMTP:
+        self._slots.acquire()
+        try:
+            while True:
+                try:
+                    connection, last_used = self._idle.get_nowait()
+                except queue.Empty:
+                    return self._connect()
+                if time.monotonic() - last_used < self.idle_check_seconds:
+                    return connection
+                try:
+                    if connection.noop()[0] == 250:
+                        return connection
+                except smtplib.SMTPException:
+                    pass
+                self._discard(connection)
+        except Exception:
+            self._slots.release()
+            raise
+
+    def release(self, connection: smtplib.SMTP, broken: bool = False) -> None:
+        if broken:
+            self._discard(connection)
+        else:
+            self._idle.put((connection, time.monotonic()))
+        self._slots.release()
+
+    @staticmethod
+    def _discard(connection: smtplib.SMTP) -> None:
+        try:
+            connection.quit()
+        except Exception:
+            connection.close()
+
+    def close(self) -> None:
+        while True:
+            try:
+                connection, _ = self._idle.get_nowait()
+            except queue.Empty:
+                return
+            self._discard(connection)
+
+
+class EmailService:
+    """
+    Asynchronous notification delivery.
+
+    Messages are put on an outbound queue and delivered by background workers
+    over pooled SMTP connections, so callers never wait on the mail server.
+    The queue, workers and digest timers run on a dedicated delivery thread
+    with its own event loop, so they outlive the loop of whichever caller
+    sent first (scheduler jobs each run in their own ``asyncio.run``).
+    Repeated alerts with the same subject inside ``digest_window`` seconds are
+    collapsed into a single digest, and Slack/Teams webhooks are posted
+    from the same queue.
+    """
+
+    def __init__(self,
+                 email_config: Optional[EmailConfig] = None,
+                 notification_settings: Optional[NotificationSettings] = None,
+                 pool_size: int = 2,
+                 batch_size: int = 20,
+                 digest_window: float = 300,
+                 max_attempts: int = 3,
+                 use_tls: Optional[bool] = None):
+        self.pool_size = pool_size
+        self.batch_size = batch_size
+        self.digest_window = digest_window
+        self.max_attempts = max_attempts
+        self.use_tls = use_tls if use_tls is not None else os.getenv("SMTP_USE_TLS", "False") == "True"
+        self.stats = {'queued': 0, 'sent': 0, 'failed': 0, 'digested': 0, 'webhooks_sent': 0, 'webhooks_failed': 0}
+        self._stats_lock = threading.Lock()
+        self._loop: Optional[asyncio.AbstractEventLoop] = None
+        self._thread: Optional[threading.Thread] = None
+        self._loop_lock = threading.Lock()
+        self._queue: Optional[asyncio.Queue] = None
+        self._workers: List[asyncio.Task] = []
+        self._digests: Dict[str, _Digest] = {}
+        self._digest_lock = threading.Lock()
+        self._http = requests.Session()
+        self.pool: Optional[SMTPConnectionPool] = None
+        self.configure(email_config or self._config_from_env(), notification_settings or self._notifications_from_env())
+
+    @staticmethod
+    def _config_from_env() -> EmailConfig:
+        host = os.getenv("SMTP_HOST", "")
+        return EmailConfig(
+            enabled=bool(host),
+            smtp_host=host,
+            smtp_port=int(os.getenv("SMTP_PORT", "25")),
+            username=os.getenv("SMTP_USERNAME", ""),
+            password=os.getenv("SMTP_PASSWORD", ""),
+            from_address=os.getenv("SMTP_FROM", "scheduler@localhost.localdomain"),
+            admin_emails=[e for e in os.getenv("ADMIN_EMAILS", "").split(",") if e]
+        )
+
+    @staticmethod
+    def _notifications_from_env() -> NotificationSettings:
+        return NotificationSettings(
+            slack_webhook=os.getenv("SLACK_WEBHOOK_URL") or None,
+            teams_webhook=os.getenv("TEAMS_WEBHOOK_URL") or None
+        )
+
+    def configure(self, email_config: EmailConfig, notification_settings: NotificationSettings) -> None:
+        """Apply new delivery settings; idle connections to the old server are closed"""
+        if self.pool is not None:
+            self.pool.close()
+        self.email_config = email_config
+        self.notification_settings = notification_settings
+        self.pool = SMTPConnectionPool(email_config, size=self.pool_size, use_tls=self.use_tls)
+
+    async def send_admin_report(self, report_data: Dict[str, Any]) -> None:
+        """Queue a report email to the configured admin addresses"""
+        subject = f"{report_data.get('job_type') or report_data.get('type', 'Scheduler Report')} - {report_data.get('status', 'REPORT')}"
+        self._enqueue(OutboundEmail(
+            recipients=list(self.email_config.admin_emails),
+            subject=subject,
+            body=_format_report(report_data)
+        ))
+
+    async def send_report(self, recipients: List[str], subject: str, body: str,
+                          attachment: Optional[Tuple[str, bytes, str]] = None) -> None:
+        """Queue one message to a batch of recipients (sent as Bcc)"""
+        self._enqueue(OutboundEmail(
+            recipients=list(recipients),
+            subject=subject,
+            body=body,
+            attachments=[attachment] if attachment else []
+        ))
+
+    async def send_alert(self, subject: str, message: str) -> None:
+        """
+        Send an alert to admins and configured webhooks.
+
+        The first alert for a subject goes out immediately; repeats within the
+        digest window are collected and sent as one digest when it closes.
+        """
+        with self._digest_lock:
+            digest = self._digests.get(subject)
+            if digest is not None:
+                digest.messages.append(f"[{datetime.now():%Y-%m-%d %H:%M:%S}] {message}")
+                self._count('digested')
+                return
+            self._digests[subject] = _Digest(opened_at=time.monotonic())
+
+        # The timer lives on the delivery loop so the digest still goes out
+        # after the caller's loop has finished
+        loop = self._ensure_loop()
+        loop.call_soon_threadsafe(loop.call_later, self.digest_window, self._flush_digest, subject)
+        self._dispatch_alert(f"ALERT: {subject}", message)
+
+    def _flush_digest(self, subject: str) -> None:
+        with self._digest_lock:
+            digest = self._digests.pop(subject, None)
+        if digest is None or not digest.messages:
+            return
+        self._dispatch_alert(
+            f"ALERT: {subject} ({len(digest.messages)} more in the last {int(self.digest_window)}s)",
+            "\n".join(digest.messages)
+        )
+
+    def _dispatch_alert(self, subject: str, message: str) -> None:
+        if self.notification_settings.email_on_failure:
+            self._enqueue(OutboundEmail(recipients=list(self.email_config.admin_emails), subject=subject, body=message))
+        for url in (self.notification_settings.slack_webhook, self.notification_settings.teams_webhook):
+            if url:
+                self._enqueue_webhook(url, {'text': f"*{subject}*\n{message}"})
+
+    def _ensure_loop(self) -> asyncio.AbstractEventLoop:
+        """Start the delivery thread, its event loop and the workers on first use"""
+        with self._loop_lock:
+            if self._loop is None:
+                loop = asyncio.new_event_loop()
+                ready = threading.Event()
+
+                def run() -> None:
+                    asyncio.set_event_loop(loop)
+                    self._queue = asyncio.Queue()
+                    self._workers = [loop.create_task(self._worker()) for _ in range(self.pool_size)]
+                    loop.call_soon(ready.set)
+                    try:
+                        loop.run_forever()
+                    finally:
+                        loop.close()
+
+                self._thread = threading.Thread(target=run, name="notification-delivery", daemon=True)
+                self._thread.start()
+                ready.wait()
+                self._loop = loop
+            return self._loop
+
+    def _put(self, item: Any) -> None:
+        loop = self._ensure_loop()
+        loop.call_soon_threadsafe(self._queue.put_nowait, item)
+
+    def _count(self, name: str) -> None:
+        # Callers' threads and the delivery thread both update the counters
+        with self._stats_lock:
+            self.stats[name] += 1
+
+    def _enqueue(self, email: OutboundEmail) -> None:
+        if not self.email_config.enabled or not email.recipients:
+            logger.info(f"Email delivery disabled or no recipients, dropping: {email.subject}")
+            return
+        self._count('queued')
+        self._put(email)
+
+    def _enqueue_webhook(self, url: str, payload: Dict[str, Any]) -> None:
+        self._put((url, payload))
+
+    async def _worker(self) -> None:
+        while True:
+            item = await self._queue.get()
+            batch = [item]
+            # Drain whatever else is already waiting so it shares one connection
+            while len(batch) < self.batch_size and not self._queue.empty():
+                batch.append(self._queue.get_nowait())
+
+            emails = [i for i in batch if isinstance(i, OutboundEmail)]
+            webhooks = [i for i in batch if not isinstance(i, OutboundEmail)]
+            try:
+                # Emails and each webhook fail independently
+                if emails:
+                    await asyncio.to_thread(self._deliver_batch, emails)
+                for url, payload in webhooks:
+                    try:
+                        await asyncio.to_thread(self._post_webhook, url, payload)
+                    except Exception as e:
+                        self._count('webhooks_failed')
+                        logger.error(f"Webhook delivery to {url} failed: {str(e)}", exc_info=True)
+            finally:
+                for _ in batch:
+                    self._queue.task_done()
+
+    def _deliver_batch(self, emails: List[OutboundEmail]) -> None:
+        """Send a batch over a single pooled connection (runs in a worker thread)"""
+        pending = list(emails)
+        try:
+            self._send_pending(pending)
+        except Exception as e:
+            # Whatever was not sent when the unexpected error hit counts as failed
+            logger.error(f"Notification delivery error: {str(e)}", exc_info=True)
+            self._mark_failed(pending, e)
+
+    def _send_pending(self, pending: List[OutboundEmail]) -> None:
+        """Send and remove emails from ``pending``; what is left on return or raise was not sent"""
+        connection_failures = 0
+        while pending:
+            try:
+                connection = self.pool.acquire()
+            except (smtplib.SMTPException, OSError) as e:
+                connection_failures += 1
+                if connection_failures >= self.max_attempts:
+                    self._mark_failed(pending, e)
+                    return
+                time.sleep(2 ** connection_failures)
+                continue
+
+            broken = False
+            try:
+                while pending:
+                    try:
+                        message = self._build_message(pending[0])
+                    except Exception as e:
+                        # A malformed email fails on its own; the rest of the batch still goes out
+                        self._mark_failed([pending.pop(0)], e)
+                        continue
+                    connection.send_message(message)
+                    pending.pop(0)
+                    self._count('sent')
+            except (smtplib.SMTPServerDisconnected, OSError) as e:
+                # Retry the remainder of the batch on a fresh connection
+                broken = True
+                connection_failures += 1
+                logger.warning(f"SMTP connection lost: {str(e)}")
+                if connection_failures >= self.max_attempts:
+                    self._mark_failed(pending, e)
+                    return
+            except smtplib.SMTPException as e:
+                # Message-level rejection; skip it and keep the connection
+                self._mark_failed([pending.pop(0)], e)
+            except Exception as e:
+                # Unexpected send error; skip the message and don't reuse the connection
+                broken = True
+                self._mark_failed([pending.pop(0)], e)
+            finally:
+                self.pool.release(connection, broken=broken)
+
+    def _mark_failed(self, emails: List[OutboundEmail], error: Exception) -> None:
+        for email in emails:
+            self._count('failed')
+            logger.error(f"Failed to send email '{email.subject}': {str(error)}")
+
+    def _build_message(self, email: OutboundEmail) -> EmailMessage:
+        message = EmailMessage()
+        message['Subject'] = email.subject
+        message['From'] = self.email_config.from_address
+        if len(email.recipients) == 1:
+            message['To'] = email.recipients[0]
+        else:
+            message['To'] = self.email_config.from_address
+            message['Bcc'] = ", ".join(email.recipients)
+        message.set_content(email.body)
+        for filename, content, media_type in email.attachments:
+            maintype, _, subtype = media_type.partition('/')
+            message.add_attachment(content, maintype=maintype, subtype=subtype, filename=filename)
+        return message
+
+    def _post_webhook(self, url: str, payload: Dict[str, Any]) -> None:
+        try:
+            response = self._http.post(url, json=payload, timeout=10)
+            response.raise_for_status()
+            self._count('webhooks_sent')
+        except requests.RequestException as e:
+            self._count('webhooks_failed')
+            logger.error(f"Webhook delivery to {url} failed: {str(e)}")
+
+    async def flush(self) -> None:
+        """Wait until every queued notification has been handled"""
+        if self._loop is not None:
+            await asyncio.wrap_future(asyncio.run_coroutine_threadsafe(self._queue.join(), self._loop))
+
+    async def _stop_workers(self) -> None:
+        for worker in self._workers:
+            worker.cancel()
+        await asyncio.gather(*self._workers, return_exceptions=True)
+        self._workers = []
+
+    async def close(self) -> None:
+        """Send any open digests, drain the queue and stop the delivery thread"""
+        if self._loop is not None:
+            with self._digest_lock:
+                subjects = list(self._digests)
+            for subject in subjects:
+                self._loop.call_soon_threadsafe(self._flush_digest, subject)
+            await self.flush()
+            await asyncio.wrap_future(asyncio.run_coroutine_threadsafe(self._stop_workers(), self._loop))
+            self._loop.call_soon_threadsafe(self._loop.stop)
+            await asyncio.to_thread(self._thread.join)
+            self._loop = None
+            self._thread = None
+            self._queue = None
+        self.pool.close()
+        self._http.close()
+
+
+def _format_report(report_data: Dict[str, Any]) -> str:
+    lines = []
+    for key, value in report_data.items():
+        if isinstance(value, dict):
+            lines.append(f"{key}:")
+            lines.extend(f"  {k}: {v}" for k, v in value.items())
+        else:
+            lines.append(f"{key}: {value}")
+    return "\n".join(lines)
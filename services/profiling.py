@@ -0,0 +1,181 @@
+from typing import Any, Dict, List, Optional
+from contextlib import contextmanager
+from dataclasses import dataclass, field
+from datetime import datetime
+from pathlib import Path
+import cProfile
+import io
+import json
+import logging
+import os
+import pstats
+import re
+import shutil
+import threading
+import time
+
+logger = logging.getLogger(__name__)
+
+ARTIFACTS = {
+    'timeline.json': 'application/json',
+    'profile.pstats': 'application/octet-stream',
+    'profile.txt': 'text/plain',
+}
+_RUN_ID = re.compile(r'^\d{8}_\d{6}_\d{6}$')
+TRIGGER_FILE = '.profile_next_run'
+# Shared by the API and the scheduler whatever their working directories
+DEFAULT_PROFILE_DIR = Path(__file__).resolve().parent.parent / 'profiles'
+# Held while a RunProfiler is enabled; overlapping profiles would mix their statistics
+_profiling = threading.Lock()
+
+
+@dataclass
+class PhaseTiming:
+    name: str
+    offset_seconds: float
+    duration_seconds: float
+    status: str = 'ok'
+
+
+@dataclass
+class RunProfiler:
+    """
+    Phase timeline and cProfile statistics for one cleanup run.
+
+    cProfile is deterministic and hooks every call on the event loop thread while
+    enabled, so it only runs for runs that ask for it. Work pushed to worker
+    threads (backup ingest) shows up in the timeline but not in the call profile.
+    Only one profiler can be running per process; ``start`` raises RuntimeError
+    while another is active.
+    """
+    run_id: str
+    started_at: datetime = field(default_factory=datetime.now)
+    phases: List[PhaseTiming] = field(default_factory=list)
+    _profile: cProfile.Profile = field(default_factory=cProfile.Profile, repr=False)
+    _origin: float = field(default_factory=time.perf_counter, repr=False)
+    _elapsed: Optional[float] = field(default=None, repr=False)
+    _active: bool = field(default=False, repr=False)
+
+    def start(self) -> None:
+        if not _profiling.acquire(blocking=False):
+            raise RuntimeError("Another run is already being profiled")
+        self._origin = time.perf_counter()
+        self._profile.enable()
+        self._active = True
+
+    def stop(self) -> None:
+        if self._active:
+            self._profile.disable()
+            self._elapsed = time.perf_counter() - self._origin
+            self._active = False
+            _profiling.release()
+
+    @contextmanager
+    def phase(self, name: str):
+        started = time.perf_counter()
+        status = 'ok'
+        try:
+            yield
+        except BaseException:
+            status = 'error'
+            raise
+        finally:
+            self.phases.append(PhaseTiming(
+                name=name,
+                offset_seconds=round(started - self._origin, 6),
+                duration_seconds=round(time.perf_counter() - started, 6),
+                status=status
+            ))
+
+    def timeline(self) -> Dict[str, Any]:
+        total = self._elapsed if self._elapsed is not None else time.perf_counter() - self._origin
+        accounted = sum(p.duration_seconds for p in self.phases)
+        return {
+            'run_id': self.run_id,
+            'started_at': self.started_at.isoformat(),
+            'total_seconds': round(total, 6),
+            'unaccounted_seconds': round(max(0.0, total - accounted), 6),
+            'phases': [p.__dict__ for p in self.phases]
+        }
+
+    def write(self, directory: Path, top: int = 50) -> None:
+        directory.mkdir(parents=True, exist_ok=True)
+        (directory / 'timeline.json').write_text(json.dumps(self.timeline(), indent=2))
+        self._profile.dump_stats(str(directory / 'profile.pstats'))
+        report = io.StringIO()
+        pstats.Stats(self._profile, stream=report).sort_stats('cumulative').print_stats(top)
+        (directory / 'profile.txt').write_text(report.getvalue())
+
+
+class ProfileStore:
+    """
+    Profiles of cleanup runs under ``root/<run_id>/``.
+
+    A profile for the next run can be requested from another process (the
+    settings API) by dropping a trigger file in ``root``; the scheduler
+    consumes it when the next cleanup starts.
+    """
+
+    def __init__(self, root: Optional[Path] = None, keep: Optional[int] = None):
+        self.root = Path(root or os.getenv("PROFILE_DIR") or DEFAULT_PROFILE_DIR)
+        self.keep = keep if keep is not None else int(os.getenv("PROFILE_KEEP", "20"))
+
+    def request_next_run(self, requested_by: str) -> None:
+        trigger = {'requested_by': requested_by, 'requested_at': datetime.now().isoformat()}
+        self.root.mkdir(parents=True, exist_ok=True)
+        (self.root / TRIGGER_FILE).write_text(json.dumps(trigger))
+
+    def start_profiler(self, requested: bool = False) -> Optional[RunProfiler]:
+        """
+        Start profiling a run if ``requested`` or a profile of the next run was
+        asked for. The trigger file is only removed once the profiler has
+        started, so a request made while another run holds the profiler
+        carries over to the following run.
+        """
+        trigger = self.root / TRIGGER_FILE
+        triggered = trigger.exists()
+        if not (requested or triggered):
+            return None
+        profiler = self.new_profiler()
+        try:
+            profiler.start()
+        except RuntimeError as e:
+            logger.warning(f"Running cleanup without a profile: {str(e)}")
+            return None
+        if triggered:
+            trigger.unlink(missing_ok=True)
+        return profiler
+
+    def new_profiler(self) -> RunProfiler:
+        return RunProfiler(run_id=datetime.now().strftime('%Y%m%d_%H%M%S_%f'))
+
+    def save(self, profiler: RunProfiler) -> Path:
+        directory = self.root / profiler.run_id
+        profiler.write(directory)
+        self.prune()
+        logger.info(f"Saved cleanup profile {profiler.run_id}")
+        return directory
+
+    def list_profiles(self) -> List[Dict[str, Any]]:
+        profiles = []
+        if not self.root.is_dir():
+            return profiles
+        for directory in sorted(self.root.iterdir(), reverse=True):
+            timeline = directory / 'timeline.json'
+            if directory.is_dir() and _RUN_ID.match(directory.name) and timeline.exists():
+                summary = json.loads(timeline.read_text())
+                summary.pop('phases', None)
+                profiles.append(summary)
+        return profiles
+
+    def artifact_path(self, run_id: str, artifact: str) -> Optional[Path]:
+        """Path of a stored artifact, or None for unknown runs/artifacts"""
+        if not _RUN_ID.match(run_id) or artifact not in ARTIFACTS:
+            return None
+        path = self.root / run_id / artifact
+        return path if path.exists() else None
+
+    def prune(self) -> None:
+        runs = sorted(d for d in self.root.iterdir() if d.is_dir() and _RUN_ID.match(d.name))
+        for directory in runs[:max(0, len(runs) - self.keep)]:
+            shutil.rmtree(directory, ignore_errors=True)
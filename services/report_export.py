@@ -0,0 +1,92 @@
+from datetime import datetime
+from typing import Any, Iterator, Tuple
+import csv
+import io
+import json
+import os
+import tempfile
+from models.reports import ExportFormat
+from services.rollups import RollupStore, RUN_EXPORT_COLUMNS
+
+EXPORT_MEDIA_TYPES = {
+    ExportFormat.CSV: "text/csv",
+    ExportFormat.NDJSON: "application/x-ndjson",
+    ExportFormat.XLSX: "application/vnd.openxmlformats-officedocument.spreadsheetml.sheet",
+}
+
+# Rows buffered per chunk for text formats, bytes per chunk for files
+ROWS_PER_CHUNK = 500
+FILE_CHUNK_SIZE = 64 * 1024
+
+
+def _cell(value: Any) -> Any:
+    return value.isoformat() if isinstance(value, datetime) else value
+
+
+def stream_csv(rows: Iterator[Tuple]) -> Iterator[bytes]:
+    buffer = io.StringIO()
+    writer = csv.writer(buffer)
+    writer.writerow(RUN_EXPORT_COLUMNS)
+    for count, row in enumerate(rows, 1):
+        writer.writerow([_cell(value) for value in row])
+        if count % ROWS_PER_CHUNK == 0:
+            yield buffer.getvalue().encode()
+            buffer.seek(0)
+            buffer.truncate()
+    if buffer.tell():
+        yield buffer.getvalue().encode()
+
+
+def stream_ndjson(rows: Iterator[Tuple]) -> Iterator[bytes]:
+    lines = []
+    for row in rows:
+        lines.append(json.dumps(dict(zip(RUN_EXPORT_COLUMNS, map(_cell, row)))))
+        if len(lines) >= ROWS_PER_CHUNK:
+            yield ("\n".join(lines) + "\n").encode()
+            lines = []
+    if lines:
+        yield ("\n".join(lines) + "\n").encode()
+
+
+def stream_xlsx(rows: Iterator[Tuple]) -> Iterator[bytes]:
+    """
+    Write rows through a write-only openpyxl workbook and stream the file.
+
+    Write-only worksheets spool rows to disk as they are appended, so memory
+    use does not depend on the number of rows.
+    """
+    from openpyxl import Workbook
+
+    workbook = Workbook(write_only=True)
+    sheet = workbook.create_sheet("Cleanup Runs")
+    sheet.append(list(RUN_EXPORT_COLUMNS))
+    for row in rows:
+        sheet.append(list(row))
+
+    fd, path = tempfile.mkstemp(suffix=".xlsx")
+    os.close(fd)
+    try:
+        workbook.save(path)
+        with open(path, "rb") as f:
+            while chunk := f.read(FILE_CHUNK_SIZE):
+                yield chunk
+    finally:
+        os.unlink(path)
+
+
+STREAM_WRITERS = {
+    ExportFormat.CSV: stream_csv,
+    ExportFormat.NDJSON: stream_ndjson,
+    ExportFormat.XLSX: stream_xlsx,
+}
+
+
+def export_runs(store: RollupStore, start_date: datetime, end_date: datetime,
+                export_format: ExportFormat) -> Iterator[bytes]:
+    """
+    Stream raw cleanup runs in [start_date, end_date) in the given format.
+
+    This is a plain generator: StreamingResponse iterates it in a worker
+    thread, so the blocking database cursor never runs on the event loop.
+    """
+    return STREAM_WRITERS[export_format](store.iter_runs(start_date, end_date))
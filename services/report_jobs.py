@@ -0,0 +1,376 @@
+from concurrent.futures import ProcessPoolExecutor
+from datetime import datetime, timedelta, timezone
+from typing import Any, Dict, List, Optional, Set, Tuple
+from dataclasses import dataclass, field
+from pathlib import Path
+import asyncio
+import hashlib
+import io
+import json
+import logging
+import multiprocessing
+import os
+import re
+import uuid
+from models.reports import ReportFormat, ReportType
+from services.rollups import to_utc
+
+logger = logging.getLogger(__name__)
+
+ARTIFACT_TYPES = {
+    ReportFormat.EXCEL: ("xlsx", "application/vnd.openxmlformats-officedocument.spreadsheetml.sheet"),
+    ReportFormat.PDF: ("pdf", "application/pdf"),
+}
+
+
+def _sections(report: Dict[str, Any]) -> Tuple[List[Tuple[str, str]], Dict[str, List[Dict]]]:
+    """Split a report into flat key/value rows and named row tables"""
+    scalars: List[Tuple[str, str]] = []
+    tables: Dict[str, List[Dict]] = {}
+
+    def walk(prefix: str, value: Any) -> None:
+        if isinstance(value, dict):
+            for key, item in value.items():
+                walk(f"{prefix}.{key}" if prefix else key, item)
+        elif isinstance(value, list):
+            tables[prefix] = value
+        else:
+            scalars.append((prefix, value))
+
+    walk("", report)
+    return scalars, tables
+
+
+def render_excel(report: Dict[str, Any]) -> bytes:
+    """Render report data as an Excel workbook"""
+    import pandas as pd
+
+    scalars, tables = _sections(report)
+    buffer = io.BytesIO()
+    with pd.ExcelWriter(buffer, engine="openpyxl") as writer:
+        pd.DataFrame(scalars, columns=["metric", "value"]).to_excel(writer, sheet_name="Summary", index=False)
+        for name, rows in tables.items():
+            sheet_name = name.split(".")[-1][:31] or "Data"
+            pd.DataFrame(rows).to_excel(writer, sheet_name=sheet_name, index=False)
+    return buffer.getvalue()
+
+
+def render_pdf(report: Dict[str, Any]) -> bytes:
+    """Render report data as a PDF document"""
+    from reportlab.lib import colors
+    from reportlab.lib.pagesizes import A4
+    from reportlab.lib.styles import getSampleStyleSheet
+    from reportlab.platypus import SimpleDocTemplate, Paragraph, Spacer, Table, TableStyle
+
+    styles = getSampleStyleSheet()
+    table_style = TableStyle([
+        ("BACKGROUND", (0, 0), (-1, 0), colors.lightgrey),
+        ("GRID", (0, 0), (-1, -1), 0.25, colors.grey),
+        ("FONTSIZE", (0, 0), (-1, -1), 8),
+    ])
+
+    scalars, tables = _sections(report)
+    story = [Paragraph("Report", styles["Title"])]
+    story.append(Table([["Metric", "Value"]] + [[k, str(v)] for k, v in scalars], style=table_style))
+    for name, rows in tables.items():
+        story.append(Spacer(1, 12))
+        story.append(Paragraph(name, styles["Heading2"]))
+        if rows:
+            columns = list(rows[0].keys())
+            story.append(Table([columns] + [[str(row.get(c)) for c in columns] for row in rows],
+                               style=table_style, repeatRows=1))
+
+    buffer = io.BytesIO()
+    SimpleDocTemplate(buffer, pagesize=A4).build(story)
+    return buffer.getvalue()
+
+
+def render_report(report: Dict[str, Any], report_format: str) -> bytes:
+    """Process-pool entry point: render report data into the requested format"""
+    if report_format == ReportFormat.EXCEL.value:
+        return render_excel(report)
+    if report_format == ReportFormat.PDF.value:
+        return render_pdf(report)
+    raise ValueError(f"Unsupported artifact format: {report_format}")
+
+
+JOB_ID_PATTERN = re.compile(r"^[0-9a-f]{32}$")
+FINISHED = ("completed", "failed")
+
+
+@dataclass
+class ReportJob:
+    """A submitted report generation job"""
+    id: str
+    cache_key: str
+    report_type: ReportType
+    format: ReportFormat
+    start_date: datetime
+    end_date: datetime
+    status: str = "pending"
+    created_at: datetime = field(default_factory=datetime.now)
+    completed_at: Optional[datetime] = None
+    artifact_path: Optional[Path] = None
+    error: Optional[str] = None
+    done: asyncio.Event = field(default_factory=asyncio.Event, repr=False)
+
+    @property
+    def filename(self) -> str:
+        extension, _ = ARTIFACT_TYPES[self.format]
+        return f"{self.report_type.value}-report.{extension}"
+
+    @property
+    def media_type(self) -> str:
+        return ARTIFACT_TYPES[self.format][1]
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {
+            "id": self.id,
+            "cache_key": self.cache_key,
+            "report_type": self.report_type.value,
+            "format": self.format.value,
+            "start_date": self.start_date.isoformat(),
+            "end_date": self.end_date.isoformat(),
+            "status": self.status,
+            "created_at": self.created_at.isoformat(),
+            "completed_at": self.completed_at.isoformat() if self.completed_at else None,
+            "artifact_path": str(self.artifact_path) if self.artifact_path else None,
+            "error": self.error
+        }
+
+    @classmethod
+    def from_dict(cls, data: Dict[str, Any]) -> "ReportJob":
+        job = cls(
+            id=data["id"],
+            cache_key=data["cache_key"],
+            report_type=ReportType(data["report_type"]),
+            format=ReportFormat(data["format"]),
+            start_date=datetime.fromisoformat(data["start_date"]),
+            end_date=datetime.fromisoformat(data["end_date"]),
+            status=data["status"],
+            created_at=datetime.fromisoformat(data["created_at"]),
+            completed_at=datetime.fromisoformat(data["completed_at"]) if data["completed_at"] else None,
+            artifact_path=Path(data["artifact_path"]) if data["artifact_path"] else None,
+            error=data["error"]
+        )
+        if job.status in FINISHED:
+            job.done.set()
+        return job
+
+
+class ReportJobManager:
+    """
+    Runs report generation as background jobs.
+
+    Report data is built from the rollup tables, then rendered to Excel/PDF
+    in a process pool so pandas and reportlab never run on the event loop.
+    Artifacts are cached on disk by (type, range, format); identical requests
+    reuse a finished artifact or join the job already rendering it.
+
+    Job status is written to ``<job_id>.json`` next to the artifacts, so any
+    worker sharing ``artifact_dir`` can answer status and download requests.
+    Joining an in-flight job is per process, though: identical jobs submitted
+    to different workers at the same time each render once.
+    Artifacts older than ``artifact_retention`` are deleted, and the oldest
+    go first once the directory exceeds ``max_artifact_bytes``.
+    """
+
+    def __init__(self,
+                 report_service,
+                 artifact_dir: Optional[Path] = None,
+                 max_workers: Optional[int] = None,
+                 open_range_ttl: timedelta = timedelta(minutes=5),
+                 job_retention: timedelta = timedelta(hours=24),
+                 artifact_retention: timedelta = timedelta(days=7),
+                 max_artifact_bytes: Optional[int] = None,
+                 poll_interval: float = 0.5):
+        self.report_service = report_service
+        self.artifact_dir = artifact_dir or Path(os.getenv("REPORT_ARTIFACT_DIR", "./reports"))
+        self.artifact_dir.mkdir(parents=True, exist_ok=True)
+        self.max_workers = max_workers or int(os.getenv("REPORT_WORKERS", "2"))
+        self.open_range_ttl = open_range_ttl
+        self.job_retention = job_retention
+        self.artifact_retention = artifact_retention
+        self.max_artifact_bytes = max_artifact_bytes or int(os.getenv("REPORT_ARTIFACT_MAX_BYTES", str(1 << 30)))
+        self.poll_interval = poll_interval
+        self.jobs: Dict[str, ReportJob] = {}
+        self._inflight: Dict[str, ReportJob] = {}
+        self._pool: Optional[ProcessPoolExecutor] = None
+        self._tasks: Set[asyncio.Task] = set()
+
+    @staticmethod
+    def cache_key(report_type: ReportType, start_date: datetime, end_date: datetime,
+                  report_format: ReportFormat) -> str:
+        raw = f"{report_type.value}|{start_date.isoformat()}|{end_date.isoformat()}|{report_format.value}"
+        return hashlib.sha256(raw.encode()).hexdigest()[:32]
+
+    def _artifact_path(self, cache_key: str, report_format: ReportFormat) -> Path:
+        extension, _ = ARTIFACT_TYPES[report_format]
+        return self.artifact_dir / f"{cache_key}.{extension}"
+
+    def _status_path(self, job_id: str) -> Path:
+        return self.artifact_dir / f"{job_id}.json"
+
+    @staticmethod
+    def _modified_utc(path: Path) -> datetime:
+        return datetime.fromtimestamp(path.stat().st_mtime, timezone.utc).replace(tzinfo=None)
+
+    def _cached_artifact(self, path: Path, end_date: datetime) -> bool:
+        """Whether an artifact on disk can be reused; open ranges expire after a TTL"""
+        if not path.exists():
+            return False
+        modified = self._modified_utc(path)
+        if to_utc(end_date) <= modified:
+            return True
+        return to_utc(datetime.now(timezone.utc)) - modified < self.open_range_ttl
+
+    async def submit(self, report_type: ReportType, start_date: datetime, end_date: datetime,
+                     report_format: ReportFormat) -> ReportJob:
+        """Submit a report for generation and return its job immediately"""
+        if report_format not in ARTIFACT_TYPES:
+            raise ValueError(f"Format '{report_format.value}' does not produce a downloadable artifact")
+        if end_date < start_date:
+            raise ValueError("End date must be after start date")
+
+        await asyncio.to_thread(self._prune)
+        key = self.cache_key(report_type, start_date, end_date, report_format)
+        inflight = self._inflight.get(key)
+        if inflight is not None:
+            return inflight
+
+        job = ReportJob(
+            id=uuid.uuid4().hex,
+            cache_key=key,
+            report_type=report_type,
+            format=report_format,
+            start_date=start_date,
+            end_date=end_date
+        )
+        self.jobs[job.id] = job
+        self._save(job)
+
+        path = self._artifact_path(key, report_format)
+        if self._cached_artifact(path, end_date):
+            self._finish(job, artifact_path=path)
+            logger.info(f"Report job {job.id} served from cached artifact {path.name}")
+            return job
+
+        self._inflight[key] = job
+        task = asyncio.create_task(self._run(job, path))
+        self._tasks.add(task)
+        task.add_done_callback(self._tasks.discard)
+        return job
+
+    async def _run(self, job: ReportJob, path: Path) -> None:
+        job.status = "running"
+        self._save(job)
+        try:
+            report = await self.report_service.build_report(job.report_type, job.start_date, job.end_date)
+            loop = asyncio.get_running_loop()
+            content = await loop.run_in_executor(self._get_pool(), render_report, report, job.format.value)
+            await asyncio.to_thread(self._write_artifact, path, content)
+            self._finish(job, artifact_path=path)
+            logger.info(f"Report job {job.id} completed ({len(content)} bytes)")
+        except Exception as e:
+            logger.error(f"Report job {job.id} failed: {str(e)}", exc_info=True)
+            self._finish(job, error=str(e))
+        finally:
+            self._inflight.pop(job.cache_key, None)
+
+    @staticmethod
+    def _write_artifact(path: Path, content: bytes) -> None:
+        temp_path = path.with_suffix(path.suffix + ".tmp")
+        temp_path.write_bytes(content)
+        temp_path.replace(path)
+
+    def _save(self, job: ReportJob) -> None:
+        """Write the job's status file so other workers can look it up"""
+        path = self._status_path(job.id)
+        temp_path = path.with_suffix(".json.tmp")
+        temp_path.write_text(json.dumps(job.to_dict()))
+        temp_path.replace(path)
+
+    def _load(self, job_id: str) -> Optional[ReportJob]:
+        if not JOB_ID_PATTERN.match(job_id):
+            return None
+        try:
+            return ReportJob.from_dict(json.loads(self._status_path(job_id).read_text()))
+        except FileNotFoundError:
+            return None
+        except (ValueError, KeyError) as e:
+            logger.warning(f"Unreadable status file for report job {job_id}: {str(e)}")
+            return None
+
+    def _finish(self, job: ReportJob, artifact_path: Optional[Path] = None, error: Optional[str] = None) -> None:
+        job.status = "failed" if error else "completed"
+        job.artifact_path = artifact_path
+        job.error = error
+        job.completed_at = datetime.now()
+        self._save(job)
+        job.done.set()
+
+    def _get_pool(self) -> ProcessPoolExecutor:
+        if self._pool is None:
+            # Spawned workers do not inherit the event loop's threads or locks
+            self._pool = ProcessPoolExecutor(max_workers=self.max_workers,
+                                             mp_context=multiprocessing.get_context("spawn"))
+        return self._pool
+
+    def _prune(self) -> None:
+        """Drop expired jobs and status files, then expired or excess artifacts"""
+        cutoff = datetime.now() - self.job_retention
+        for job_id in [j.id for j in self.jobs.values() if j.completed_at and j.completed_at < cutoff]:
+            del self.jobs[job_id]
+
+        now = to_utc(datetime.now(timezone.utc))
+        artifacts = []
+        for path in self.artifact_dir.iterdir():
+            try:
+                modified = self._modified_utc(path)
+                if path.suffix == ".json" or path.suffix == ".tmp":
+                    if now - modified > self.job_retention:
+                        path.unlink()
+                elif now - modified > self.artifact_retention:
+                    path.unlink()
+                else:
+                    artifacts.append((modified, path.stat().st_size, path))
+            except FileNotFoundError:
+                # Removed by another worker pruning the same directory
+                continue
+
+        total = sum(size for _, size, _ in artifacts)
+        for _, size, path in sorted(artifacts):
+            if total <= self.max_artifact_bytes:
+                break
+            path.unlink(missing_ok=True)
+            total -= size
+            logger.info(f"Pruned report artifact {path.name} to stay under {self.max_artifact_bytes} bytes")
+
+    def get(self, job_id: str) -> Optional[ReportJob]:
+        """Look a job up locally, then in the shared status files"""
+        return self.jobs.get(job_id) or self._load(job_id)
+
+    async def wait(self, job_id: str, timeout: float) -> Optional[ReportJob]:
+        """Wait up to ``timeout`` seconds for a job to finish and return it"""
+        job = self.jobs.get(job_id)
+        if job is not None:
+            if timeout > 0:
+                try:
+                    await asyncio.wait_for(job.done.wait(), timeout)
+                except asyncio.TimeoutError:
+                    pass
+            return job
+
+        # Accepted by another worker; poll its status file
+        loop = asyncio.get_running_loop()
+        deadline = loop.time() + timeout
+        job = await asyncio.to_thread(self._load, job_id)
+        while job is not None and job.status not in FINISHED and loop.time() < deadline:
+            await asyncio.sleep(min(self.poll_interval, max(deadline - loop.time(), 0)))
+            job = await asyncio.to_thread(self._load, job_id)
+        return job
+
+    def shutdown(self) -> None:
+        if self._pool is not None:
+            self._pool.shutdown(wait=False, cancel_futures=True)
+            self._pool = None
@@ -0,0 +1,184 @@
+from datetime import datetime, timedelta
+from typing import Dict, List, Optional, Tuple
+from dataclasses import dataclass
+from apscheduler.triggers.cron import CronTrigger
+import asyncio
+import heapq
+import itertools
+import json
+import logging
+import uuid
+from models.reports import ReportSchedule, ReportFormat, compile_crontab
+from services.report_service import parse_period
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_REPORT_PERIOD = "7d"
+
+
+@dataclass
+class CompiledSchedule:
+    """A report schedule with its cron expression compiled once"""
+    id: str
+    schedule: ReportSchedule
+    trigger: CronTrigger
+    period: timedelta
+    params_key: str
+    next_run: Optional[datetime]
+
+
+@dataclass
+class RenderedArtifact:
+    filename: str
+    content: bytes
+    media_type: str
+
+
+class ScheduledReportExecutor:
+    """
+    Executes cron-scheduled reports.
+
+    Due schedules are grouped by (report_type, format, params, period) so each
+    distinct artifact is rendered once, and its recipients are merged and
+    delivered in batches instead of one message per schedule.
+    """
+
+    def __init__(self, report_jobs, email_service,
+                 max_recipients_per_message: int = 50,
+                 max_sleep_seconds: float = 60):
+        self.report_jobs = report_jobs
+        self.email_service = email_service
+        self.max_recipients_per_message = max_recipients_per_message
+        self.max_sleep_seconds = max_sleep_seconds
+        self.schedules: Dict[str, CompiledSchedule] = {}
+        self._queue: List[Tuple[datetime, int, str]] = []
+        self._sequence = itertools.count()
+        self._task: Optional[asyncio.Task] = None
+        self._wakeup = asyncio.Event()
+
+    def add(self, schedule: ReportSchedule) -> str:
+        """Register a schedule, returning its id"""
+        # Already compiled (and cached) when the schedule was validated
+        trigger = compile_crontab(schedule.schedule)
+        params = dict(schedule.custom_params or {})
+        period = parse_period(params.pop('period', DEFAULT_REPORT_PERIOD))
+
+        compiled = CompiledSchedule(
+            id=uuid.uuid4().hex,
+            schedule=schedule,
+            trigger=trigger,
+            period=period,
+            params_key=json.dumps(params, sort_keys=True, default=str),
+            next_run=trigger.get_next_fire_time(None, datetime.now(trigger.timezone))
+        )
+        self.schedules[compiled.id] = compiled
+        self._push(compiled)
+        self._wakeup.set()
+        logger.info(f"Scheduled {schedule.report_type.value} report {compiled.id}, next run {compiled.next_run}")
+        return compiled.id
+
+    def remove(self, schedule_id: str) -> bool:
+        # Stale heap entries are skipped when popped
+        return self.schedules.pop(schedule_id, None) is not None
+
+    def _push(self, compiled: CompiledSchedule) -> None:
+        if compiled.next_run is not None:
+            heapq.heappush(self._queue, (compiled.next_run, next(self._sequence), compiled.id))
+
+    def _pop_due(self, now: datetime) -> List[Tuple[datetime, CompiledSchedule]]:
+        due = []
+        while self._queue and self._queue[0][0] <= now:
+            fire_time, _, schedule_id = heapq.heappop(self._queue)
+            compiled = self.schedules.get(schedule_id)
+            if compiled is None or compiled.next_run != fire_time:
+                continue
+            due.append((fire_time, compiled))
+            # Missed fire times are coalesced into this run
+            compiled.next_run = compiled.trigger.get_next_fire_time(
+                None, max(fire_time, now) + timedelta(microseconds=1)
+            )
+            self._push(compiled)
+        return due
+
+    async def run_due(self, now: Optional[datetime] = None) -> int:
+        """
+        Render and deliver every schedule that is due.
+
+        Returns:
+            Number of distinct artifacts rendered
+        """
+        now = now or datetime.now().astimezone()
+        groups: Dict[Tuple, List[CompiledSchedule]] = {}
+        for fire_time, compiled in self._pop_due(now):
+            # Report ranges use naive local time, like the run store
+            end = fire_time.astimezone().replace(tzinfo=None)
+            key = (compiled.schedule.report_type, compiled.schedule.format,
+                   compiled.params_key, end - compiled.period, end)
+            groups.setdefault(key, []).append(compiled)
+
+        for key, members in groups.items():
+            try:
+                await self._render_and_deliver(key, members)
+            except Exception as e:
+                logger.error(f"Scheduled report {key[0].value}/{key[1].value} failed: {str(e)}", exc_info=True)
+        return len(groups)
+
+    async def _render_and_deliver(self, key: Tuple, members: List[CompiledSchedule]) -> None:
+        report_type, report_format, _, start, end = key
+        artifact = await self._render(report_type, report_format, start, end)
+
+        # Merge recipients across schedules, preserving order and dropping duplicates
+        recipients = list(dict.fromkeys(r for c in members for r in c.schedule.recipients))
+        subject = f"{report_type.value.title()} report {start:%Y-%m-%d} - {end:%Y-%m-%d}"
+        body = f"Attached is the scheduled {report_type.value} report for {start:%Y-%m-%d %H:%M} to {end:%Y-%m-%d %H:%M}."
+
+        for i in range(0, len(recipients), self.max_recipients_per_message):
+            await self.email_service.send_report(
+                recipients=recipients[i:i + self.max_recipients_per_message],
+                subject=subject,
+                body=body,
+                attachment=(artifact.filename, artifact.content, artifact.media_type)
+            )
+        logger.info(
+            f"Delivered {report_type.value} report to {len(recipients)} recipients "
+            f"for {len(members)} schedules"
+        )
+
+    async def _render(self, report_type, report_format: ReportFormat,
+                      start: datetime, end: datetime) -> RenderedArtifact:
+        if report_format == ReportFormat.JSON:
+            report = await self.report_jobs.report_service.build_report(report_type, start, end)
+            return RenderedArtifact(
+                filename=f"{report_type.value}-report.json",
+                content=json.dumps(report).encode(),
+                media_type="application/json"
+            )
+
+        job = await self.report_jobs.submit(report_type, start, end, report_format)
+        job = await self.report_jobs.wait(job.id, timeout=600)
+        if job.status != "completed":
+            raise RuntimeError(job.error or "Report rendering timed out")
+        content = await asyncio.to_thread(job.artifact_path.read_bytes)
+        return RenderedArtifact(filename=job.filename, content=content, media_type=job.media_type)
+
+    def start(self) -> None:
+        if self._task is None:
+            self._task = asyncio.create_task(self._loop())
+
+    async def stop(self) -> None:
+        if self._task is not None:
+            self._task.cancel()
+            self._task = None
+
+    async def _loop(self) -> None:
+        while True:
+            await self.run_due()
+            sleep_for = self.max_sleep_seconds
+            if self._queue:
+                until_next = (self._queue[0][0] - datetime.now().astimezone()).total_seconds()
+                sleep_for = max(0.0, min(sleep_for, until_next))
+            self._wakeup.clear()
+            try:
+                await asyncio.wait_for(self._wakeup.wait(), sleep_for)
+            except asyncio.TimeoutError:
+                pass
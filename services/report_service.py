@@ -0,0 +1,234 @@
+from datetime import datetime, timedelta
+from typing import Any, Dict, Optional
+import asyncio
+import logging
+import re
+from models.reports import (
+    ReportType,
+    PerformanceReport,
+    PerformanceMetrics,
+    StorageMetrics,
+    DailyStats,
+    CleanupStats
+)
+from services.rollups import RollupStore, Aggregate
+from services.disk_forecast import fit_growth_rate
+
+logger = logging.getLogger(__name__)
+
+PERIOD_PATTERN = re.compile(r'^(\d+)([hdw])$')
+PERIOD_UNITS = {'h': 'hours', 'd': 'days', 'w': 'weeks'}
+
+
+def parse_period(period: str) -> timedelta:
+    """Parse a period such as '24h', '30d' or '4w' into a timedelta"""
+    match = PERIOD_PATTERN.match(period)
+    if not match:
+        raise ValueError(f"Invalid period '{period}', expected e.g. 24h, 30d or 4w")
+    return timedelta(**{PERIOD_UNITS[match.group(2)]: int(match.group(1))})
+
+
+class ReportService:
+    """
+    Builds performance and cleanup reports from the precomputed rollup tables.
+    Raw run data is only read for the still-open current day.
+
+    Rollup queries run in worker threads so report requests and jobs never
+    block the event loop on the database.
+    """
+
+    def __init__(self, rollup_store: Optional[RollupStore] = None):
+        self.rollups = rollup_store or RollupStore()
+
+    async def generate_performance_report(self, start_date: datetime, end_date: datetime) -> PerformanceReport:
+        """
+        Generate a performance report for the given period.
+
+        Args:
+            start_date: Start of the report period
+            end_date: End of the report period
+
+        Returns:
+            PerformanceReport with summary, resource usage, storage and daily trends
+        """
+        if end_date < start_date:
+            raise ValueError("End date must be after start date")
+
+        days = await asyncio.to_thread(self.rollups.query_daily, start_date, end_date)
+        total = Aggregate()
+        for _, aggregate in days:
+            total.merge(aggregate)
+
+        trends = [
+            DailyStats(
+                date=datetime.combine(day, datetime.min.time()),
+                jobs_run=aggregate.jobs_run,
+                success_rate=_percent(aggregate.successful_jobs, aggregate.jobs_run),
+                records_processed=aggregate.records_processed,
+                average_duration=_ratio(aggregate.duration_total, aggregate.successful_jobs)
+            )
+            for day, aggregate in days
+        ]
+
+        disk_points = [
+            (index, aggregate.disk_total / aggregate.disk_samples)
+            for index, (_, aggregate) in enumerate(days)
+            if aggregate.disk_samples
+        ]
+
+        return PerformanceReport(
+            period={'start': start_date, 'end': end_date},
+            summary={
+                'total_jobs': total.jobs_run,
+                'successful_jobs': total.successful_jobs,
+                'success_rate': _percent(total.successful_jobs, total.jobs_run),
+                'total_records': total.records_processed
+            },
+            performance=PerformanceMetrics(
+                average_cpu=_ratio(total.cpu_total, total.resource_samples),
+                peak_cpu=total.peak_cpu,
+                average_memory=_ratio(total.memory_total, total.resource_samples),
+                peak_memory=total.peak_memory,
+                average_duration=_ratio(total.duration_total, total.successful_jobs),
+                peak_duration=total.peak_duration
+            ),
+            storage=StorageMetrics(
+                average_usage=_ratio(total.disk_total, total.disk_samples),
+                peak_usage=total.peak_disk,
+                space_reclaimed=float(total.space_reclaimed),
+                growth_rate=fit_growth_rate(disk_points)
+            ),
+            trends={'daily': trends}
+        )
+
+    async def get_cleanup_stats(self, period: str = "30d") -> CleanupStats:
+        """Summarize cleanup jobs over a trailing period such as '30d'"""
+        end_date = datetime.now()
+        return await self.get_cleanup_stats_for_range(end_date - parse_period(period), end_date)
+
+    async def get_cleanup_stats_for_range(self, start_date: datetime, end_date: datetime) -> CleanupStats:
+        """Summarize cleanup jobs between two dates"""
+        total = await asyncio.to_thread(self.rollups.summarize, start_date, end_date)
+
+        return CleanupStats(
+            total_jobs=total.jobs_run,
+            success_rate=_percent(total.successful_jobs, total.jobs_run),
+            total_records=total.records_processed,
+            average_duration=_ratio(total.duration_total, total.successful_jobs),
+            records_per_job=_ratio(total.records_processed, total.successful_jobs),
+            failure_reasons=total.failure_reasons
+        )
+
+    async def generate_scheduler_report(self, start_date: datetime, end_date: datetime, lmt: int = 100,
+                                        offset: int = 0) -> Dict[str, Any]:
+        """
+        Generate a report of scheduler activity and performance for [start_date, end_date).
+
+        Totals and the pagination count both come from the rollup tables, and
+        job_history pages through the raw runs they were built from, so the
+        two always agree.
+
+        Args:
+            start_date (datetime): The start date for the report period
+            end_date (datetime): The end date for the report period (exclusive)
+            lmt (int): Maximum number of job_history entries to return
+            offset (int): Number of job_history entries to skip
+
+        Returns:
+            Dict[str, Any]: A dictionary containing the following report sections:
+                - performance_metrics: CPU and memory usage sampled as each run started,
+                  and the average duration of successful runs; ``avg_cpu_usage`` and
+                  ``peak_memory_usage`` are kept for existing consumers and equal the
+                  ``*_at_start`` values
+                - cleanup_stats: Statistics about cleanup operations
+                - disk_usage: Bytes reclaimed by the runs in the period
+                - job_history: Historical data about scheduled jobs (one page)
+                - pagination: total, offset, limit and has_more for job_history
+                Example:
+                {
+                    'performance_metrics': {
+                        'avg_cpu_at_start': 45.2,
+                        'peak_cpu_at_start': 91.0,
+                        'avg_memory_at_start': 61.3,
+                        'peak_memory_at_start': 78.4,
+                        'avg_cpu_usage': 45.2,
+                        'peak_memory_usage': 78.4,
+                        'avg_job_duration': 120.5
+                    },
+                    'cleanup_stats': {
+                        'total_jobs': 48,
+                        'successful_jobs': 45,
+                        'records_archived': 15000,
+                        'success_rate': 93.75
+                    },
+                    'disk_usage': {
+                        'space_reclaimed': 1024000
+                    },
+                    'job_history': [
+                        {
+                            'timestamp': datetime(2024, 3, 10, 15, 30, tzinfo=timezone.utc),
+                            'success': True,
+                            'duration_seconds': 118.5,
+                            'records_archived': 500,
+                            ...
+                        },
+                        ...
+                    ],
+                    'pagination': {'total': 48, 'offset': 0, 'limit': 100, 'has_more': False}
+                }
+
+        Raises:
+            ValueError: If end_date is before start_date or lmt/offset are negative
+        """
+        if end_date < start_date:
+            raise ValueError("End date must be after start date")
+        if lmt < 0 or offset < 0:
+            raise ValueError("lmt and offset must be non-negative")
+
+        total = await asyncio.to_thread(self.rollups.summarize, start_date, end_date)
+        job_history = await asyncio.to_thread(self.rollups.page_runs, start_date, end_date, offset, lmt)
+        avg_cpu = _ratio(total.cpu_total, total.resource_samples)
+
+        return {
+            'performance_metrics': {
+                'avg_cpu_at_start': avg_cpu,
+                'peak_cpu_at_start': total.peak_cpu,
+                'avg_memory_at_start': _ratio(total.memory_total, total.resource_samples),
+                'peak_memory_at_start': total.peak_memory,
+                'avg_cpu_usage': avg_cpu,
+                'peak_memory_usage': total.peak_memory,
+                'avg_job_duration': _ratio(total.duration_total, total.successful_jobs)
+            },
+            'cleanup_stats': {
+                'total_jobs': total.jobs_run,
+                'successful_jobs': total.successful_jobs,
+                'records_archived': total.records_processed,
+                'success_rate': _percent(total.successful_jobs, total.jobs_run)
+            },
+            'disk_usage': {
+                'space_reclaimed': total.space_reclaimed
+            },
+            'job_history': job_history,
+            'pagination': {
+                'total': total.jobs_run,
+                'offset': offset,
+                'limit': lmt,
+                'has_more': offset + len(job_history) < total.jobs_run
+            }
+        }
+
+    async def build_report(self, report_type: ReportType, start_date: datetime, end_date: datetime) -> Dict[str, Any]:
+        """Build the JSON-ready data for a report type, as used by artifact rendering"""
+        if report_type == ReportType.CLEANUP:
+            report = await self.get_cleanup_stats_for_range(start_date, end_date)
+        else:
+            report = await self.generate_performance_report(start_date, end_date)
+        return report.model_dump(mode='json')
+
+
+def _ratio(numerator: float, denominator: float) -> float:
+    return numerator / denominator if denominator else 0.0
+
+
+def _percent(part: float, whole: float) -> float:
+    return part / whole * 100 if whole else 0.0
@@ -0,0 +1,439 @@
+from datetime import datetime, date, time, timedelta, timezone
+from typing import Dict, List, Optional, Iterator, Tuple
+from dataclasses import dataclass, field, fields
+from pathlib import Path
+import argparse
+import json
+import logging
+import os
+from sqlalchemy import (
+    select, delete, BigInteger, Boolean, DateTime, Float, Integer, String, Text, JSON
+)
+from sqlalchemy.dialects import postgresql, sqlite
+from sqlalchemy.orm import DeclarativeBase, Mapped, Session, mapped_column
+from services.db_pool import get_engine
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_DATABASE_URL = "sqlite:///rollups.db"
+
+
+class Base(DeclarativeBase):
+    pass
+
+
+class CleanupRun(Base):
+    """Raw record of a single finished cleanup run"""
+    __tablename__ = "cleanup_runs"
+
+    id: Mapped[int] = mapped_column(Integer, primary_key=True)
+    finished_at: Mapped[datetime] = mapped_column(DateTime, index=True)
+    success: Mapped[bool] = mapped_column(Boolean)
+    records_processed: Mapped[int] = mapped_column(Integer, default=0)
+    duration_seconds: Mapped[float] = mapped_column(Float, default=0.0)
+    cpu_usage: Mapped[Optional[float]] = mapped_column(Float, nullable=True)
+    memory_usage: Mapped[Optional[float]] = mapped_column(Float, nullable=True)
+    disk_usage: Mapped[Optional[float]] = mapped_column(Float, nullable=True)
+    space_reclaimed: Mapped[int] = mapped_column(BigInteger, default=0)
+    error_message: Mapped[Optional[str]] = mapped_column(Text, nullable=True)
+    profile_id: Mapped[Optional[str]] = mapped_column(String(64), nullable=True)
+
+
+RUN_EXPORT_COLUMNS = (
+    'finished_at', 'success', 'records_processed', 'duration_seconds',
+    'cpu_usage', 'memory_usage', 'disk_usage', 'space_reclaimed', 'error_message'
+)
+
+
+class _RollupColumns:
+    jobs_run: Mapped[int] = mapped_column(Integer, default=0)
+    successful_jobs: Mapped[int] = mapped_column(Integer, default=0)
+    records_processed: Mapped[int] = mapped_column(Integer, default=0)
+    duration_total: Mapped[float] = mapped_column(Float, default=0.0)
+    peak_duration: Mapped[float] = mapped_column(Float, default=0.0)
+    resource_samples: Mapped[int] = mapped_column(Integer, default=0)
+    cpu_total: Mapped[float] = mapped_column(Float, default=0.0)
+    peak_cpu: Mapped[float] = mapped_column(Float, default=0.0)
+    memory_total: Mapped[float] = mapped_column(Float, default=0.0)
+    peak_memory: Mapped[float] = mapped_column(Float, default=0.0)
+    disk_samples: Mapped[int] = mapped_column(Integer, default=0)
+    disk_total: Mapped[float] = mapped_column(Float, default=0.0)
+    peak_disk: Mapped[float] = mapped_column(Float, default=0.0)
+    space_reclaimed: Mapped[int] = mapped_column(BigInteger, default=0)
+    failure_reasons: Mapped[Dict[str, int]] = mapped_column(JSON, default=dict)
+
+
+class DailyRollup(_RollupColumns, Base):
+    """Cleanup aggregates for one calendar day"""
+    __tablename__ = "cleanup_rollup_daily"
+
+    bucket: Mapped[datetime] = mapped_column(DateTime, primary_key=True)
+
+
+class HourlyRollup(_RollupColumns, Base):
+    """Cleanup aggregates for one hour"""
+    __tablename__ = "cleanup_rollup_hourly"
+
+    bucket: Mapped[datetime] = mapped_column(DateTime, primary_key=True)
+
+
+@dataclass
+class Aggregate:
+    """In-memory counterpart of a rollup row, used to fold runs and buckets together"""
+    jobs_run: int = 0
+    successful_jobs: int = 0
+    records_processed: int = 0
+    duration_total: float = 0.0
+    peak_duration: float = 0.0
+    resource_samples: int = 0
+    cpu_total: float = 0.0
+    peak_cpu: float = 0.0
+    memory_total: float = 0.0
+    peak_memory: float = 0.0
+    disk_samples: int = 0
+    disk_total: float = 0.0
+    peak_disk: float = 0.0
+    space_reclaimed: int = 0
+    failure_reasons: Dict[str, int] = field(default_factory=dict)
+
+    def add_run(self, run: CleanupRun) -> None:
+        self.jobs_run += 1
+        self.space_reclaimed += run.space_reclaimed or 0
+        if run.success:
+            self.successful_jobs += 1
+            self.records_processed += run.records_processed
+            self.duration_total += run.duration_seconds
+            self.peak_duration = max(self.peak_duration, run.duration_seconds)
+        else:
+            reason = failure_reason(run.error_message)
+            self.failure_reasons[reason] = self.failure_reasons.get(reason, 0) + 1
+
+        if run.cpu_usage is not None and run.memory_usage is not None:
+            self.resource_samples += 1
+            self.cpu_total += run.cpu_usage
+            self.peak_cpu = max(self.peak_cpu, run.cpu_usage)
+            self.memory_total += run.memory_usage
+            self.peak_memory = max(self.peak_memory, run.memory_usage)
+
+        if run.disk_usage is not None:
+            self.disk_samples += 1
+            self.disk_total += run.disk_usage
+            self.peak_disk = max(self.peak_disk, run.disk_usage)
+
+    def merge(self, other) -> None:
+        """Fold another Aggregate or rollup row into this one"""
+        for name in ('jobs_run', 'successful_jobs', 'records_processed', 'duration_total',
+                     'resource_samples', 'cpu_total', 'memory_total', 'disk_samples', 'disk_total',
+                     'space_reclaimed'):
+            setattr(self, name, getattr(self, name) + (getattr(other, name) or 0))
+        for name in ('peak_duration', 'peak_cpu', 'peak_memory', 'peak_disk'):
+            setattr(self, name, max(getattr(self, name), getattr(other, name)))
+        for reason, count in (other.failure_reasons or {}).items():
+            self.failure_reasons[reason] = self.failure_reasons.get(reason, 0) + count
+
+    def apply_to(self, row: _RollupColumns) -> None:
+        for f in fields(self):
+            setattr(row, f.name, getattr(self, f.name))
+
+    @classmethod
+    def from_row(cls, row: _RollupColumns) -> 'Aggregate':
+        aggregate = cls()
+        aggregate.merge(row)
+        return aggregate
+
+
+def failure_reason(error_message: Optional[str]) -> str:
+    """Normalize an error message into a histogram key"""
+    if not error_message:
+        return "unknown"
+    return error_message.strip().splitlines()[0][:120]
+
+
+def run_to_dict(run: CleanupRun) -> Dict:
+    """The run dict shape CleanupService.record_run takes and the history API returns"""
+    return {
+        'timestamp': run.finished_at.replace(tzinfo=timezone.utc),
+        'records_archived': run.records_processed,
+        'duration_seconds': run.duration_seconds,
+        'success': run.success,
+        'error_message': run.error_message,
+        'cpu_usage': run.cpu_usage,
+        'memory_usage': run.memory_usage,
+        'disk_usage': run.disk_usage,
+        'space_reclaimed': run.space_reclaimed,
+        'profile_id': run.profile_id
+    }
+
+
+def to_utc(timestamp: datetime) -> datetime:
+    """
+    Normalize a timestamp to naive UTC, the form stored in every table.
+    Naive timestamps are taken as server local time, as datetime.now() returns.
+    """
+    return timestamp.astimezone(timezone.utc).replace(tzinfo=None)
+
+
+def day_bucket(timestamp: datetime) -> datetime:
+    return datetime.combine(timestamp.date(), time.min)
+
+
+def hour_bucket(timestamp: datetime) -> datetime:
+    return timestamp.replace(minute=0, second=0, microsecond=0)
+
+
+# Finer level to fall back to for the partial buckets at the edges of a range
+_ROLLUP_LEVELS = {
+    'day': (DailyRollup, day_bucket, timedelta(days=1), 'hour'),
+    'hour': (HourlyRollup, hour_bucket, timedelta(hours=1), None),
+}
+
+_DIALECT_INSERTS = {'postgresql': postgresql.insert, 'sqlite': sqlite.insert}
+
+
+class RollupStore:
+    """
+    Maintains daily and hourly aggregate tables of cleanup runs.
+
+    Each finished run is written to the raw ``cleanup_runs`` table and folded
+    into its hour and day rollup in the same transaction. Reports read the
+    rollups for closed periods and only scan raw runs for the current day
+    and the partial hours at the edges of a range.
+
+    All timestamps are stored as naive UTC; see ``to_utc``.
+    """
+
+    def __init__(self, database_url: Optional[str] = None):
+        self.engine = get_engine("rollups", database_url or os.getenv("ROLLUP_DATABASE_URL", DEFAULT_DATABASE_URL))
+        Base.metadata.create_all(self.engine)
+
+    def record_run(self, run: Dict) -> None:
+        """
+        Record a finished cleanup run and update its rollups incrementally.
+
+        Args:
+            run: Dict containing timestamp, success, records_archived,
+                duration_seconds and optionally cpu_usage, memory_usage,
+                disk_usage and error_message
+        """
+        record = CleanupRun(
+            finished_at=to_utc(run['timestamp']),
+            success=run['success'],
+            records_processed=run.get('records_archived', 0),
+            duration_seconds=run.get('duration_seconds', 0.0),
+            cpu_usage=run.get('cpu_usage'),
+            memory_usage=run.get('memory_usage'),
+            disk_usage=run.get('disk_usage'),
+            space_reclaimed=run.get('space_reclaimed', 0),
+            error_message=run.get('error_message'),
+            profile_id=run.get('profile_id')
+        )
+        insert = _DIALECT_INSERTS.get(self.engine.dialect.name)
+        with Session(self.engine) as session, session.begin():
+            for model, bucket in ((DailyRollup, day_bucket(record.finished_at)),
+                                  (HourlyRollup, hour_bucket(record.finished_at))):
+                # Create the bucket if needed, then lock it, so concurrent runs can't lose increments.
+                # On SQLite the insert also takes the database write lock before anything is read.
+                if insert is not None:
+                    session.execute(insert(model).values(bucket=bucket).on_conflict_do_nothing(index_elements=['bucket']))
+                row = session.scalars(select(model).where(model.bucket == bucket).with_for_update()).one_or_none()
+                if row is None:
+                    row = model(bucket=bucket)
+                    session.add(row)
+                aggregate = Aggregate.from_row(row) if row.jobs_run else Aggregate()
+                aggregate.add_run(record)
+                aggregate.apply_to(row)
+            session.add(record)
+
+    def import_metrics_file(self, metrics_file: Path) -> int:
+        """
+        Import raw runs from a PerformanceTracker metrics file.
+
+        Runs are keyed on their timestamp: any already in ``cleanup_runs`` (or
+        repeated in the file) are skipped, so re-running an import is safe.
+
+        Returns:
+            Number of runs imported
+        """
+        with open(metrics_file, 'r') as f:
+            history = json.load(f)
+        if not history:
+            return 0
+
+        runs = {to_utc(datetime.fromisoformat(metric['timestamp'])): metric for metric in history}
+        with Session(self.engine) as session, session.begin():
+            existing = set(session.scalars(
+                select(CleanupRun.finished_at)
+                .where(CleanupRun.finished_at >= min(runs), CleanupRun.finished_at <= max(runs))
+            ))
+            imported = 0
+            for finished_at, metric in runs.items():
+                if finished_at in existing:
+                    continue
+                imported += 1
+                session.add(CleanupRun(
+                    finished_at=finished_at,
+                    success=metric['success'],
+                    records_processed=metric.get('records_processed', 0),
+                    duration_seconds=metric.get('duration_seconds', 0.0),
+                    cpu_usage=metric.get('cpu_usage'),
+                    memory_usage=metric.get('memory_usage'),
+                    disk_usage=metric.get('disk_usage'),
+                    error_message=metric.get('error_message')
+                ))
+        if imported < len(history):
+            logger.info(f"Skipped {len(history) - imported} runs from {metrics_file} that were already imported")
+        return imported
+
+    def backfill(self, since: Optional[datetime] = None) -> int:
+        """
+        Rebuild rollups from raw runs.
+
+        Args:
+            since: Only rebuild buckets from this day onwards (all when None)
+
+        Returns:
+            Number of raw runs processed
+        """
+        start = day_bucket(to_utc(since)) if since else None
+        daily: Dict[datetime, Aggregate] = {}
+        hourly: Dict[datetime, Aggregate] = {}
+        processed = 0
+
+        with Session(self.engine) as session, session.begin():
+            for model in (DailyRollup, HourlyRollup):
+                stmt = delete(model)
+                if start is not None:
+                    stmt = stmt.where(model.bucket >= start)
+                session.execute(stmt)
+
+            query = select(CleanupRun).order_by(CleanupRun.finished_at)
+            if start is not None:
+                query = query.where(CleanupRun.finished_at >= start)
+            for run in session.scalars(query.execution_options(yield_per=1000)):
+                daily.setdefault(day_bucket(run.finished_at), Aggregate()).add_run(run)
+                hourly.setdefault(hour_bucket(run.finished_at), Aggregate()).add_run(run)
+                processed += 1
+
+            for model, buckets in ((DailyRollup, daily), (HourlyRollup, hourly)):
+                for bucket, aggregate in buckets.items():
+                    row = model(bucket=bucket)
+                    aggregate.apply_to(row)
+                    session.add(row)
+
+        logger.info(f"Backfilled rollups from {processed} runs ({len(daily)} days, {len(hourly)} hours)")
+        return processed
+
+    def query_daily(self, start: datetime, end: datetime,
+                    now: Optional[datetime] = None) -> List[Tuple[date, Aggregate]]:
+        """
+        Return per-day (UTC) aggregates for [start, end).
+
+        Closed whole days come from the daily table and whole hours at the
+        edges from the hourly table. Partial hours at the edges and the
+        still-open current day are read from raw runs, so the result is
+        exact for any range.
+        """
+        start, end = to_utc(start), to_utc(end)
+        today = day_bucket(to_utc(now or datetime.now(timezone.utc)))
+        closed_end = min(end, today)
+        days: Dict[date, Aggregate] = {}
+
+        with Session(self.engine) as session:
+            self._fold_range(session, days, start, closed_end, 'day')
+            self._fold_raw(session, days, max(start, today), end)
+
+        return sorted(days.items())
+
+    def summarize(self, start: datetime, end: datetime) -> Aggregate:
+        """Aggregate of every run in [start, end)"""
+        total = Aggregate()
+        for _, aggregate in self.query_daily(start, end):
+            total.merge(aggregate)
+        return total
+
+    def page_runs(self, start: datetime, end: datetime, offset: int = 0, limit: int = 100) -> List[Dict]:
+        """Return a chronological page of raw runs in [start, end) as run dicts"""
+        query = (
+            select(CleanupRun)
+            .where(CleanupRun.finished_at >= to_utc(start), CleanupRun.finished_at < to_utc(end))
+            .order_by(CleanupRun.finished_at, CleanupRun.id)
+            .offset(max(offset, 0))
+            .limit(max(limit, 0))
+        )
+        with Session(self.engine) as session:
+            return [run_to_dict(run) for run in session.scalars(query)]
+
+    def recent_runs(self, count: int = 100) -> List[Dict]:
+        """Return the most recent ``count`` runs in chronological order"""
+        query = select(CleanupRun).order_by(CleanupRun.finished_at.desc(), CleanupRun.id.desc()).limit(max(count, 0))
+        with Session(self.engine) as session:
+            return [run_to_dict(run) for run in reversed(session.scalars(query).all())]
+
+    def iter_runs(self, start: datetime, end: datetime, batch_size: int = 1000) -> Iterator[Tuple]:
+        """
+        Stream raw runs in [start, end) ordered by time.
+
+        Rows are fetched ``batch_size`` at a time from a server-side cursor,
+        so memory stays flat regardless of the range.
+        """
+        query = (
+            select(*(getattr(CleanupRun, name) for name in RUN_EXPORT_COLUMNS))
+            .where(CleanupRun.finished_at >= to_utc(start), CleanupRun.finished_at < to_utc(end))
+            .order_by(CleanupRun.finished_at)
+            .execution_options(stream_results=True, yield_per=batch_size)
+        )
+        with Session(self.engine) as session:
+            for row in session.execute(query):
+                yield tuple(row)
+
+    def _fold_range(self, session: Session, days: Dict[date, Aggregate], start: datetime, end: datetime,
+                    level: Optional[str]) -> None:
+        """Fold [start, end) into ``days``: whole buckets at ``level``, the partial edges at finer levels"""
+        if start >= end:
+            return
+        if level is None:
+            self._fold_raw(session, days, start, end)
+            return
+
+        model, floor, step, finer = _ROLLUP_LEVELS[level]
+        first = floor(start) if floor(start) == start else floor(start) + step
+        last = floor(end)
+        if first >= last:
+            self._fold_range(session, days, start, end, finer)
+            return
+
+        for row in session.scalars(select(model).where(model.bucket >= first, model.bucket < last)):
+            days.setdefault(row.bucket.date(), Aggregate()).merge(row)
+        self._fold_range(session, days, start, first, finer)
+        self._fold_range(session, days, last, end, finer)
+
+    @staticmethod
+    def _fold_raw(session: Session, days: Dict[date, Aggregate], start: datetime, end: datetime) -> None:
+        if start >= end:
+            return
+        for run in session.scalars(
+            select(CleanupRun).where(CleanupRun.finished_at >= start, CleanupRun.finished_at < end)
+        ):
+            days.setdefault(run.finished_at.date(), Aggregate()).add_run(run)
+
+
+def main(argv: Optional[List[str]] = None) -> None:
+    parser = argparse.ArgumentParser(description="Maintain cleanup rollup tables")
+    subparsers = parser.add_subparsers(dest="command", required=True)
+    backfill = subparsers.add_parser("backfill", help="Rebuild daily and hourly rollups from raw runs")
+    backfill.add_argument("--since", type=date.fromisoformat, help="First day to rebuild (YYYY-MM-DD)")
+    backfill.add_argument("--import-metrics", type=Path, help="PerformanceTracker metrics file to import first")
+    backfill.add_argument("--database-url", help="Rollup database URL (defaults to ROLLUP_DATABASE_URL)")
+    args = parser.parse_args(argv)
+
+    store = RollupStore(args.database_url)
+    if args.import_metrics:
+        imported = store.import_metrics_file(args.import_metrics)
+        print(f"Imported {imported} runs from {args.import_metrics}")
+    since = datetime.combine(args.since, time.min) if args.since else None
+    processed = store.backfill(since)
+    print(f"Rebuilt rollups from {processed} runs")
+
+
+if __name__ == "__main__":
+    main()
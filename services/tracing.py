@@ -0,0 +1,187 @@
+from typing import Any, Dict, Iterator, List, Optional, Tuple
+from contextlib import contextmanager
+from dataclasses import dataclass, field
+from fnmatch import fnmatchcase
+import logging
+import os
+
+try:
+    import sentry_sdk
+except ImportError:
+    sentry_sdk = None
+
+logger = logging.getLogger(__name__)
+
+JOB_OP = "cleanup.job"
+PHASE_OP = "cleanup.phase"
+
+# Dashboards poll these every few seconds; tracing each poll costs more than it tells us
+DEFAULT_ENDPOINT_RATES: Dict[str, float] = {
+    '*/health*': 0.0,
+    '*/monitor/*': 0.01,
+    '*/dashboard/*': 0.01,
+    '*/logs/*': 0.01,
+    '*/projects/bulk*': 0.5,
+}
+
+
+def parse_endpoint_rates(value: str) -> Dict[str, float]:
+    """Parse ``pattern=rate,pattern=rate`` into a dict, skipping malformed entries"""
+    rates = {}
+    for entry in value.split(','):
+        pattern, _, rate = entry.strip().partition('=')
+        if not pattern or not rate:
+            continue
+        try:
+            rates[pattern.strip()] = min(max(float(rate), 0.0), 1.0)
+        except ValueError:
+            logger.error(f"Ignoring invalid trace sample rate for {pattern!r}: {rate!r}")
+    return rates
+
+
+@dataclass
+class SamplingConfig:
+    base_rate: float = 0.05
+    job_rate: float = 1.0
+    slow_request_ms: float = 1000.0
+    endpoint_rates: Dict[str, float] = field(default_factory=lambda: dict(DEFAULT_ENDPOINT_RATES))
+
+    @classmethod
+    def from_env(cls) -> 'SamplingConfig':
+        """
+        Build the config from TRACES_SAMPLE_RATE, TRACES_JOB_SAMPLE_RATE,
+        TRACES_SLOW_REQUEST_MS and TRACES_ENDPOINT_RATES. Endpoint rates from the
+        environment take precedence over the defaults.
+        """
+        overrides = parse_endpoint_rates(os.getenv("TRACES_ENDPOINT_RATES", ""))
+        return cls(
+            base_rate=float(os.getenv("TRACES_SAMPLE_RATE", "0.05")),
+            job_rate=float(os.getenv("TRACES_JOB_SAMPLE_RATE", "1.0")),
+            slow_request_ms=float(os.getenv("TRACES_SLOW_REQUEST_MS", "1000")),
+            endpoint_rates={**overrides, **{k: v for k, v in DEFAULT_ENDPOINT_RATES.items() if k not in overrides}},
+        )
+
+
+def _request_path(sampling_context: Dict[str, Any]) -> Optional[str]:
+    environ = sampling_context.get('wsgi_environ')
+    if environ:
+        return environ.get('PATH_INFO')
+    scope = sampling_context.get('asgi_scope')
+    if scope:
+        return scope.get('path')
+    return None
+
+
+class TraceSampler:
+    """
+    Head-based ``traces_sampler`` for Sentry.
+
+    Decisions are made once per trace, in this order: an upstream service's
+    decision is kept, scheduler jobs use ``job_rate``, requests matching an
+    endpoint pattern use its rate, and everything else uses ``base_rate``.
+    Error events are not affected by trace sampling, and slow requests that were
+    not sampled are reported by :class:`api.middleware.SlowRequestMiddleware`.
+    """
+
+    def __init__(self, config: Optional[SamplingConfig] = None):
+        self.config = config or SamplingConfig.from_env()
+        self._rules: List[Tuple[str, float]] = list(self.config.endpoint_rates.items())
+
+    def rate_for_path(self, path: str) -> float:
+        for pattern, rate in self._rules:
+            if fnmatchcase(path, pattern):
+                return rate
+        return self.config.base_rate
+
+    def __call__(self, sampling_context: Dict[str, Any]) -> float:
+        parent_sampled = sampling_context.get('parent_sampled')
+        if parent_sampled is not None:
+            return 1.0 if parent_sampled else 0.0
+
+        transaction = sampling_context.get('transaction_context') or {}
+        if transaction.get('op') == JOB_OP:
+            return self.config.job_rate
+
+        path = _request_path(sampling_context)
+        if path is None:
+            return self.config.base_rate
+        return self.rate_for_path(path)
+
+
+def init_tracing(dsn: Optional[str] = None, integrations: Optional[list] = None) -> bool:
+    """
+    Initialise Sentry with sampled tracing.
+
+    Returns False (and does nothing) when no DSN is configured or sentry-sdk is
+    not installed. PII is never sent by default.
+    """
+    dsn = dsn or os.getenv("SENTRY_DSN")
+    if not dsn or sentry_sdk is None:
+        return False
+
+    sentry_sdk.init(
+        dsn=dsn,
+        integrations=integrations or [],
+        sample_rate=1.0,  # error events are always kept
+        traces_sampler=TraceSampler(),
+        send_default_pii=False,
+    )
+    return True
+
+
+def current_span_sampled() -> bool:
+    if sentry_sdk is None:
+        return False
+    span = sentry_sdk.get_current_span()
+    return bool(span is not None and span.sampled)
+
+
+@contextmanager
+def job_transaction(name: str) -> Iterator[Any]:
+    """Trace a scheduler job; sampled at ``job_rate`` by :class:`TraceSampler`"""
+    if sentry_sdk is None:
+        yield None
+        return
+    with sentry_sdk.start_transaction(op=JOB_OP, name=name) as transaction:
+        yield transaction
+
+
+@contextmanager
+def span(op: str, description: str) -> Iterator[Any]:
+    """Child span of the active transaction; a no-op without sentry-sdk or a transaction"""
+    if sentry_sdk is None or sentry_sdk.get_current_span() is None:
+        yield None
+        return
+    with sentry_sdk.start_span(op=op, description=description) as child:
+        yield child
+
+
+def report_slow_request(method: str, path: str, duration_ms: float, status_code: int) -> None:
+    """
+    Tail-based fallback for slow requests the head sampler skipped.
+
+    Logs the request and, when Sentry is configured, sends a single warning
+    event carrying the timing so slow endpoints stay visible at low sample rates.
+    """
+    _report_request('slow-request', 'Slow request', method, path, duration_ms, status_code)
+
+
+def report_failed_request(method: str, path: str, duration_ms: float, status_code: int) -> None:
+    """Like ``report_slow_request`` for 5xx responses, grouped apart from slow ones"""
+    _report_request('failed-request', 'Failed request', method, path, duration_ms, status_code)
+
+
+def _report_request(kind: str, label: str, method: str, path: str, duration_ms: float, status_code: int) -> None:
+    logger.warning(f"{label}: {method} {path} took {duration_ms:.0f}ms (status {status_code})")
+    if sentry_sdk is None or current_span_sampled():
+        return
+    with sentry_sdk.new_scope() as scope:
+        scope.set_tag(kind.replace('-', '_'), True)
+        scope.set_context('request_timing', {
+            'method': method,
+            'path': path,
+            'duration_ms': round(duration_ms, 1),
+            'status_code': status_code,
+        })
+        scope.fingerprint = [kind, method, path]
+        sentry_sdk.capture_message(f"{label}: {method} {path}", level='warning')